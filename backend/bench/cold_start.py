@@ -0,0 +1,115 @@
+# bench/cold_start.py
+"""Measure cold-start cost with and without init-phase priming.
+
+Run from backend/:  python -m bench.cold_start [--runs N]
+
+Each run is a fresh interpreter (a cold Lambda sandbox): it imports main
+with PRIME_ON_INIT=0 or 1, then sends two authenticated list requests
+through main.handler as API Gateway v2 events. Needs the same DynamoDB the
+app would use (LOCAL_TESTING=1 for DynamoDB Local, or real AWS tables).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from uuid import uuid4
+
+MODES = {"cold": "0", "primed": "1"}
+METRICS = ("init_ms", "first_ms", "second_ms")
+
+
+def _event(path: str, token: str) -> dict:
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": path,
+        "rawQueryString": "",
+        "headers": {"host": "bench", "authorization": f"Bearer {token}"},
+        "requestContext": {
+            "http": {"method": "GET", "path": path, "protocol": "HTTP/1.1", "sourceIp": "127.0.0.1"},
+            "stage": "$default",
+        },
+        "isBase64Encoded": False,
+    }
+
+
+def child(user_id: str) -> None:
+    # Runs in a fresh interpreter; everything before the first request
+    # counts as init
+    start = time.perf_counter()
+    import main
+    init_ms = (time.perf_counter() - start) * 1000
+
+    from core.security import create_access_token
+    event = _event("/api/item/read/", create_access_token({"sub": user_id}))
+
+    timings = {"init_ms": init_ms}
+    for key in ("first_ms", "second_ms"):
+        start = time.perf_counter()
+        response = main.handler(event, None)
+        timings[key] = (time.perf_counter() - start) * 1000
+        if response["statusCode"] >= 500:
+            raise SystemExit(f"request failed: {response}")
+    print(json.dumps(timings))
+
+
+def seed_user() -> tuple:
+    # Seed through an independent session so the parent does not share
+    # botocore state with what it measures
+    import boto3
+    from db import USERS_TABLE, ITEMS_TABLE, get_dynamodb
+
+    dynamodb = get_dynamodb(boto3.session.Session())
+    user_id, item_id = str(uuid4()), str(uuid4())
+    dynamodb.Table(USERS_TABLE).put_item(Item={"id": user_id, "username": f"bench-{user_id}"})
+    dynamodb.Table(ITEMS_TABLE).put_item(
+        Item={"id": item_id, "owner_id": user_id, "name": "bench", "description": "cold start"}
+    )
+    return dynamodb, user_id, item_id
+
+
+def run_once(mode: str, user_id: str) -> dict:
+    env = {**os.environ, "PRIME_ON_INIT": MODES[mode]}
+    out = subprocess.run(
+        [sys.executable, "-m", "bench.cold_start", "--child", user_id],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", metavar="USER_ID", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    dynamodb, user_id, item_id = seed_user()
+    try:
+        results = {mode: {m: [] for m in METRICS} for mode in MODES}
+        for _ in range(args.runs):
+            # Interleave modes so drift (disk cache, network) hits both
+            for mode in MODES:
+                for metric, value in run_once(mode, user_id).items():
+                    results[mode][metric].append(value)
+    finally:
+        from db import USERS_TABLE, ITEMS_TABLE
+        dynamodb.Table(ITEMS_TABLE).delete_item(Key={"id": item_id})
+        dynamodb.Table(USERS_TABLE).delete_item(Key={"id": user_id})
+
+    print(f"{'mode':<10}" + "".join(f"{m + ' (median)':>22}" for m in METRICS))
+    for mode, metrics in results.items():
+        print(f"{mode:<10}" + "".join(f"{statistics.median(metrics[m]):>22.1f}" for m in METRICS))
+    for metric in METRICS:
+        delta = statistics.median(results["primed"][metric]) - statistics.median(results["cold"][metric])
+        print(f"primed - cold {metric}: {delta:+.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+# bench/gate.py
+"""Performance regression gate against a committed baseline.
+
+Run from backend/:  python -m bench.gate [--repeat N] [--only load,import,alloc,micro]
+                    [--baseline PATH] [--update-baseline]
+
+Runs each suite --repeat times (fresh interpreters for load and import
+time), so every tracked metric has one sample per run, and compares the
+samples with the baseline's (bench/baselines/gate.json). A metric's change
+is the ratio of medians; its 95% confidence interval is bootstrapped from
+both sample sets. A metric FAILS when the whole interval is worse than its
+tolerance, and is flagged "noisy" when only the point estimate is. Exits 1
+if any metric fails.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.dirname(HERE)
+DEFAULT_BASELINE = os.path.join(HERE, "baselines", "gate.json")
+SUITES = ("load", "import", "alloc", "micro")
+
+# Small load run per repeat: 4 users keep bcrypt (register/login) from
+# dominating the run time
+LOAD_ARGS = ("--users", "4", "--requests", "600", "--concurrency", "4")
+LOAD_ENDPOINTS = ("create", "list", "update", "delete")
+ALLOC_REQUESTS = 50
+
+# Tolerated relative change before a metric counts as regressed, by prefix
+TOLERANCES = {
+    "load.throughput": 0.20,
+    "load.": 0.25,
+    # Calls per request move only with coalesced user reads (single-flight);
+    # one extra call on every request (an N+1) is +33% or more
+    "ddb.": 0.05,
+    "import.": 0.20,
+    "alloc.": 0.10,
+    "micro.": 0.20,
+}
+# Metrics where higher is better; everything else is lower-is-better
+HIGHER_IS_BETTER = ("load.throughput_rps",)
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env.setdefault("DYNAMODB_EMULATOR", "1")
+    env.setdefault("USERS_TABLE", "users")
+    env.setdefault("ITEMS_TABLE", "items")
+    return env
+
+
+def tolerance(metric: str) -> float:
+    return next(value for prefix, value in TOLERANCES.items() if metric.startswith(prefix))
+
+
+# -- suites: each returns {metric: value} for one run ----------------------
+def run_load() -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "load.json")
+        subprocess.run([sys.executable, "-m", "bench.load", *LOAD_ARGS, "--out", out],
+                       cwd=BACKEND, env=_env(), check=True, capture_output=True)
+        with open(out) as f:
+            result = json.load(f)
+    metrics = {"load.throughput_rps": result["summary"]["throughput_rps"]}
+    for op in LOAD_ENDPOINTS:
+        entry = result["endpoints"].get(op)
+        if not entry or not entry["count"]:
+            continue
+        metrics[f"load.{op}.p50_ms"] = entry["p50_ms"]
+        metrics[f"load.{op}.p99_ms"] = entry["p99_ms"]
+        metrics[f"ddb.{op}.calls_per_request"] = entry["ddb_calls_per_request"]
+    return metrics
+
+
+_IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import main; "
+    "print((time.perf_counter() - start) * 1000)"
+)
+
+
+def run_import() -> dict:
+    out = subprocess.run([sys.executable, "-c", _IMPORT_SNIPPET], cwd=BACKEND, env=_env(),
+                         check=True, capture_output=True, text=True)
+    return {"import.main_ms": float(out.stdout.strip().splitlines()[-1])}
+
+
+def run_alloc() -> dict:
+    out = subprocess.run([sys.executable, "-m", "bench.gate", "--alloc-child"], cwd=BACKEND, env=_env(),
+                         check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def alloc_child() -> None:
+    """Peak bytes traced per request (above the pre-request level), median
+    over ALLOC_REQUESTS requests per endpoint, after a warm-up."""
+    import tracemalloc
+    from fastapi.testclient import TestClient
+    from bench.load import in_process_app
+
+    client = TestClient(in_process_app())
+    credentials = {"username": "alloc-user", "password": "alloc-password"}
+    client.post("/api/user/register/", json=credentials)
+    token = client.post("/api/user/login/", json=credentials).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    for i in range(20):
+        client.post("/api/item/create/", json={"name": f"item {i}", "description": "x" * 100}, headers=headers)
+
+    requests = {
+        "list": lambda: client.get("/api/item/read/", headers=headers),
+        "create": lambda: client.post("/api/item/create/", json={"name": "n", "description": "d"}, headers=headers),
+    }
+    metrics = {}
+    tracemalloc.start()
+    for name, send in requests.items():
+        for _ in range(5):
+            send()
+        peaks = []
+        for _ in range(ALLOC_REQUESTS):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            send()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        metrics[f"alloc.{name}.peak_kb"] = statistics.median(peaks) / 1024
+    tracemalloc.stop()
+    print(json.dumps(metrics))
+
+
+def run_micro() -> dict:
+    from bench.micro import BENCHMARKS, run_suite
+
+    result = run_suite(list(BENCHMARKS), repeat=3, min_time=0.05)
+    return {f"micro.{name}_ns": entry["median_ns"] for name, entry in result["benchmarks"].items()}
+
+
+RUNNERS = {"load": run_load, "import": run_import, "alloc": run_alloc, "micro": run_micro}
+
+
+def collect(suites, repeat: int) -> dict:
+    samples: dict = {}
+    for i in range(repeat):
+        # Interleave suites so drift during the run affects all of them
+        for suite in suites:
+            print(f"run {i + 1}/{repeat}: {suite}", file=sys.stderr)
+            for metric, value in RUNNERS[suite]().items():
+                samples.setdefault(metric, []).append(value)
+    return samples
+
+
+# -- statistics ------------------------------------------------------------
+def relative_change(metric: str, baseline: float, current: float) -> float:
+    """Positive = worse, in either direction."""
+    if metric in HIGHER_IS_BETTER:
+        return baseline / current - 1 if current else float("inf")
+    if baseline == 0:
+        return 0.0 if current == 0 else float("inf")
+    return current / baseline - 1
+
+
+def bootstrap_ci(metric: str, baseline: list, current: list, resamples: int = 2000,
+                 confidence: float = 0.95, seed: int = 0) -> tuple[float, float]:
+    rng = random.Random(seed)
+    changes = sorted(
+        relative_change(metric,
+                        statistics.median(rng.choices(baseline, k=len(baseline))),
+                        statistics.median(rng.choices(current, k=len(current))))
+        for _ in range(resamples)
+    )
+    tail = (1 - confidence) / 2
+    return changes[int(tail * resamples)], changes[min(resamples - 1, int((1 - tail) * resamples))]
+
+
+def judge(metric: str, baseline: list, current: list) -> dict:
+    change = relative_change(metric, statistics.median(baseline), statistics.median(current))
+    low, high = bootstrap_ci(metric, baseline, current)
+    limit = tolerance(metric)
+    if low > limit:
+        status = "FAIL"
+    elif change > limit:
+        status = "noisy"
+    elif high < -limit:
+        status = "better"
+    else:
+        status = "ok"
+    return {"change": change, "ci": (low, high), "tolerance": limit, "status": status}
+
+
+def compare(baseline: dict, current: dict) -> dict:
+    verdicts = {}
+    for metric, samples in current.items():
+        base = baseline.get(metric)
+        if not base:
+            verdicts[metric] = {"status": "new"}
+            continue
+        verdicts[metric] = judge(metric, base, samples)
+    return verdicts
+
+
+def print_table(baseline: dict, current: dict, verdicts: dict) -> None:
+    print(f"{'metric':<42}{'baseline':>12}{'current':>12}{'change':>9}{'95% CI':>20}{'tol':>6}  status")
+    for metric in sorted(current):
+        verdict = verdicts[metric]
+        now = statistics.median(current[metric])
+        if verdict["status"] == "new":
+            print(f"{metric:<42}{'-':>12}{now:>12.2f}{'':>9}{'':>20}{'':>6}  new")
+            continue
+        low, high = verdict["ci"]
+        print(f"{metric:<42}{statistics.median(baseline[metric]):>12.2f}{now:>12.2f}"
+              f"{verdict['change']:>+9.1%}{f'[{low:+.1%}, {high:+.1%}]':>20}"
+              f"{verdict['tolerance']:>6.0%}  {verdict['status']}")
+    missing = sorted(set(baseline) - set(current))
+    if missing:
+        print(f"not measured this run: {', '.join(missing)}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", default=",".join(SUITES), help=f"comma-separated suites ({', '.join(SUITES)})")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--alloc-child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.alloc_child:
+        alloc_child()
+        return 0
+    suites = [s for s in args.only.split(",") if s]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(sorted(unknown))}")
+    if args.repeat < 2:
+        parser.error("--repeat must be at least 2 for confidence intervals")
+
+    for key in ("DYNAMODB_EMULATOR", "USERS_TABLE", "ITEMS_TABLE"):
+        os.environ.setdefault(key, _env()[key])
+    current = collect(suites, args.repeat)
+
+    if args.update_baseline:
+        baseline_doc = {
+            "meta": {
+                "tool": "bench.gate",
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "repeat": args.repeat,
+            },
+            "metrics": {metric: [round(v, 4) for v in values] for metric, values in sorted(current.items())},
+        }
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline_doc, f, indent=1)
+        print(f"wrote baseline {args.baseline} ({len(current)} metrics x {args.repeat} runs)")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --update-baseline first", file=sys.stderr)
+        return 2
+    with open(args.baseline) as f:
+        baseline = json.load(f)["metrics"]
+    verdicts = compare(baseline, current)
+    print_table(baseline, current, verdicts)
+
+    failed = [metric for metric, verdict in verdicts.items() if verdict["status"] == "FAIL"]
+    if failed:
+        print(f"\n{len(failed)} metric(s) regressed beyond tolerance: {', '.join(sorted(failed))}")
+        return 1
+    print("\nno regressions beyond tolerance")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+# bench/hedging.py
+"""Tail latency of point reads with and without hedging.
+
+Run from backend/:  python -m bench.hedging [--calls N] [--tail-rate R]
+
+Uses a local stub instead of DynamoDB: a botocore client whose requests are
+answered in-process after a jittered delay (core.faults.FaultInjector with
+`latency`), mostly a few ms with a slow tail. Each mode issues the same
+sequence of GetItem calls through the real boto3 resource path.
+"""
+import argparse
+import random
+import statistics
+import time
+
+import boto3
+from botocore.config import Config
+
+from core.faults import FaultInjector, local_response
+from core.hedging import HedgedReader
+
+
+def _stub_response(request, **kwargs):
+    return local_response(request.url, 200, b'{"Item": {"id": {"S": "bench"}}}')
+
+
+def make_table(latency):
+    session = boto3.session.Session(aws_access_key_id="x", aws_secret_access_key="x", region_name="us-east-1")
+    resource = session.resource("dynamodb", endpoint_url="http://dynamodb.stub",
+                                config=Config(retries={"mode": "standard", "total_max_attempts": 1}))
+    events = resource.meta.client.meta.events
+    events.register("before-send.dynamodb", _stub_response)
+    FaultInjector(latency=latency).install(resource.meta.client)
+    return resource.Table("bench")
+
+
+def jitter(tail_rate: float, seed: int):
+    rng = random.Random(seed)
+
+    def latency() -> float:
+        if rng.random() < tail_rate:
+            return rng.uniform(0.05, 0.15)       # slow tail: 50-150 ms
+        return rng.lognormvariate(-5.3, 0.25)   # body: ~5 ms
+    return latency
+
+
+def percentiles(samples: list) -> dict:
+    q = statistics.quantiles(samples, n=100)
+    return {"p50": q[49], "p95": q[94], "p99": q[98], "max": max(samples)}
+
+
+def run_mode(calls: int, tail_rate: float, reader: HedgedReader | None) -> list:
+    table = make_table(jitter(tail_rate, seed=42))
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        if reader is None:
+            table.get_item(Key={"id": "bench"})
+        else:
+            reader.call(table.get_item, Key={"id": "bench"})
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--tail-rate", type=float, default=0.03)
+    parser.add_argument("--percentile", type=float, default=95)
+    parser.add_argument("--budget", type=float, default=0.05)
+    args = parser.parse_args()
+
+    reader = HedgedReader(percentile=args.percentile, budget_ratio=args.budget)
+    results = {
+        "unhedged": run_mode(args.calls, args.tail_rate, None),
+        "hedged": run_mode(args.calls, args.tail_rate, reader),
+    }
+
+    print(f"{'mode':<12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for mode, timings in results.items():
+        p = percentiles(timings)
+        print(f"{mode:<12}{p['p50']:>10.2f}{p['p95']:>10.2f}{p['p99']:>10.2f}{p['max']:>10.2f}")
+    stats = reader.stats
+    print(f"hedged {stats['hedged']}/{stats['calls']} calls "
+          f"({stats['hedged'] / stats['calls']:.1%}), hedge won {stats['hedge_won']}, "
+          f"over budget {stats['over_budget']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+# bench/load.py
+"""End-to-end load test: a weighted workload mix across simulated users.
+
+Run from backend/:  python -m bench.load [--users N] [--requests N]
+                    [--concurrency C] [--mix create=30,list=40,...]
+                    [--url http://localhost:8000] [--out PATH]
+                    [--update-baseline]
+
+By default the ASGI app runs in-process (httpx ASGITransport) against the
+in-process DynamoDB emulator, so the numbers are the app's own cost: routing,
+validation, auth, serialization, middleware and boto3, with no network.
+Each simulated user registers and logs in, then `--requests` operations are
+drawn from the mix and spread over the users by `--concurrency` workers.
+
+Reports throughput and p50/p95/p99 per endpoint plus DynamoDB calls per
+request (counted by a before-call hook on the app's client; not available
+with --url), and writes the run as JSON, raw samples included, to
+bench/results/ (git-ignored). --update-baseline also writes its summary
+statistics, without samples, to bench/baselines/load.json.
+"""
+import argparse
+import asyncio
+import contextvars
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+# register/login are measured during setup (once per user); bcrypt makes
+# them ~100x the cost of the item endpoints, so weighting them into the mix
+# would mostly measure GIL contention with password hashing
+DEFAULT_MIX = "create=30,list=45,update=15,delete=10"
+OPERATIONS = ("register", "login", "create", "list", "update", "delete")
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.path.join(HERE, "baselines", "load.json")
+RESULTS_DIR = os.path.join(HERE, "results")
+PASSWORD = "bench-password"
+
+# Mutable per-request counter, set by the client task before each request.
+# With ASGITransport the app runs in that task (and its threadpool calls copy
+# the context), so the hook below sees the same list
+_ddb_calls: contextvars.ContextVar[list | None] = contextvars.ContextVar("bench_ddb_calls", default=None)
+
+
+def parse_mix(spec: str) -> dict:
+    mix = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise SystemExit(f"unknown operation {name!r} in --mix (one of {', '.join(OPERATIONS)})")
+        mix[name] = float(weight)
+    if not mix or sum(mix.values()) <= 0:
+        raise SystemExit("--mix needs at least one positive weight")
+    return mix
+
+
+def percentile(samples: list, p: float) -> float:
+    # Nearest-rank on sorted samples; exact for small runs too
+    ordered = sorted(samples)
+    rank = max(1, round(p / 100 * len(ordered) + 0.5))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _count_call(**kwargs):
+    counter = _ddb_calls.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def in_process_app():
+    """Import the app against the emulator and return it (tables created)."""
+    os.environ.setdefault("DYNAMODB_EMULATOR", "1")
+    os.environ.setdefault("USERS_TABLE", "users")
+    os.environ.setdefault("ITEMS_TABLE", "items")
+    # The governor's per-process cap is sized for one Lambda request at a
+    # time; a whole load test shares this process
+    os.environ.setdefault("GOVERNOR_MAX_RATE", "100000")
+
+    import main
+    from bench.tables import ensure_tables
+    from db import dynamodb, dynamodb_client
+
+    ensure_tables(dynamodb)
+    dynamodb_client.meta.events.register("before-call.dynamodb", _count_call, unique_id="bench-load-calls")
+    # Keep the JSON request logs (their cost is part of every request) but
+    # do not flood the terminal with them
+    import logging
+    for handler in logging.getLogger().handlers:
+        if hasattr(handler, "setStream"):
+            handler.setStream(open(os.devnull, "w"))
+    return main.app
+
+
+class User:
+    def __init__(self, username: str):
+        self.username = username
+        self.headers: dict = {}
+        self.items: list[str] = []
+
+
+class LoadTest:
+    def __init__(self, client, mix: dict, seed: int, count_calls: bool):
+        self.client = client
+        self.mix = mix
+        self.rng = random.Random(seed)
+        self.count_calls = count_calls
+        self.users: list[User] = []
+        self.samples = {op: [] for op in OPERATIONS}
+        self.calls = {op: [] for op in OPERATIONS}
+        self.errors = {op: 0 for op in OPERATIONS}
+        self.run_id = f"{seed}-{int(time.time())}"
+        self._user_numbers = itertools.count()
+
+    async def request(self, op: str, method: str, path: str, **kwargs):
+        counter = [0]
+        token = _ddb_calls.set(counter)
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, **kwargs)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            _ddb_calls.reset(token)
+        if response.status_code >= 400:
+            self.errors[op] += 1
+        else:
+            self.samples[op].append(elapsed)
+            if self.count_calls:
+                self.calls[op].append(counter[0])
+        return response
+
+    async def register(self):
+        user = User(f"load-{self.run_id}-{next(self._user_numbers)}")
+        credentials = {"username": user.username, "password": PASSWORD}
+        response = await self.request("register", "POST", "/api/user/register/", json=credentials)
+        if response.status_code < 400:
+            user.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+            self.users.append(user)
+
+    async def login(self, user: User):
+        credentials = {"username": user.username, "password": PASSWORD}
+        response = await self.request("login", "POST", "/api/user/login/", json=credentials)
+        if response.status_code < 400:
+            user.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def create(self, user: User):
+        n = self.rng.randrange(1_000_000)
+        body = {"name": f"item {n:06d}", "description": "load test " + "x" * self.rng.randrange(20, 200)}
+        response = await self.request("create", "POST", "/api/item/create/", json=body, headers=user.headers)
+        if response.status_code < 400:
+            user.items.append(response.json()["id"])
+
+    async def list(self, user: User):
+        await self.request("list", "GET", "/api/item/read/", headers=user.headers)
+
+    async def update(self, user: User):
+        item_id = self.rng.choice(user.items)
+        body = {"name": f"renamed {self.rng.randrange(1000):03d}", "description": "updated"}
+        await self.request("update", "PUT", f"/api/item/update/{item_id}", json=body, headers=user.headers)
+
+    async def delete(self, user: User):
+        item_id = user.items.pop(self.rng.randrange(len(user.items)))
+        await self.request("delete", "DELETE", f"/api/item/delete/{item_id}", headers=user.headers)
+
+    def plan(self, count: int) -> list:
+        # Drawn up front so the sequence depends only on the seed
+        names, weights = zip(*self.mix.items())
+        return self.rng.choices(names, weights=weights, k=count)
+
+    async def step(self, op: str):
+        if op == "register":
+            await self.register()
+            return
+        user = self.rng.choice(self.users)
+        if op in ("list", "update", "delete") and not user.items:
+            op = "create"  # nothing to read or change yet
+        await getattr(self, op)(user)
+
+    async def run(self, users: int, requests: int, concurrency: int) -> float:
+        # Setup (register + login per user) is measured but not timed
+        # towards throughput
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited(coro):
+            async with semaphore:
+                await coro
+
+        await asyncio.gather(*(limited(self.register()) for _ in range(users)))
+        if not self.users:
+            raise SystemExit("no user could register; is the app reachable?")
+        await asyncio.gather(*(limited(self.login(user)) for user in self.users))
+
+        queue = asyncio.Queue()
+        for op in self.plan(requests):
+            queue.put_nowait(op)
+
+        async def worker():
+            while not queue.empty():
+                await self.step(queue.get_nowait())
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - start
+
+
+def summarize(test: LoadTest, duration: float, args, target: str) -> dict:
+    endpoints = {}
+    for op in OPERATIONS:
+        samples = test.samples[op]
+        if not samples and not test.errors[op]:
+            continue
+        entry = {"count": len(samples), "errors": test.errors[op]}
+        if samples:
+            entry.update({
+                "p50_ms": percentile(samples, 50),
+                "p95_ms": percentile(samples, 95),
+                "p99_ms": percentile(samples, 99),
+                "mean_ms": statistics.fmean(samples),
+                "max_ms": max(samples),
+            })
+        if test.calls[op]:
+            entry["ddb_calls_per_request"] = statistics.fmean(test.calls[op])
+        entry["samples_ms"] = [round(s, 3) for s in samples]
+        endpoints[op] = entry
+
+    measured = sum(len(test.samples[op]) + test.errors[op] for op in OPERATIONS)
+    mixed = args.requests
+    all_calls = [c for op in OPERATIONS for c in test.calls[op]]
+    return {
+        "meta": {
+            "tool": "bench.load",
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "target": target,
+            "users": args.users,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "mix": parse_mix(args.mix),
+            "seed": args.seed,
+        },
+        "summary": {
+            "requests": measured,
+            "errors": sum(test.errors.values()),
+            "mix_duration_s": duration,
+            "throughput_rps": mixed / duration if duration else 0.0,
+            "ddb_calls_per_request": statistics.fmean(all_calls) if all_calls else None,
+        },
+        "endpoints": endpoints,
+    }
+
+
+def baseline_view(result: dict) -> dict:
+    # The committed baseline keeps the statistics, not the raw samples
+    endpoints = {op: {k: v for k, v in entry.items() if k != "samples_ms"}
+                 for op, entry in result["endpoints"].items()}
+    return {**result, "endpoints": endpoints}
+
+
+def _write(path: str, result: dict) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(result, f, indent=1)
+        f.write("\n")
+    print(f"wrote {path}")
+
+
+def print_report(result: dict) -> None:
+    print(f"{'endpoint':<10}{'count':>7}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'ddb/req':>9}")
+    for op, entry in result["endpoints"].items():
+        calls = entry.get("ddb_calls_per_request")
+        print(f"{op:<10}{entry['count']:>7}{entry['errors']:>8}"
+              f"{entry.get('p50_ms', 0):>9.2f}{entry.get('p95_ms', 0):>9.2f}{entry.get('p99_ms', 0):>9.2f}"
+              f"{calls if calls is not None else float('nan'):>9.2f}")
+    summary = result["summary"]
+    print(f"mix: {result['meta']['requests']} requests in {summary['mix_duration_s']:.2f}s "
+          f"-> {summary['throughput_rps']:.1f} req/s, {summary['errors']} errors")
+
+
+async def _main(args) -> dict:
+    import httpx
+
+    if args.url:
+        transport, base_url, target = None, args.url, args.url
+    else:
+        transport = httpx.ASGITransport(app=in_process_app())
+        base_url, target = "http://bench", "in-process (emulator)" if os.getenv("DYNAMODB_EMULATOR") == "1" else "in-process"
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=30) as client:
+        test = LoadTest(client, parse_mix(args.mix), args.seed, count_calls=not args.url)
+        duration = await test.run(args.users, args.requests, args.concurrency)
+    return summarize(test, duration, args, target)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"weights per operation (default {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--url", help="load a running server instead of the in-process app")
+    parser.add_argument("--out", help="where to write the JSON result ('-' for stdout; "
+                                          "default bench/results/load-<time>.json)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help=f"also write the summary statistics to {os.path.relpath(BASELINE)}")
+    args = parser.parse_args(argv)
+    parse_mix(args.mix)
+
+    result = asyncio.run(_main(args))
+    print_report(result)
+    if args.out == "-":
+        json.dump(result, sys.stdout, indent=1)
+    else:
+        stamp = result["meta"]["timestamp"].replace(":", "").replace("-", "").split("+")[0]
+        _write(args.out or os.path.join(RESULTS_DIR, f"load-{stamp}.json"), result)
+    if args.update_baseline:
+        _write(BASELINE, baseline_view(result))
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# bench/memory.py
+"""Leak hunt: repeat one request and diff the heap before and after.
+
+Run from backend/:  python -m bench.memory [--path /api/item/read/] [--items 200]
+                    [--requests 500] [--top 15] [--frames 1]
+                    [--url https://<api> --bearer JWT --profile-token TOKEN]
+
+In-process (default), the app runs with MEMORY_PROFILING=1 against the
+emulator: a user with --items items is seeded, the request is warmed up,
+the heap is snapshotted, the request is sent --requests times, and the
+largest growth by source line is printed with the per-route peak/net bytes.
+Memory that grows with --requests is retained across requests; memory that
+only shows in the peak is per-request materialization (e.g. a full result
+set held before it is serialized).
+
+With --url, the same steps run against a deployed app with
+MEMORY_PROFILING=1 via its /api/debug/memory/ endpoints (X-Profile-Token
+from tools.profile_token); under Lambda, keep concurrency at one so the
+requests reach the container that took the snapshot.
+"""
+import argparse
+import gc
+import os
+import sys
+
+PASSWORD = "memory-password"
+
+
+def _print_diff(result: dict, routes: dict) -> None:
+    print(f"{'route':<40}{'requests':>10}{'peak mean':>12}{'peak max':>12}{'net mean':>12}")
+    for route, stats in routes.items():
+        print(f"{route:<40}{stats['requests']:>10}{stats['peak_bytes_mean']:>12}"
+              f"{stats['peak_bytes_max']:>12}{stats['net_bytes_mean']:>12}")
+    print(f"\ntraced {result['traced_bytes']} bytes, {result['growth_bytes']:+} since snapshot")
+    print(f"{'size diff':>12}{'count diff':>12}  where")
+    for stat in result["top"]:
+        print(f"{stat['size_diff']:>+12}{stat['count_diff']:>+12}  {stat['where'][-1]}")
+        for frame in reversed(stat["where"][:-1]):
+            print(f"{'':>26}{frame}")
+
+
+def run_local(args) -> None:
+    os.environ["MEMORY_PROFILING"] = "1"
+    os.environ["MEMORY_TRACE_FRAMES"] = str(args.frames)
+    from fastapi.testclient import TestClient
+    from bench.load import in_process_app
+    from core import memory
+
+    client = TestClient(in_process_app())
+    credentials = {"username": "memory-user", "password": PASSWORD}
+    client.post("/api/user/register/", json=credentials)
+    token = client.post("/api/user/login/", json=credentials).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    for i in range(args.items):
+        client.post("/api/item/create/", json={"name": f"item {i}", "description": "x" * 100}, headers=headers)
+
+    for _ in range(10):
+        client.get(args.path, headers=headers)
+    gc.collect()
+    memory.reset()
+    baseline = memory.take_snapshot()
+    for _ in range(args.requests):
+        client.get(args.path, headers=headers)
+    gc.collect()
+    _print_diff(memory.diff(top=args.top, group=args.group, baseline=baseline), memory.route_stats())
+
+
+def run_remote(args) -> None:
+    import httpx
+
+    debug = {"X-Profile-Token": args.profile_token}
+    headers = {"Authorization": f"Bearer {args.bearer}"} if args.bearer else {}
+    with httpx.Client(base_url=args.url, timeout=30) as client:
+        for _ in range(10):
+            client.get(args.path, headers=headers)
+        client.post("/api/debug/memory/snapshot/", headers=debug).raise_for_status()
+        for _ in range(args.requests):
+            client.get(args.path, headers=headers)
+        diff = client.get("/api/debug/memory/diff/", params={"top": args.top, "group": args.group}, headers=debug)
+        diff.raise_for_status()
+        stats = client.get("/api/debug/memory/", headers=debug)
+        stats.raise_for_status()
+    _print_diff(diff.json(), stats.json()["routes"])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", default="/api/item/read/", help="GET path to repeat")
+    parser.add_argument("--items", type=int, default=200, help="items to seed (in-process only)")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--group", default="lineno", choices=("lineno", "filename", "traceback"))
+    parser.add_argument("--frames", type=int, default=1, help="traceback depth traced (in-process only)")
+    parser.add_argument("--url", help="deployed app instead of in-process")
+    parser.add_argument("--bearer", help="access token for --path (with --url)")
+    parser.add_argument("--profile-token", help="X-Profile-Token for the debug endpoints (with --url)")
+    args = parser.parse_args(argv)
+
+    if args.url:
+        if not args.profile_token:
+            parser.error("--url needs --profile-token")
+        run_remote(args)
+    else:
+        run_local(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
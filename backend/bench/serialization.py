@@ -0,0 +1,96 @@
+# bench/serialization.py
+"""Compare item-list response encoding paths.
+
+Run from backend/:  python -m bench.serialization [--repeat N]
+"""
+import argparse
+import json
+import statistics
+import time
+
+from pydantic import TypeAdapter
+
+from core.ids import new_item_id
+from core.serialization import dumps, trusted_items
+from schemas.item import ItemPartial, ItemRead
+
+SIZES = (1_000, 10_000)
+
+# What FastAPI does for response_model=list[ItemPartial]: validate, dump to
+# JSON-able python, then JSONResponse.render -> json.dumps
+_route_adapter = TypeAdapter(list[ItemPartial])
+# Validated encoding with a cached adapter
+item_list_adapter = TypeAdapter(list[ItemRead])
+
+
+def fastapi_default(rows):
+    models = _route_adapter.validate_python(rows)
+    content = _route_adapter.dump_python(models, mode="json", exclude_unset=True)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def cached_type_adapter(rows):
+    return item_list_adapter.dump_json(item_list_adapter.validate_python(rows))
+
+
+def trusted_fast_json(rows):
+    return dumps(trusted_items(rows))
+
+
+PATHS = {
+    "fastapi_default": fastapi_default,
+    "type_adapter": cached_type_adapter,
+    "trusted_orjson": trusted_fast_json,
+}
+
+
+def make_rows(n: int) -> list:
+    owner_id = new_item_id()
+    return [
+        {
+            "id": new_item_id(),
+            "owner_id": owner_id,
+            "name": f"Item {i}",
+            "description": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+        }
+        for i in range(n)
+    ]
+
+
+def measure(fn, rows, repeat: int) -> list:
+    fn(rows)  # warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(rows)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def run(repeat: int = 20) -> dict:
+    results = {}
+    for size in SIZES:
+        rows = make_rows(size)
+        for name, fn in PATHS.items():
+            timings = measure(fn, rows, repeat)
+            results[f"{name}[{size}]"] = {
+                "median_ms": statistics.median(timings),
+                "min_ms": min(timings),
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    print(f"{'path':<28}{'median ms':>12}{'min ms':>12}")
+    for name, stats in results.items():
+        print(f"{name:<28}{stats['median_ms']:>12.2f}{stats['min_ms']:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
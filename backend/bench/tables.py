@@ -0,0 +1,43 @@
+# bench/tables.py
+# The app's tables, as defined in infra/terraform/tf-backend/dynamodb.tf,
+# for benchmarks that run against the emulator or DynamoDB Local
+from botocore.exceptions import ClientError
+
+from db import ITEMS_TABLE, USERS_TABLE
+
+_S = "S"
+
+
+def _gsi(name: str, hash_key: str, range_key: str | None = None) -> dict:
+    keys = [{"AttributeName": hash_key, "KeyType": "HASH"}]
+    if range_key:
+        keys.append({"AttributeName": range_key, "KeyType": "RANGE"})
+    return {"IndexName": name, "KeySchema": keys, "Projection": {"ProjectionType": "ALL"}}
+
+
+TABLES = (
+    {
+        "TableName": USERS_TABLE,
+        "KeySchema": [{"AttributeName": "id", "KeyType": "HASH"}],
+        "AttributeDefinitions": [{"AttributeName": n, "AttributeType": _S} for n in ("id", "username")],
+        "GlobalSecondaryIndexes": [_gsi("username-index", "username")],
+    },
+    {
+        "TableName": ITEMS_TABLE,
+        "KeySchema": [{"AttributeName": "id", "KeyType": "HASH"}],
+        "AttributeDefinitions": [{"AttributeName": n, "AttributeType": _S} for n in ("id", "owner_id", "name")],
+        "GlobalSecondaryIndexes": [
+            _gsi("owner-created-index", "owner_id", "id"),
+            _gsi("owner-name-index", "owner_id", "name"),
+        ],
+    },
+)
+
+
+def ensure_tables(dynamodb) -> None:
+    for spec in TABLES:
+        try:
+            dynamodb.create_table(BillingMode="PAY_PER_REQUEST", **spec).wait_until_exists()
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ResourceInUseException":
+                raise
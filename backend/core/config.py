@@ -1,5 +1,96 @@
+import os
 
 # SECRET KEY for JWT (in production use a secure one)
 SECRET_KEY = "mysecretkey"
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
\ No newline at end of file
+ACCESS_TOKEN_EXPIRE_MINUTES = 30
+
+# Maintain a per-owner item_count on the user record, updated in the same
+# transaction as item creates/deletes (read by GET /api/item/count/?mode=cached)
+ITEM_COUNTER_ENABLED = os.getenv("ITEM_COUNTER_ENABLED", "0") == "1"
+
+# Response compression (middleware/compression.py): JSON/NDJSON bodies of at
+# least this many bytes are brotli/gzip-compressed per Accept-Encoding
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+
+# Keep-warm / scheduled ping events are answered before Mangum; when enabled
+# they also make one cheap DynamoDB read to keep a pooled TLS connection warm
+WARMER_PRIME_DB = os.getenv("WARMER_PRIME_DB", "1") == "1"
+
+# Opt-in init-phase priming (main.py): load the DynamoDB model, open a pooled
+# connection and run each hot path once while the Lambda is initialising
+PRIME_ON_INIT = os.getenv("PRIME_ON_INIT", "0") == "1"
+
+# DynamoDB client retries: N > 0 switches to botocore "standard" mode with
+# N total attempts; 0 keeps botocore's default retry behaviour
+DYNAMODB_MAX_ATTEMPTS = int(os.getenv("DYNAMODB_MAX_ATTEMPTS", "0"))
+
+# Storage governor (core/governor.py), opt-in: per-process adaptive rate
+# limit on DynamoDB calls and a circuit breaker that answers 503 while it is
+# open (5xx and connection errors only; throttles lower the rate)
+GOVERNOR_ENABLED = os.getenv("GOVERNOR_ENABLED", "0") == "1"
+GOVERNOR_MAX_RATE = float(os.getenv("GOVERNOR_MAX_RATE", "500"))   # calls/s
+GOVERNOR_MIN_RATE = float(os.getenv("GOVERNOR_MIN_RATE", "5"))     # floor after throttling
+GOVERNOR_MAX_WAIT = float(os.getenv("GOVERNOR_MAX_WAIT", "0.25"))  # s to wait for a token
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("BREAKER_RESET_SECONDS", "10"))
+
+# Hedged point reads (core/hedging.py): a GetItem that has not answered
+# within the recent HEDGE_PERCENTILE latency is sent again and the first
+# answer wins. HEDGE_BUDGET caps hedges as a share of reads (per process)
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "0") == "1"
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_DELAY_MS = float(os.getenv("HEDGE_MIN_DELAY_MS", "5"))
+HEDGE_MAX_DELAY_MS = float(os.getenv("HEDGE_MAX_DELAY_MS", "200"))
+HEDGE_BUDGET = float(os.getenv("HEDGE_BUDGET", "0.05"))
+
+# Local fault injection (core/faults.py), e.g. "throttle=0.2,error=0.05".
+# For local testing only; leave unset in deployed environments
+DYNAMODB_FAULTS = os.getenv("DYNAMODB_FAULTS", "")
+
+# In-process DynamoDB emulator (emulator/) instead of AWS or DynamoDB Local:
+# the test suite and benchmarks run without containers or credentials
+DYNAMODB_EMULATOR = os.getenv("DYNAMODB_EMULATOR", "0") == "1"
+
+# On-demand request profiling (middleware/profiling.py): a request carrying a
+# valid X-Profile-Token (core.security.create_profiling_token) is sampled
+# every PROFILE_INTERVAL_MS and its folded stacks are logged ("log") or
+# written as <request id>.folded into the PROFILE_OUTPUT directory
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "1") == "1"
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "2"))
+PROFILE_OUTPUT = os.getenv("PROFILE_OUTPUT", "log")
+PROFILE_MAX_STACKS = int(os.getenv("PROFILE_MAX_STACKS", "500"))
+
+# Continuous profiling for long-running servers (uvicorn; not started under
+# Lambda, where Mangum skips lifespan): all busy threads are sampled every
+# CONTINUOUS_PROFILE_INTERVAL_MS into windows of CONTINUOUS_PROFILE_WINDOW_SECONDS,
+# the last CONTINUOUS_PROFILE_WINDOWS kept; read them at GET /api/debug/profile/
+CONTINUOUS_PROFILING = os.getenv("CONTINUOUS_PROFILING", "0") == "1"
+CONTINUOUS_PROFILE_INTERVAL_MS = float(os.getenv("CONTINUOUS_PROFILE_INTERVAL_MS", "20"))
+CONTINUOUS_PROFILE_WINDOW_SECONDS = float(os.getenv("CONTINUOUS_PROFILE_WINDOW_SECONDS", "60"))
+CONTINUOUS_PROFILE_WINDOWS = int(os.getenv("CONTINUOUS_PROFILE_WINDOWS", "15"))
+
+# Per-request allocation accounting (middleware/memory.py): tracemalloc traces
+# every allocation, which slows the app down noticeably, so it is opt-in.
+# MEMORY_TRACE_FRAMES > 1 groups snapshot diffs by traceback, at more cost
+MEMORY_PROFILING = os.getenv("MEMORY_PROFILING", "0") == "1"
+MEMORY_TRACE_FRAMES = int(os.getenv("MEMORY_TRACE_FRAMES", "1"))
+
+# Per-request DynamoDB call tracking (core/ddb_calls.py): calls are counted
+# and timed per table, index and operation. "app.ddb" warns (once per route
+# and pattern) when a request makes more than DDB_CALL_BUDGET calls (0 = no
+# limit) or, with DDB_WARN_REPEATED_KEYS, addresses the same key twice
+DDB_CALL_TRACKING = os.getenv("DDB_CALL_TRACKING", "1") == "1"
+DDB_CALL_BUDGET = int(os.getenv("DDB_CALL_BUDGET", "5"))
+DDB_WARN_REPEATED_KEYS = os.getenv("DDB_WARN_REPEATED_KEYS", "1") == "1"
+
+# Tracing (core/tracing.py): a root span per request, continuing an incoming
+# W3C traceparent, with child spans for auth, DynamoDB calls, bcrypt and
+# serialization; trace/span ids are added to every log line. Spans are
+# exported in batches to TRACE_EXPORT: "log", "file:/path/spans.ndjson" or a
+# collector URL (tools/trace_collector.py); empty = ids in logs only
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "0") == "1"
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1"))
+TRACE_EXPORT = os.getenv("TRACE_EXPORT", "log")
+TRACE_BATCH_SIZE = int(os.getenv("TRACE_BATCH_SIZE", "256"))
+TRACE_FLUSH_SECONDS = float(os.getenv("TRACE_FLUSH_SECONDS", "5"))
@@ -0,0 +1,216 @@
+# core/ddb_calls.py
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+log = logging.getLogger("app.ddb")
+
+# Operations addressing one item by its full key: the same key twice in one
+# request is a repeated lookup (including read-then-write of one item)
+KEY_OPERATIONS = ("GetItem", "UpdateItem", "DeleteItem")
+
+
+class DynamoDBCall:
+    __slots__ = ("operation", "table", "index", "key", "start", "duration_ms", "error")
+
+    def __init__(self, operation: str, table: str, index: str | None, key: str | None):
+        self.operation = operation
+        self.table = table
+        self.index = index
+        self.key = key
+        self.start = time.perf_counter()
+        # None until botocore reports the outcome; a call refused before it
+        # was sent (governor, parameter validation) keeps None
+        self.duration_ms: float | None = None
+        self.error: str | None = None
+
+
+class RequestCalls:
+    """DynamoDB calls made while handling one request."""
+
+    def __init__(self):
+        self.calls: list[DynamoDBCall] = []
+        self.route: str | None = None
+        # Hedged duplicates of reads in `calls` (core/hedging.py), counted
+        # apart so they neither use up the budget nor look like repeats
+        self.hedges = 0
+
+    def __len__(self) -> int:
+        return len(self.calls)
+
+    def count(self, operation: str | None = None, table: str | None = None) -> int:
+        return sum(1 for call in self.calls
+                   if (operation is None or call.operation == operation)
+                   and (table is None or call.table == table))
+
+    def by_operation(self) -> Counter:
+        # "table[.index] Operation" -> calls
+        return Counter(
+            f"{call.table}{'.' + call.index if call.index else ''} {call.operation}" for call in self.calls
+        )
+
+    def duration_ms(self) -> float:
+        return sum(call.duration_ms or 0.0 for call in self.calls)
+
+    def repeated_keys(self) -> list:
+        """Keys addressed more than once: [{"table", "key", "operations"}]."""
+        seen: dict = {}
+        for call in self.calls:
+            if call.key is not None:
+                seen.setdefault((call.table, call.index, call.key), []).append(call.operation)
+        return [{"table": table, "index": index, "key": key, "operations": operations}
+                for (table, index, key), operations in seen.items() if len(operations) > 1]
+
+    def summary(self) -> dict:
+        return {
+            "calls": len(self.calls),
+            "duration_ms": round(self.duration_ms(), 2),
+            "operations": dict(self.by_operation()),
+            "errors": sum(1 for call in self.calls if call.error),
+            "hedges": self.hedges,
+        }
+
+
+_current: ContextVar[RequestCalls | None] = ContextVar("ddb_calls", default=None)
+
+
+def current_calls() -> RequestCalls | None:
+    return _current.get()
+
+
+def _fingerprint(key: dict) -> str:
+    # Attribute names stay readable; values (ids, usernames) are hashed
+    digest = hashlib.blake2b(json.dumps(key, sort_keys=True).encode(), digest_size=6).hexdigest()
+    return f"{','.join(sorted(key))}#{digest}"
+
+
+def _describe(operation: str, params: dict) -> tuple[str, str | None, str | None]:
+    """(table, index, key fingerprint) of a call from its API parameters."""
+    if "TableName" in params:
+        table = params["TableName"]
+    elif "RequestItems" in params:
+        table = ",".join(sorted(params["RequestItems"]))
+    elif "TransactItems" in params:
+        table = ",".join(sorted({next(iter(item.values()))["TableName"] for item in params["TransactItems"]}))
+    else:
+        table = "-"
+    index = params.get("IndexName")
+    key = None
+    if operation in KEY_OPERATIONS and "Key" in params:
+        key = _fingerprint(params["Key"])
+    elif operation == "Query":
+        # Same key condition and values (and page) = the same lookup
+        key = _fingerprint({
+            "condition": params.get("KeyConditionExpression"),
+            "values": params.get("ExpressionAttributeValues"),
+            "start": params.get("ExclusiveStartKey"),
+        })
+    return table, index, key
+
+
+class CallTracker:
+    """botocore hooks that record each DynamoDB call into the current
+    request's RequestCalls (see track()); calls outside a request are not
+    recorded. A call is counted once, however many attempts it takes."""
+
+    def install(self, client) -> None:
+        events = client.meta.events
+        events.register("before-parameter-build.dynamodb", self._before_call, unique_id="ddb-calls-before")
+        events.register("after-call.dynamodb", self._after_call, unique_id="ddb-calls-after")
+        events.register("after-call-error.dynamodb", self._after_call_error, unique_id="ddb-calls-error")
+
+    def _before_call(self, params=None, model=None, context=None, **kwargs):
+        calls = _current.get()
+        if calls is None or context is None:
+            return
+        if context.get("hedge"):
+            calls.hedges += 1
+            return
+        call = DynamoDBCall(model.name, *_describe(model.name, params or {}))
+        context["ddb_call"] = call
+        calls.calls.append(call)
+
+    def _after_call(self, http_response=None, parsed=None, context=None, **kwargs):
+        call = (context or {}).get("ddb_call")
+        if call is None:
+            return
+        call.duration_ms = (time.perf_counter() - call.start) * 1000
+        if http_response is not None and http_response.status_code >= 300:
+            call.error = (parsed or {}).get("Error", {}).get("Code") or str(http_response.status_code)
+
+    def _after_call_error(self, exception=None, context=None, **kwargs):
+        call = (context or {}).get("ddb_call")
+        if call is None:
+            return
+        call.duration_ms = (time.perf_counter() - call.start) * 1000
+        call.error = type(exception).__name__
+
+
+# Finished requests are passed to these (tests use capture())
+_listeners: list = []
+_warned: set = set()
+_warned_lock = threading.Lock()
+MAX_WARNED = 1024
+
+
+@contextmanager
+def track(route: str | None = None, max_calls: int = 0, warn_repeats: bool = True):
+    """Record the DynamoDB calls made in this context (threads started
+    with a copy of it included), then check them against the budget."""
+    calls = RequestCalls()
+    calls.route = route
+    token = _current.set(calls)
+    try:
+        yield calls
+    finally:
+        _current.reset(token)
+        check(calls, max_calls, warn_repeats)
+        for listener in list(_listeners):
+            listener(calls)
+
+
+def _warn_once(signature: tuple) -> bool:
+    # One warning per route and pattern per process: a hot endpoint with a
+    # known pattern does not flood the logs
+    with _warned_lock:
+        if signature in _warned or len(_warned) >= MAX_WARNED:
+            return False
+        _warned.add(signature)
+        return True
+
+
+def check(calls: RequestCalls, max_calls: int = 0, warn_repeats: bool = True) -> None:
+    if max_calls and len(calls) > max_calls and _warn_once((calls.route, "calls")):
+        log.warning("DynamoDB call budget exceeded", extra={
+            "path": calls.route, "ddb_calls": calls.summary(), "ddb_call_budget": max_calls,
+        })
+    if warn_repeats:
+        repeated = calls.repeated_keys()
+        signature = (calls.route, "repeat", tuple(sorted(
+            (entry["table"], entry["index"] or "", tuple(entry["operations"])) for entry in repeated
+        )))
+        if repeated and _warn_once(signature):
+            log.warning("Repeated DynamoDB key lookup", extra={
+                "path": calls.route, "ddb_calls": calls.summary(), "ddb_repeats": repeated,
+            })
+
+
+@contextmanager
+def capture():
+    """Collect the RequestCalls of every request finished in this block."""
+    finished: list = []
+    _listeners.append(finished.append)
+    try:
+        yield finished
+    finally:
+        _listeners.remove(finished.append)
+
+
+def reset_warnings() -> None:
+    with _warned_lock:
+        _warned.clear()
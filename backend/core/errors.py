@@ -1,8 +1,10 @@
 # core/errors.py
-import logging, os
+import logging, math, os
 from fastapi import Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from botocore.exceptions import ClientError
+from core.governor import THROTTLE_CODES, StorageUnavailable
 from core.observability import get_request_id
 
 logger = logging.getLogger("app.errors")
@@ -24,7 +26,7 @@ async def http_exception_handler(request: Request, exc):
 
 async def validation_exception_handler(request: Request, exc):
     payload = {
-        "detail": exc.errors(),
+        "detail": jsonable_encoder(exc.errors()),
         "request_id": get_request_id(),
     }
     logger.warning("ValidationError", extra={
@@ -34,10 +36,38 @@ async def validation_exception_handler(request: Request, exc):
     })
     return JSONResponse(payload, status_code=422)
 
+def _retry_after(seconds: float) -> dict:
+    return {"Retry-After": str(max(1, math.ceil(seconds)))}
+
+async def storage_unavailable_handler(request: Request, exc: StorageUnavailable):
+    rid = get_request_id()
+    logger.warning("Storage unavailable", extra={
+        "request_id": rid,
+        "path": request.url.path,
+        "status_code": 503,
+    })
+    return JSONResponse(
+        {"detail": "Storage temporarily unavailable", "reason": exc.reason, "request_id": rid},
+        status_code=503,
+        headers=_retry_after(exc.retry_after),
+    )
+
 async def client_error_handler(request: Request, exc: ClientError):
     rid = get_request_id()
     code = exc.response.get("Error", {}).get("Code")
     msg  = exc.response.get("Error", {}).get("Message")
+    if code in THROTTLE_CODES:
+        # Still throttled after botocore's retries: tell the client to back off
+        logger.warning("DynamoDB throttled", extra={
+            "request_id": rid,
+            "path": request.url.path,
+            "status_code": 503,
+        })
+        return JSONResponse(
+            {"detail": "Storage temporarily unavailable", "aws_error_code": code, "request_id": rid},
+            status_code=503,
+            headers=_retry_after(1),
+        )
     logger.error("DynamoDB ClientError", extra={
         "request_id": rid,
         "path": request.url.path,
@@ -0,0 +1,107 @@
+# core/faults.py
+import json
+import logging
+import random
+import threading
+import time
+from typing import Callable
+
+from botocore.awsrequest import AWSResponse
+from botocore.exceptions import EndpointConnectionError
+
+log = logging.getLogger("app.faults")
+
+_FAULTS = {
+    # name: (status, error code) returned instead of sending the request
+    "throttle": (400, "ProvisionedThroughputExceededException"),
+    "error": (500, "InternalServerError"),
+    "unavailable": (503, "ServiceUnavailable"),
+}
+
+
+class _RawBody:
+    # Minimal stand-in for the urllib3 response botocore normally reads
+    def __init__(self, body: bytes):
+        self._body = body
+
+    def stream(self, *args, **kwargs):
+        yield self._body
+
+
+def local_response(url: str, status: int, body: bytes, headers: dict | None = None) -> AWSResponse:
+    """A DynamoDB JSON response produced in-process, for before-send hooks
+    that answer instead of sending (fault injection, the emulator, stubs)."""
+    headers = {"Content-Type": "application/x-amz-json-1.0", "Content-Length": str(len(body)), **(headers or {})}
+    return AWSResponse(url, status, headers, _RawBody(body))
+
+
+def fault_response(url: str, status: int, code: str) -> AWSResponse:
+    body = json.dumps({
+        "__type": f"com.amazonaws.dynamodb.v20120810#{code}",
+        "message": "Injected fault",
+    }).encode("utf-8")
+    return local_response(url, status, body)
+
+
+class FaultInjector:
+    """Fail a share of DynamoDB requests locally, without reaching AWS.
+
+    Hooks botocore's before-send, so every attempt (botocore's own retries
+    included) rolls again, and the governor, retry handler and error handlers
+    see the same responses a real throttled or failing table produces.
+    `rates` maps a fault ("throttle", "error", "unavailable", "disconnect")
+    to its probability; `script` queues faults for the next attempts, which
+    makes tests deterministic. `latency`, a callable returning seconds, adds
+    a delay to every attempt (e.g. jitter for tail-latency benchmarks).
+    """
+
+    def __init__(self, rates: dict | None = None, seed: int | None = None,
+                 latency: Callable[[], float] | None = None):
+        self.rates = dict(rates or {})
+        self.latency = latency
+        self.script: list[str | None] = []
+        self.injected = {name: 0 for name in (*_FAULTS, "disconnect")}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def install(self, client) -> None:
+        # First, so it wins over any other before-send responder (e.g. moto)
+        client.meta.events.register_first("before-send.dynamodb", self._before_send,
+                                          unique_id="fault-injector")
+
+    def uninstall(self, client) -> None:
+        client.meta.events.unregister("before-send.dynamodb", unique_id="fault-injector")
+
+    def _next_fault(self) -> str | None:
+        with self._lock:
+            if self.script:
+                return self.script.pop(0)
+            roll = self._random.random()
+            for name, rate in self.rates.items():
+                if roll < rate:
+                    return name
+                roll -= rate
+            return None
+
+    def _before_send(self, request, **kwargs):
+        if self.latency:
+            time.sleep(self.latency())
+        fault = self._next_fault()
+        if fault is None:
+            return None
+        self.injected[fault] += 1
+        if fault == "disconnect":
+            raise EndpointConnectionError(endpoint_url=request.url)
+        status, code = _FAULTS[fault]
+        return fault_response(request.url, status, code)
+
+
+def parse_fault_rates(spec: str) -> dict:
+    # "throttle=0.2,error=0.05" -> {"throttle": 0.2, "error": 0.05}
+    rates = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, rate = part.partition("=")
+        if name not in _FAULTS and name != "disconnect":
+            raise ValueError(f"unknown fault {name!r}")
+        rates[name] = float(rate)
+    return rates
@@ -0,0 +1,245 @@
+# core/governor.py
+import logging
+import math
+import threading
+import time
+
+from botocore.exceptions import (
+    ConnectionClosedError,
+    ConnectTimeoutError,
+    EndpointConnectionError,
+    ReadTimeoutError,
+)
+
+log = logging.getLogger("app.governor")
+
+# Error codes meaning "slow down": they shrink the request rate. They are
+# not breaker failures: a hot partition or a burst over capacity is paced by
+# the rate limit, not answered with 503s for the whole process
+THROTTLE_CODES = frozenset({
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+})
+# Error codes meaning the table/service is unhealthy: they count against the
+# circuit breaker
+FAILURE_CODES = frozenset({"InternalServerError", "ServiceUnavailable"})
+FAILURE_EXCEPTIONS = (ConnectionClosedError, ConnectTimeoutError, EndpointConnectionError, ReadTimeoutError)
+
+
+class StorageUnavailable(Exception):
+    """DynamoDB is being shed or is known to be down; answered with 503."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdaptiveTokenBucket:
+    """Client-side rate limit that backs off on throttling (AIMD).
+
+    Every throttle multiplies the rate by `decrease` (at most once per
+    `cooldown` seconds, so a burst of throttled calls counts once); every
+    success adds roughly `increase` calls/s per second of traffic, up to
+    `max_rate`.
+    """
+
+    def __init__(self, max_rate: float, min_rate: float, burst: float | None = None,
+                 decrease: float = 0.5, increase: float = 1.0, cooldown: float = 0.1,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.rate = max_rate
+        self.burst = burst or max(1.0, max_rate)
+        self.decrease = decrease
+        self.increase = increase
+        self.cooldown = cooldown
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._refilled_at = clock()
+        self._throttled_at = -math.inf
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def acquire(self, max_wait: float) -> bool:
+        # Take one token, waiting up to max_wait for it; False means shed
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0
+            if wait > max_wait:
+                return False
+            # Reserve now (tokens may go negative) so waiters queue fairly
+            self._tokens -= 1
+        if wait:
+            self._sleep(wait)
+        return True
+
+    def on_throttle(self) -> bool:
+        # Returns True when the rate was actually lowered
+        with self._lock:
+            now = self._clock()
+            if now - self._throttled_at < self.cooldown:
+                return False
+            self._throttled_at = now
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            return True
+
+    def on_success(self) -> None:
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+
+class CircuitBreaker:
+    """closed -> open after `failure_threshold` consecutive failures; open ->
+    half-open after `reset_timeout`; one probe call then closes or re-opens."""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float,
+                 clock=time.monotonic, on_change=None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._clock = clock
+        self._on_change = on_change
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def _transition(self, state: str) -> None:
+        previous, self.state = self.state, state
+        if self._on_change:
+            self._on_change(previous, state)
+
+    def retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN:
+                if self.retry_after() > 0:
+                    return False
+                self._transition(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    return False
+                self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or (
+                    self.state == self.CLOSED and self._failures >= self.failure_threshold):
+                self._opened_at = self._clock()
+                self._transition(self.OPEN)
+
+    def release(self) -> None:
+        # The call ended without telling us anything about DynamoDB's health
+        with self._lock:
+            self._probing = False
+
+
+class StorageGovernor:
+    """Rate limiter + circuit breaker attached to a botocore client's events.
+
+    before-call: fail fast with StorageUnavailable if the breaker is open or
+    no token frees up within `max_wait`. response-received (every attempt,
+    including botocore's retries): throttles lower the rate. after-call /
+    after-call-error (final outcome): feed the breaker. State changes are
+    logged as metrics and counted in `stats`.
+    """
+
+    def __init__(self, bucket: AdaptiveTokenBucket, failure_threshold: int,
+                 reset_timeout: float, max_wait: float, clock=time.monotonic):
+        self.bucket = bucket
+        self.max_wait = max_wait
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout,
+                                      clock=clock, on_change=self._breaker_changed)
+        self.stats = {"throttles": 0, "failures": 0, "shed": 0, "rejected": 0,
+                      "breaker_opened": 0, "rate_decreased": 0}
+        # Hooks run on every thread that uses the client
+        self._stats_lock = threading.Lock()
+
+    def install(self, client) -> None:
+        events = client.meta.events
+        events.register("before-call.dynamodb", self._before_call, unique_id="governor-before-call")
+        events.register("response-received.dynamodb", self._response_received, unique_id="governor-response")
+        events.register("after-call.dynamodb", self._after_call, unique_id="governor-after-call")
+        events.register("after-call-error.dynamodb", self._after_call_error, unique_id="governor-after-call-error")
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _metric(self, message: str, level: int = logging.WARNING) -> None:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        log.log(level, message, extra={
+            "breaker_state": self.breaker.state,
+            "rate_limit": round(self.bucket.rate, 2),
+            "governor_stats": stats,
+        })
+
+    def _breaker_changed(self, previous: str, state: str) -> None:
+        if state == CircuitBreaker.OPEN:
+            self._count("breaker_opened")
+        level = logging.INFO if state == CircuitBreaker.CLOSED else logging.WARNING
+        self._metric(f"DynamoDB circuit {previous} -> {state}", level)
+
+    def _before_call(self, context=None, **kwargs):
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise StorageUnavailable("circuit open", retry_after=self.breaker.retry_after() or 1.0)
+        if not self.bucket.acquire(self.max_wait):
+            self.breaker.release()
+            self._count("shed")
+            raise StorageUnavailable("rate limited", retry_after=1.0 / self.bucket.rate)
+        return None
+
+    def _response_received(self, parsed_response=None, **kwargs):
+        code = (parsed_response or {}).get("Error", {}).get("Code")
+        if code in THROTTLE_CODES:
+            self._count("throttles")
+            if self.bucket.on_throttle():
+                self._count("rate_decreased")
+                self._metric("DynamoDB throttled, lowering client rate")
+
+    def _after_call(self, parsed=None, **kwargs):
+        code = (parsed or {}).get("Error", {}).get("Code")
+        if code in FAILURE_CODES:
+            self._count("failures")
+            self.breaker.record_failure()
+            return
+        if code in THROTTLE_CODES:
+            # Already fed to the rate limit; says nothing about availability
+            self.breaker.release()
+            return
+        # Conditional check failures, validation errors, etc. are answers
+        # from a healthy table
+        self.bucket.on_success()
+        self.breaker.record_success()
+
+    def _after_call_error(self, exception=None, **kwargs):
+        if isinstance(exception, FAILURE_EXCEPTIONS):
+            self._count("failures")
+            self.breaker.record_failure()
+        else:
+            self.breaker.release()
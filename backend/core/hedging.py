@@ -0,0 +1,161 @@
+# core/hedging.py
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import ContextVar
+
+# Request handlers run in anyio's worker threads (run_in_threadpool), 40 by
+# default; each can have one point read in flight
+SERVER_THREADS = 40
+
+# Set in a hedge's context: its calls duplicate a read already in flight
+_hedge_attempt: ContextVar[bool] = ContextVar("hedge_attempt", default=False)
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies (seconds)."""
+
+    def __init__(self, window: int = 1000):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, p: float) -> float | None:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+class HedgeBudget:
+    """Each call earns `ratio` of a hedge, up to `burst`; a hedge spends one.
+
+    Caps hedges at roughly `ratio` of calls, so a slow table cannot double
+    the load on itself.
+    """
+
+    def __init__(self, ratio: float, burst: float = 10.0):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def earn(self) -> None:
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class HedgedReader:
+    """Run an idempotent read; if it has not answered within the recent
+    p-th percentile latency, send a duplicate and return whichever answers
+    first.
+
+    Until `min_samples` latencies are known the delay is `max_delay`. The
+    losing call is not cancelled (boto3 calls cannot be); its result is
+    dropped, but its latency still feeds the tracker. install() flags the
+    duplicate's botocore calls with context["hedge"], so per-request call
+    accounting (core/ddb_calls.py) does not count them as repeats.
+
+    The caller waits for whichever attempt answers first, so both run on
+    the pool. It holds a primary and a hedge for every server thread; if it
+    is ever full, the read runs unhedged on the caller's thread rather than
+    queueing behind other reads.
+    """
+
+    def __init__(self, percentile: float = 95, min_delay: float = 0.005, max_delay: float = 0.2,
+                 budget_ratio: float = 0.05, min_samples: int = 20, max_workers: int = 2 * SERVER_THREADS):
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.latency = LatencyTracker()
+        self.budget = HedgeBudget(budget_ratio)
+        self.stats = {"calls": 0, "hedged": 0, "hedge_won": 0, "over_budget": 0, "inline": 0}
+        self._stats_lock = threading.Lock()
+        # Free pool threads; submissions never queue
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+
+    def install(self, client) -> None:
+        # First, so later before-parameter-build hooks see the flag
+        client.meta.events.register_first("before-parameter-build.dynamodb", self._mark_hedge,
+                                          unique_id="hedge-mark")
+
+    def _mark_hedge(self, context=None, **kwargs):
+        if context is not None and _hedge_attempt.get():
+            context["hedge"] = True
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def delay(self) -> float:
+        if len(self.latency) < self.min_samples:
+            return self.max_delay
+        return min(self.max_delay, max(self.min_delay, self.latency.percentile(self.percentile)))
+
+    def _submit(self, fn, args, kwargs, hedge: bool = False):
+        # None when every pool thread is busy
+        if not self._slots.acquire(blocking=False):
+            return None
+        start = time.perf_counter()
+
+        def done(future):
+            self._slots.release()
+            self.latency.record(time.perf_counter() - start)
+
+        # Run in a copy of the caller's context (request id, etc.)
+        context = contextvars.copy_context()
+        if hedge:
+            context.run(_hedge_attempt.set, True)
+        future = self._executor.submit(context.run, fn, *args, **kwargs)
+        future.add_done_callback(done)
+        return future
+
+    def call(self, fn, *args, **kwargs):
+        self._count("calls")
+        self.budget.earn()
+        primary = self._submit(fn, args, kwargs)
+        if primary is None:
+            self._count("inline")
+            return fn(*args, **kwargs)
+        done, _ = wait([primary], timeout=self.delay())
+        if done:
+            return primary.result()
+        if not self.budget.spend():
+            self._count("over_budget")
+            return primary.result()
+
+        hedge = self._submit(fn, args, kwargs, hedge=True)
+        if hedge is None:
+            self._count("inline")
+            return primary.result()
+        self._count("hedged")
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._count("hedge_won")
+                    return future.result()
+                error = future.exception()
+        # Both attempts failed: surface the last error like an unhedged call
+        raise error
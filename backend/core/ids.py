@@ -0,0 +1,59 @@
+# core/ids.py
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+# UUIDv7 (RFC 9562): 48-bit unix millisecond timestamp, 4-bit version,
+# 12-bit rand_a, 2-bit variant, 62-bit rand_b. The canonical hex string sorts
+# lexicographically in creation order, which is what DynamoDB compares.
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def new_item_id() -> str:
+    # rand_a is used as a per-millisecond counter (RFC 9562 method 1) so ids
+    # minted in the same process stay strictly increasing.
+    global _last_ms, _counter
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms > _last_ms:
+            _last_ms = ms
+            _counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                _last_ms += 1
+                _counter = 0
+        ms, counter = _last_ms, _counter
+
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | rand_b
+    return str(uuid.UUID(int=value))
+
+
+def _to_ms(moment: datetime) -> int:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+def id_floor(moment: datetime) -> str:
+    """Smallest UUIDv7 that can be minted at `moment`."""
+    return str(uuid.UUID(int=(_to_ms(moment) << 80) | (0x7 << 76) | (0b10 << 62)))
+
+
+def id_ceiling(moment: datetime) -> str:
+    """Largest UUIDv7 that can be minted at `moment`."""
+    value = (_to_ms(moment) << 80) | (0x7 << 76) | (0xFFF << 64) | (0b10 << 62) | ((1 << 62) - 1)
+    return str(uuid.UUID(int=value))
+
+
+def id_created_at(item_id: str) -> datetime | None:
+    """Creation time embedded in a UUIDv7 id (None for legacy uuid4 ids)."""
+    parsed = uuid.UUID(item_id)
+    if parsed.version != 7:
+        return None
+    return datetime.fromtimestamp((parsed.int >> 80) / 1000, tz=timezone.utc)
@@ -0,0 +1,179 @@
+# core/lambda_stream.py
+import asyncio
+import base64
+import json
+import logging
+import time
+from urllib.parse import unquote
+
+from starlette.types import ASGIApp, Message
+
+log = logging.getLogger("app.lambda_stream")
+
+# Scope key set on requests served by StreamingLambdaHandler; routes that can
+# produce their body incrementally check it
+STREAMING_SCOPE_KEY = "aws.response_stream"
+
+# Separates the JSON prelude (status, headers, cookies) from the body in an
+# HTTP-integration streamed response
+PRELUDE_DELIMITER = b"\x00" * 8
+
+
+def event_to_scope(event: dict, context) -> tuple[dict, bytes]:
+    """Build an ASGI HTTP scope and body from a payload v2 event (function
+    URLs and HTTP APIs)."""
+    http = event["requestContext"]["http"]
+    headers = {k.lower(): v for k, v in (event.get("headers") or {}).items()}
+    if event.get("cookies"):
+        headers["cookie"] = "; ".join(event["cookies"])
+    host = headers.get("host", "lambda")
+
+    body = event.get("body") or b""
+    if isinstance(body, str):
+        body = base64.b64decode(body) if event.get("isBase64Encoded") else body.encode("utf-8")
+
+    path = unquote(event.get("rawPath") or http["path"])
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.0"},
+        "http_version": "1.1",
+        "method": http["method"],
+        "scheme": headers.get("x-forwarded-proto", "https"),
+        "path": path,
+        "raw_path": None,
+        "root_path": "",
+        "query_string": (event.get("rawQueryString") or "").encode("latin-1"),
+        "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()],
+        "server": (host, int(headers.get("x-forwarded-port", 443))),
+        "client": (http.get("sourceIp", ""), 0),
+        "aws.event": event,
+        "aws.context": context,
+        STREAMING_SCOPE_KEY: True,
+    }
+    return scope, body
+
+
+def encode_prelude(status: int, raw_headers: list) -> bytes:
+    headers, cookies = {}, []
+    for name, value in raw_headers:
+        name, value = name.decode("latin-1").lower(), value.decode("latin-1")
+        if name == "set-cookie":
+            cookies.append(value)
+        elif name in headers:
+            headers[name] = f"{headers[name]}, {value}"
+        else:
+            headers[name] = value
+    prelude = {"statusCode": status, "headers": headers, "cookies": cookies}
+    return json.dumps(prelude).encode("utf-8") + PRELUDE_DELIMITER
+
+
+class StreamingLambdaHandler:
+    """Lambda handler that writes the ASGI response to a response stream.
+
+    Mangum collects the whole body before returning it; here the prelude is
+    written on http.response.start and every body chunk as soon as the app
+    sends it, so a StreamingResponse reaches the client page by page.
+
+    `response_stream` needs write(bytes) and close(). The Python managed
+    runtime does not provide one: deploy behind a runtime that invokes the
+    handler with a stream and posts it to the Runtime API in streaming mode
+    (Lambda-Runtime-Function-Response-Mode: streaming, content type
+    application/vnd.awslambda.http-integration-response), e.g. a custom
+    bootstrap. LocalResponseStream emulates it for tests and local runs.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    def __call__(self, event: dict, context, response_stream) -> None:
+        # A private loop: asyncio.run() would clear the thread's current
+        # loop, which Mangum's handler still relies on
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self._run(event, context, response_stream))
+        finally:
+            loop.close()
+            response_stream.close()
+
+    async def _run(self, event: dict, context, response_stream) -> None:
+        scope, body = event_to_scope(event, context)
+        done = asyncio.Event()
+        request_sent = False
+        started = False
+
+        async def receive() -> Message:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Only report a disconnect once the response is complete;
+            # Starlette cancels streaming responses on http.disconnect
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+                response_stream.write(encode_prelude(message["status"], message.get("headers", [])))
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                if chunk:
+                    response_stream.write(chunk)
+                if not message.get("more_body", False):
+                    done.set()
+
+        try:
+            await self.app(scope, receive, send)
+        except Exception:
+            log.exception("Unhandled error while streaming response")
+            if not started:
+                response_stream.write(encode_prelude(500, [(b"content-type", b"application/json")]))
+                response_stream.write(b'{"detail":"Internal Server Error"}')
+        finally:
+            done.set()
+
+
+class LocalResponseStream:
+    """In-memory stand-in for Lambda's response stream.
+
+    Records every write with its arrival time, so tests can check that the
+    prelude and first chunk arrived before the body was complete.
+    """
+
+    def __init__(self):
+        self.writes: list[tuple[float, bytes]] = []
+        self.closed = False
+
+    def write(self, data: bytes) -> None:
+        if self.closed:
+            raise ValueError("write to closed response stream")
+        self.writes.append((time.perf_counter(), bytes(data)))
+
+    def close(self) -> None:
+        self.closed = True
+
+    @property
+    def raw(self) -> bytes:
+        return b"".join(data for _, data in self.writes)
+
+    @property
+    def prelude(self) -> dict:
+        head, _, _ = self.raw.partition(PRELUDE_DELIMITER)
+        return json.loads(head)
+
+    @property
+    def body(self) -> bytes:
+        return self.raw.partition(PRELUDE_DELIMITER)[2]
+
+    @property
+    def chunks(self) -> list[bytes]:
+        # Body writes, in order (the first write is the prelude)
+        return [data for _, data in self.writes[1:]]
+
+
+def invoke_streaming(handler, event: dict, context=None) -> LocalResponseStream:
+    # Local harness: call a streaming handler the way the runtime would
+    stream = LocalResponseStream()
+    handler(event, context, stream)
+    return stream
@@ -1,5 +1,6 @@
 # core/logging.py
 import json, logging, os, sys
+from core.tracing import current_span
 
 class JsonFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
@@ -10,9 +11,18 @@ class JsonFormatter(logging.Formatter):
             "time": self.formatTime(record, self.datefmt),
         }
         # Attach extras (request_id, path, etc.)
-        for key in ("request_id", "path", "method", "status_code", "duration_ms"):
+        for key in ("request_id", "path", "method", "status_code", "duration_ms",
+                    "breaker_state", "rate_limit", "governor_stats",
+                    "profile", "profile_file", "profile_samples",
+                    "alloc_peak_bytes", "alloc_net_bytes",
+                    "ddb_calls", "ddb_call_budget", "ddb_repeats", "spans"):
             if hasattr(record, key):
                 payload[key] = getattr(record, key)
+        # Trace context of the code that logged (see core/tracing.py)
+        span = current_span()
+        if span is not None:
+            payload["trace_id"] = span.trace_id
+            payload["span_id"] = span.span_id
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
         return json.dumps(payload, ensure_ascii=False)
@@ -0,0 +1,101 @@
+# core/memory.py
+import threading
+import tracemalloc
+
+# Allocations made by tracemalloc itself and by the import machinery are
+# noise for leak hunting
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+_lock = threading.Lock()
+_routes: dict = {}
+_baseline: tracemalloc.Snapshot | None = None
+
+
+def start(frames: int = 1) -> None:
+    # More frames give tracebacks in diffs, at a higher cost per allocation
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def tracing() -> bool:
+    return tracemalloc.is_tracing()
+
+
+def record(route: str, net: int, peak: int) -> None:
+    with _lock:
+        stats = _routes.get(route)
+        if stats is None:
+            stats = _routes[route] = {"requests": 0, "net_bytes": 0, "peak_bytes_total": 0, "peak_bytes_max": 0}
+        stats["requests"] += 1
+        stats["net_bytes"] += net
+        stats["peak_bytes_total"] += peak
+        stats["peak_bytes_max"] = max(stats["peak_bytes_max"], peak)
+
+
+def route_stats() -> dict:
+    """Per route: requests, mean/max peak and mean/total net bytes."""
+    with _lock:
+        return {
+            route: {
+                "requests": s["requests"],
+                "peak_bytes_mean": s["peak_bytes_total"] // s["requests"],
+                "peak_bytes_max": s["peak_bytes_max"],
+                "net_bytes_mean": s["net_bytes"] // s["requests"],
+                "net_bytes_total": s["net_bytes"],
+            }
+            for route, s in sorted(_routes.items())
+        }
+
+
+def reset() -> None:
+    global _baseline
+    with _lock:
+        _routes.clear()
+        _baseline = None
+
+
+def take_snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+
+def _total(snapshot: tracemalloc.Snapshot) -> int:
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+
+def mark() -> dict:
+    """Store the current heap as the baseline for diff()."""
+    global _baseline
+    snapshot = take_snapshot()
+    with _lock:
+        _baseline = snapshot
+    return {"traced_bytes": _total(snapshot), "traces": len(snapshot.traces)}
+
+
+def diff(top: int = 20, group: str = "lineno", baseline: tracemalloc.Snapshot | None = None,
+         current: tracemalloc.Snapshot | None = None) -> dict | None:
+    """Largest growth since the baseline (mark() unless given), grouped by
+    "lineno", "filename" or "traceback". None when there is no baseline."""
+    baseline = baseline or _baseline
+    if baseline is None:
+        return None
+    current = current or take_snapshot()
+    stats = current.compare_to(baseline, group)
+    return {
+        "traced_bytes": _total(current),
+        "growth_bytes": sum(stat.size_diff for stat in stats),
+        "top": [
+            {
+                "where": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+                "size_diff": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size": stat.size,
+                "count": stat.count,
+            }
+            for stat in stats[:top]
+        ],
+    }
@@ -0,0 +1,192 @@
+# core/profiling.py
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+# Leaf frames of threads that are parked, not working: the event loop in
+# select(), executor/anyio workers waiting for a job, joins
+IDLE_LEAVES = {
+    ("selectors", "select"),
+    ("threading", "wait"),
+    ("threading", "_wait_for_tstate_lock"),
+}
+
+_THREAD_SUFFIX = re.compile(r"[-_ ]?\d+(_\d+)?$")
+
+
+def _label(frame) -> tuple[str, str]:
+    return frame.f_globals.get("__name__", "?"), frame.f_code.co_name
+
+
+def collapse(frame, max_depth: int = 128) -> list:
+    """(module, function) pairs from the outermost frame to `frame`."""
+    stack = []
+    while frame is not None and len(stack) < max_depth:
+        stack.append(_label(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def thread_group(name: str) -> str:
+    # "ThreadPoolExecutor-0_3" -> "ThreadPoolExecutor", "AnyIO worker thread"
+    # stays as is: one flame graph root per kind of thread
+    return _THREAD_SUFFIX.sub("", name) or name
+
+
+class SamplingProfiler:
+    """Statistical profiler: a daemon thread snapshots every other thread's
+    Python stack each `interval` seconds and counts identical stacks.
+
+    Idle threads (see IDLE_LEAVES) are skipped unless `include_idle`. The
+    sampler needs the GIL to take a sample, so a busy thread delays it by up
+    to sys.getswitchinterval() (5 ms); `fine` lowers the switch interval to
+    `interval` while running, for short profiles where that matters.
+    Output is the collapsed ("folded") format flame graph tools read:
+    `thread;module:function;... count` per line, outermost frame first.
+    """
+
+    def __init__(self, interval: float = 0.002, include_idle: bool = False, max_depth: int = 128,
+                 fine: bool = False):
+        self.interval = interval
+        self.fine = fine
+        self._switch_interval: float | None = None
+        self.include_idle = include_idle
+        self.max_depth = max_depth
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "SamplingProfiler":
+        self._stop.clear()
+        if self.fine and self.interval < sys.getswitchinterval():
+            self._switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(self.interval)
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._switch_interval is not None:
+            sys.setswitchinterval(self._switch_interval)
+            self._switch_interval = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        own = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        stacks = []
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = collapse(frame, self.max_depth)
+            if not self.include_idle and stack and stack[-1] in IDLE_LEAVES:
+                continue
+            thread = thread_group(names.get(ident, "thread"))
+            stacks.append((thread, *(f"{module}:{function}" for module, function in stack)))
+        with self._lock:
+            self.samples += 1
+            self.counts.update(stacks)
+
+    def drain(self) -> Counter:
+        """Return the counts so far and start a new aggregate."""
+        with self._lock:
+            counts, self.counts = self.counts, Counter()
+            self.samples = 0
+        return counts
+
+
+def folded(counts: Counter, max_stacks: int | None = None) -> str:
+    # Most frequent stacks first, so a truncated profile keeps the hot paths
+    lines = [f"{';'.join(stack)} {count}" for stack, count in counts.most_common(max_stacks)]
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+class ContinuousProfiler(SamplingProfiler):
+    """Always-on sampler for long-running servers.
+
+    Samples all busy threads every `interval` seconds and closes a window
+    every `window` seconds; the last `keep` windows are kept (older ones are
+    dropped), so memory is bounded by the number of distinct stacks.
+    """
+
+    def __init__(self, interval: float = 0.02, window: float = 60.0, keep: int = 15,
+                 clock=time.time, **kwargs):
+        super().__init__(interval=interval, **kwargs)
+        self.window = window
+        self.clock = clock
+        self.windows: deque = deque(maxlen=keep)
+        self._window_start = clock()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+            if self.clock() - self._window_start >= self.window:
+                self.rotate()
+
+    def rotate(self) -> None:
+        now = self.clock()
+        with self._lock:
+            counts, samples = self.counts, self.samples
+            self.counts, self.samples = Counter(), 0
+        self.windows.append({"start": self._window_start, "end": now, "samples": samples, "counts": counts})
+        self._window_start = now
+
+    def snapshot(self, last: int | None = None, include_current: bool = True) -> dict:
+        """Merge the last `last` closed windows (all by default), plus the
+        open one, into {"start", "end", "samples", "windows", "counts"}."""
+        closed = list(self.windows)
+        if last is not None:
+            closed = closed[-last:] if last > 0 else []
+        with self._lock:
+            current = {"start": self._window_start, "end": self.clock(),
+                       "samples": self.samples, "counts": Counter(self.counts)}
+        parts = closed + ([current] if include_current else [])
+        counts = Counter()
+        for part in parts:
+            counts.update(part["counts"])
+        return {
+            "start": parts[0]["start"] if parts else self._window_start,
+            "end": parts[-1]["end"] if parts else self.clock(),
+            "samples": sum(part["samples"] for part in parts),
+            "windows": len(parts),
+            "counts": counts,
+        }
+
+
+_continuous: ContinuousProfiler | None = None
+
+
+def start_continuous(**kwargs) -> ContinuousProfiler:
+    global _continuous
+    if _continuous is None:
+        _continuous = ContinuousProfiler(**kwargs).start()
+    return _continuous
+
+
+def stop_continuous() -> None:
+    global _continuous
+    if _continuous is not None:
+        _continuous.stop()
+        _continuous = None
+
+
+def continuous_profiler() -> ContinuousProfiler | None:
+    return _continuous
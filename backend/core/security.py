@@ -1,17 +1,20 @@
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
-from jose import jwt
+from jose import JWTError, jwt
 from core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from core.tracing import span
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # Password Hashing
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    with span("bcrypt.hash"):
+        return pwd_context.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    with span("bcrypt.verify"):
+        return pwd_context.verify(plain_password, hashed_password)
 
 
 # Create JWT Token
@@ -21,3 +24,26 @@ def create_access_token(data: dict) -> str:
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+
+# Profiling tokens: same key and algorithm as access tokens, told apart by
+# their audience. Bearer auth rejects them (jose refuses an unexpected aud),
+# and access tokens, which have no aud, are refused here
+PROFILING_AUDIENCE = "profiling"
+
+
+def create_profiling_token(subject: str = "operator", minutes: int = 15) -> str:
+    expire = datetime.utcnow() + timedelta(minutes=minutes)
+    claims = {"sub": subject, "aud": PROFILING_AUDIENCE, "exp": expire}
+    return jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def verify_profiling_token(token: str) -> dict | None:
+    try:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], audience=PROFILING_AUDIENCE)
+    except JWTError:
+        return None
+    # jose skips the audience check when the claim is missing
+    if claims.get("aud") != PROFILING_AUDIENCE:
+        return None
+    return claims
@@ -0,0 +1,87 @@
+# core/serialization.py
+import json
+import zlib
+from decimal import Decimal
+from typing import Iterable
+
+from fastapi.responses import JSONResponse
+
+from core.tracing import span
+from schemas.item import ITEM_FIELDS
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+def _default(value):
+    # boto3 returns DynamoDB numbers as Decimal
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that encodes straight to bytes with orjson.
+
+    Route handlers return it for storage-originated data, which makes FastAPI
+    skip response_model validation; `response_model` stays on the route for
+    the OpenAPI schema only.
+    """
+
+    def render(self, content) -> bytes:
+        with span("serialize"):
+            return dumps(content)
+
+
+def trusted_item(row: dict, fields: Iterable[str] = ITEM_FIELDS) -> dict:
+    # Items we wrote ourselves already match ItemRead; only drop attributes
+    # the response model does not declare
+    return {f: row[f] for f in fields if f in row}
+
+
+def trusted_items(rows: list, fields: Iterable[str] | None = None) -> list:
+    fields = tuple(fields or ITEM_FIELDS)
+    return [{f: row[f] for f in fields if f in row} for row in rows]
+
+
+def ndjson_stream(pages: Iterable[list], fields: Iterable[str] | None = None, gzip: bool = False):
+    """Encode pages of item rows as newline-delimited JSON, one chunk per page.
+
+    With gzip=True the chunks form a single gzip member; each page is
+    sync-flushed so clients can decode it as soon as it arrives.
+    """
+    fields = tuple(fields or ITEM_FIELDS)
+    compressor = zlib.compressobj(wbits=31) if gzip else None
+    for page in pages:
+        if not page:
+            continue
+        with span("serialize", rows=len(page)):
+            chunk = b"".join(dumps({f: row[f] for f in fields if f in row}) + b"\n" for row in page)
+            if compressor:
+                chunk = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield chunk
+    if compressor:
+        yield compressor.flush()
+
+
+def json_array_stream(pages: Iterable[list], fields: Iterable[str] | None = None):
+    """Encode pages of item rows as one JSON array, one chunk per page."""
+    fields = tuple(fields or ITEM_FIELDS)
+    opening = b"["
+    for page in pages:
+        if not page:
+            continue
+        with span("serialize", rows=len(page)):
+            chunk = opening + b",".join(dumps({f: row[f] for f in fields if f in row}) for row in page)
+        yield chunk
+        opening = b","
+    yield b"[]" if opening == b"[" else b"]"
+
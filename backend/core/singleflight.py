@@ -0,0 +1,39 @@
+# core/singleflight.py
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Collapse concurrent calls that share a key into one underlying call.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is still in flight wait for and share its result (or its
+    exception). Nothing is cached once the call completes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
@@ -0,0 +1,311 @@
+# core/tracing.py
+import atexit
+import json
+import logging
+import random
+import re
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+log = logging.getLogger("app.tracing")
+
+# W3C trace context: version-traceid-parentid-flags, lowercase hex
+_TRACEPARENT = re.compile(r"([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})(-.*)?")
+SAMPLED = 0x01
+
+
+def _id(bits: int) -> str:
+    # All-zero ids are invalid in W3C trace context
+    return f"{random.getrandbits(bits) or 1:0{bits // 4}x}"
+
+
+def parse_traceparent(header: str | None) -> tuple[str, str, int] | None:
+    """(trace_id, parent span id, flags), or None if absent or invalid."""
+    if not header:
+        return None
+    match = _TRACEPARENT.fullmatch(header.strip())
+    if match is None:
+        return None
+    version, trace_id, parent_id, flags, rest = match.groups()
+    # Version ff is forbidden; version 00 has no trailing fields
+    if version == "ff" or (version == "00" and rest) or set(trace_id) == {"0"} or set(parent_id) == {"0"}:
+        return None
+    return trace_id, parent_id, int(flags, 16)
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "sampled", "start", "_start_perf",
+                 "duration_ms", "attributes", "error", "root")
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None, sampled: bool, attributes: dict,
+                 root: bool = False):
+        # root: first span of the trace in this process (its parent, if
+        # any, is the caller's)
+        self.root = root
+        self.trace_id = trace_id
+        self.span_id = _id(64)
+        self.parent_id = parent_id
+        self.name = name
+        self.sampled = sampled
+        self.start = time.time()
+        self._start_perf = time.perf_counter()
+        self.duration_ms: float | None = None
+        self.attributes = attributes
+        self.error: str | None = None
+
+    def child(self, name: str, **attributes) -> "Span":
+        return Span(name, self.trace_id, self.span_id, self.sampled, attributes)
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{SAMPLED if self.sampled else 0:02x}"
+
+    def end(self) -> None:
+        if self.duration_ms is not None:
+            return
+        self.duration_ms = (time.perf_counter() - self._start_perf) * 1000
+        if self.sampled and exporter is not None:
+            exporter.export(self)
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+_current: ContextVar[Span | None] = ContextVar("span", default=None)
+
+
+def current_span() -> Span | None:
+    return _current.get()
+
+
+def start_trace(name: str, traceparent: str | None = None, sample_rate: float = 1.0, **attributes) -> Span:
+    """Root span of this process's part of a trace: continues the caller's
+    trace (and its sampling decision) when `traceparent` is valid."""
+    parent = parse_traceparent(traceparent)
+    if parent is not None:
+        trace_id, parent_id, flags = parent
+        return Span(name, trace_id, parent_id, bool(flags & SAMPLED), attributes, root=True)
+    return Span(name, _id(128), None, random.random() < sample_rate, attributes, root=True)
+
+
+@contextmanager
+def activate(span: Span):
+    token = _current.set(span)
+    try:
+        yield span
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Child span of the current one; a no-op outside a sampled trace."""
+    parent = _current.get()
+    if parent is None or not parent.sampled:
+        yield None
+        return
+    child = parent.child(name, **attributes)
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as exc:
+        child.error = type(exc).__name__
+        raise
+    finally:
+        _current.reset(token)
+        child.end()
+
+
+class DynamoDBSpans:
+    """botocore hooks: one child span per DynamoDB call (retries included)."""
+
+    def install(self, client) -> None:
+        events = client.meta.events
+        events.register("before-parameter-build.dynamodb", self._before_call, unique_id="tracing-before")
+        events.register("after-call.dynamodb", self._after_call, unique_id="tracing-after")
+        events.register("after-call-error.dynamodb", self._after_call_error, unique_id="tracing-error")
+
+    def _before_call(self, params=None, model=None, context=None, **kwargs):
+        parent = _current.get()
+        if parent is None or not parent.sampled or context is None:
+            return
+        attributes = {"db.operation": model.name}
+        params = params or {}
+        if "TableName" in params:
+            attributes["db.table"] = params["TableName"]
+        if "IndexName" in params:
+            attributes["db.index"] = params["IndexName"]
+        context["trace_span"] = parent.child(f"dynamodb.{model.name}", **attributes)
+
+    def _after_call(self, http_response=None, parsed=None, context=None, **kwargs):
+        child = (context or {}).get("trace_span")
+        if child is None:
+            return
+        metadata = (parsed or {}).get("ResponseMetadata", {})
+        child.attributes["db.retries"] = metadata.get("RetryAttempts", 0)
+        if http_response is not None and http_response.status_code >= 300:
+            child.error = (parsed or {}).get("Error", {}).get("Code") or str(http_response.status_code)
+        child.end()
+
+    def _after_call_error(self, exception=None, context=None, **kwargs):
+        child = (context or {}).get("trace_span")
+        if child is None:
+            return
+        child.error = type(exception).__name__
+        child.end()
+
+
+# -- export ----------------------------------------------------------------
+class FileSink:
+    """Appends spans as JSON lines."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def write(self, spans: list) -> None:
+        with open(self.path, "a") as f:
+            f.write("".join(json.dumps(s, separators=(",", ":")) + "\n" for s in spans))
+
+
+class HttpSink:
+    """POSTs each batch as {"spans": [...]} (tools/trace_collector.py)."""
+
+    def __init__(self, url: str, timeout: float = 2.0):
+        self.url = url
+        self.timeout = timeout
+
+    def write(self, spans: list) -> None:
+        body = json.dumps({"spans": spans}).encode()
+        request = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class LogSink:
+    def write(self, spans: list) -> None:
+        log.info("Trace spans", extra={"spans": spans})
+
+
+class BatchExporter:
+    """Buffers finished spans and writes them in batches. A full buffer
+    drops new spans rather than growing (counted in `dropped`); flush() runs
+    at exit.
+
+    Without start() (Lambda) every trace is written inline when its root
+    span ends: the sandbox may be frozen or reclaimed right after the
+    invocation, and atexit does not run then, so nothing may wait in the
+    buffer. In server mode start() moves writes to a worker thread, keeping
+    sink I/O (an HTTP POST, a file append) off the event loop; it writes
+    when `batch_size` spans are waiting or `flush_interval` seconds after
+    the last write, and stop() ends it and flushes what is left."""
+
+    def __init__(self, sink, batch_size: int = 256, flush_interval: float = 5.0, max_queue: int = 8192):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.dropped = 0
+        self._spans: list = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "BatchExporter":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            if len(self._spans) >= self.max_queue:
+                self.dropped += 1
+                return
+            self._spans.append(span.to_dict())
+            full = len(self._spans) >= self.batch_size
+        # Root spans end last, so flushes carry whole traces
+        if self._thread is None:
+            if full or span.root:
+                self.flush()
+        elif full or (span.root and self._due()):
+            self._wake.set()
+
+    def _due(self) -> bool:
+        return time.monotonic() - self._last_flush >= self.flush_interval
+
+    def flush(self) -> None:
+        with self._lock:
+            spans, self._spans = self._spans, []
+            self._last_flush = time.monotonic()
+        if not spans:
+            return
+        try:
+            self.sink.write(spans)
+        except Exception:
+            self.dropped += len(spans)
+            log.warning("Span export failed", exc_info=True)
+
+
+def make_sink(target: str):
+    """"log", "http(s)://collector/..." or "file:PATH" (a bare path works too)."""
+    if target == "log":
+        return LogSink()
+    if target.startswith(("http://", "https://")):
+        return HttpSink(target)
+    return FileSink(target.removeprefix("file:"))
+
+
+exporter: BatchExporter | None = None
+
+
+def configure_exporter(target: str, batch_size: int = 256, flush_interval: float = 5.0) -> BatchExporter | None:
+    global exporter
+    if exporter is not None:
+        exporter.stop()
+    exporter = BatchExporter(make_sink(target), batch_size, flush_interval) if target else None
+    return exporter
+
+
+def start_export_thread() -> None:
+    """Server mode: write span batches from a worker thread."""
+    if exporter is not None:
+        exporter.start()
+
+
+def stop_export_thread() -> None:
+    if exporter is not None:
+        exporter.stop()
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    if exporter is not None:
+        exporter.flush()
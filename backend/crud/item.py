@@ -1,15 +1,22 @@
 #crud/items.py
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Attr, Key
 from fastapi import HTTPException, Response
-from uuid import uuid4
+from datetime import datetime
+from itertools import chain
 import logging
 
 from schemas.user import UserRead
-from db import item_table
-from schemas.item import ItemCreate, ItemUpdate, ItemRead
+from core.config import ITEM_COUNTER_ENABLED
+from core.ids import new_item_id, id_floor, id_ceiling
+from core.singleflight import SingleFlight
+from db import item_table, user_table, point_read, dynamodb_client, ITEMS_TABLE, USERS_TABLE
+from schemas.item import ItemCreate, ItemUpdate, ItemRead, ItemListQuery, ItemCount
 
 log = logging.getLogger("app.crud.items")
 
+# Concurrent identical listings (same owner) share one in-flight query
+_item_reads = SingleFlight()
+
 # Create an item with owner_id
 def create_item(item_data: ItemCreate,
                 user: UserRead) -> ItemCreate:
@@ -17,35 +24,233 @@ def create_item(item_data: ItemCreate,
         raise ValueError("User is missing an id, cannot create item")
 
 
-    item_id = str(uuid4())
+    # Time-ordered (UUIDv7) so owner-created-index sorts items by creation
+    item_id = new_item_id()
     item = {
         "id": item_id,
         "owner_id": user.id,   # Required for GSI
         **item_data.model_dump()
     }
-    item_table.put_item(Item=item)
+    if ITEM_COUNTER_ENABLED:
+        # Item and owner's item_count change together or not at all
+        _write_counted(user.id, {"Put": {"TableName": ITEMS_TABLE, "Item": item}}, 1)
+    else:
+        item_table.put_item(Item=item)
     return item
 
 
-# Get all items for a given owner_id
-def get_items(user: UserRead):
-    response = item_table.query(
-        IndexName="owner-id-index",
-        KeyConditionExpression=Key("owner_id").eq(user.id)
-    )
-    items = response.get("Items", [])
+def _count_delta(owner_id: str, delta: int) -> dict:
+    return {"Update": {
+        "TableName": USERS_TABLE,
+        "Key": {"id": owner_id},
+        "UpdateExpression": "ADD item_count :delta",
+        # A missing counter would start from 0, not from the owner's items
+        "ConditionExpression": "attribute_exists(item_count)",
+        "ExpressionAttributeValues": {":delta": delta},
+    }}
+
+
+def _cancellation_codes(error) -> list:
+    return [reason.get("Code") for reason in error.response.get("CancellationReasons", [])]
+
+
+def _seed_count(owner_id: str) -> int:
+    # Users from before the counter existed: count once and seed it. If
+    # another request seeded it first, its value stands.
+    count = _item_reads.do(("owner-count", owner_id), _query_owner_count, owner_id)
+    try:
+        user_table.update_item(
+            Key={"id": owner_id},
+            UpdateExpression="SET item_count = :count",
+            ConditionExpression="attribute_not_exists(item_count)",
+            ExpressionAttributeValues={":count": count},
+        )
+    except dynamodb_client.exceptions.ConditionalCheckFailedException:
+        pass
+    return count
+
+
+def ensure_item_count(owner_id: str) -> None:
+    """Seed the owner's item_count if it does not exist yet."""
+    response = user_table.get_item(Key={"id": owner_id}, ProjectionExpression="item_count")
+    if "item_count" not in response.get("Item", {}):
+        _seed_count(owner_id)
+
+
+def _write_counted(owner_id: str, operation: dict, delta: int) -> None:
+    """Apply `operation` (a TransactItems entry) and move the owner's
+    item_count by `delta` in one transaction, seeding an absent counter
+    first. Cancellations other than an unseeded counter propagate."""
+    transaction = [operation, _count_delta(owner_id, delta)]
+    try:
+        dynamodb_client.transact_write_items(TransactItems=transaction)
+        return
+    except dynamodb_client.exceptions.TransactionCanceledException as error:
+        if _cancellation_codes(error)[1:] != ["ConditionalCheckFailed"]:
+            raise
+    # The count runs before the write, so it excludes a created item and
+    # includes a deleted one; the retried delta accounts for it
+    _seed_count(owner_id)
+    dynamodb_client.transact_write_items(TransactItems=transaction)
+
+
+def _created_range(attr, created_after: datetime | None, created_before: datetime | None):
+    # ids are UUIDv7, so a creation-time window is a range on the id
+    if created_after and created_before:
+        return attr("id").between(id_floor(created_after), id_ceiling(created_before))
+    if created_after:
+        return attr("id").gte(id_floor(created_after))
+    if created_before:
+        return attr("id").lte(id_ceiling(created_before))
+    return None
+
+
+def _build_owner_query(owner_id: str, query: ItemListQuery) -> dict:
+    key_condition = Key("owner_id").eq(owner_id)
+    filters = []
+
+    if query.sort == "name":
+        # owner-name-index: (owner_id, name), so prefixes are key conditions
+        index_name = "owner-name-index"
+        if query.name_prefix:
+            key_condition &= Key("name").begins_with(query.name_prefix)
+        created = _created_range(Attr, query.created_after, query.created_before)
+        if created is not None:
+            filters.append(created)
+    else:
+        # owner-created-index: (owner_id, id), ids sort by creation time
+        index_name = "owner-created-index"
+        created = _created_range(Key, query.created_after, query.created_before)
+        if created is not None:
+            key_condition &= created
+        if query.name_prefix:
+            filters.append(Attr("name").begins_with(query.name_prefix))
+
+    params = {
+        "IndexName": index_name,
+        "KeyConditionExpression": key_condition,
+        "ScanIndexForward": query.order == "asc",
+    }
+    if filters:
+        # Only one range key per index: the other constraint is applied by
+        # DynamoDB as a filter, still server-side
+        params["FilterExpression"] = filters[0]
+    if query.fields:
+        # Only the requested attributes leave DynamoDB
+        params["ProjectionExpression"] = ", ".join(f"#f_{f}" for f in query.fields)
+        params["ExpressionAttributeNames"] = {f"#f_{f}": f for f in query.fields}
+    return params
+
+
+def _iter_owner_pages(params: dict):
+    # One DynamoDB page (<= 1 MB) at a time, following LastEvaluatedKey
+    params = dict(params)
+    while True:
+        response = item_table.query(**params)
+        yield response.get("Items", [])
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        params["ExclusiveStartKey"] = last_key
+
+
+def _iter_owner_item_pages(owner_id: str, query: ItemListQuery):
+    params = _build_owner_query(owner_id, query)
+    remaining = query.limit
+    if remaining:
+        params["Limit"] = remaining
+    # Read pages until the limit is met or the owner is exhausted
+    for page in _iter_owner_pages(params):
+        if remaining:
+            page = page[:remaining]
+            remaining -= len(page)
+        yield page
+        if query.limit and not remaining:
+            return
+
+
+def _query_owner_items(owner_id: str, query: ItemListQuery) -> list:
+    items = []
+    for page in _iter_owner_item_pages(owner_id, query):
+        items.extend(page)
+    return items
+
+
+# Get items for a given owner_id, ordered by creation time or name
+def get_items(user: UserRead, query: ItemListQuery | None = None):
+    query = query or ItemListQuery()
+    items = _item_reads.do(("owner-items", user.id, query), _query_owner_items, user.id, query)
     if not items:
         raise HTTPException(status_code=404, detail="No items found for this owner")
 
     return items
 
 
+# Same listing as get_items, as pages for a streamed response. The first
+# non-empty page is read up front so "no items" is still a 404.
+def iter_items(user: UserRead, query: ItemListQuery | None = None):
+    pages = _iter_owner_item_pages(user.id, query or ItemListQuery())
+    for first in pages:
+        if first:
+            return chain([first], pages)
+    raise HTTPException(status_code=404, detail="No items found for this owner")
+
+
+def _query_owner_count(owner_id: str) -> int:
+    params = {
+        "IndexName": "owner-created-index",
+        "KeyConditionExpression": Key("owner_id").eq(owner_id),
+        "Select": "COUNT",
+    }
+    count = 0
+    # Each page counts up to 1 MB of index data; keep paging until done
+    while True:
+        response = item_table.query(**params)
+        count += response.get("Count", 0)
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return count
+        params["ExclusiveStartKey"] = last_key
+
+
+# Stream all items of an owner page by page (oldest first), so callers hold
+# at most one DynamoDB page in memory
+def iter_item_pages(user: UserRead, fields: tuple[str, ...] | None = None):
+    params = _build_owner_query(user.id, ItemListQuery(fields=fields))
+    yield from _iter_owner_pages(params)
+
+
+# Count items for a given owner_id without fetching them
+def count_items(user: UserRead, mode: str = "query") -> ItemCount:
+    if mode == "cached" and ITEM_COUNTER_ENABLED:
+        response = user_table.get_item(
+            Key={"id": user.id},
+            ProjectionExpression="item_count",
+        )
+        cached = response.get("Item", {}).get("item_count")
+        if cached is not None:
+            return ItemCount(count=int(cached), source="counter")
+
+        return ItemCount(count=_seed_count(user.id), source="query")
+
+    count = _item_reads.do(("owner-count", user.id), _query_owner_count, user.id)
+    return ItemCount(count=count, source="query")
+
+
+def _update_expression(changes: dict) -> tuple[str, dict, dict]:
+    # SET #field = :field for each change -> (expression, names, values)
+    expression = "SET " + ", ".join(f"#{k} = :{k}" for k in changes)
+    names = {f"#{k}": k for k in changes}
+    values = {f":{k}": v for k, v in changes.items()}
+    return expression, names, values
+
+
 # Update ONE item, but only if owner matches
 def update_item(item_id: str,
                 update_data: ItemUpdate,
                 user: UserRead) -> ItemRead:
     # Get the item
-    response = item_table.get_item(Key={"id": item_id})
+    response = point_read(item_table, Key={"id": item_id})
     item = response.get("Item")
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
@@ -54,10 +259,12 @@ def update_item(item_id: str,
     if item["owner_id"] != user.id:
         raise HTTPException(status_code=403, detail="Not authorized to update this item")
 
-    # Build update expression
-    expression = "SET " + ", ".join(f"#{k} = :{k}" for k in update_data.model_dump().keys())
-    expression_names = {f"#{k}": k for k in update_data.model_dump().keys()}
-    expression_values = {f":{k}": v for k, v in update_data.model_dump().items()}
+    # Build update expression (null fields are left untouched: name is a
+    # key of owner-name-index and cannot be stored as NULL)
+    changes = update_data.model_dump(exclude_none=True)
+    if not changes:
+        return ItemRead(**item)
+    expression, expression_names, expression_values = _update_expression(changes)
 
     # Perform update and return updated item
     update_response = item_table.update_item(
@@ -78,7 +285,7 @@ def update_item(item_id: str,
 
 def delete_item(item_id: str, user: UserRead):
     # First, get the specific item by ID
-    response = item_table.get_item(Key={"id": item_id})
+    response = point_read(item_table, Key={"id": item_id})
     item = response.get("Item")
 
     if not item:
@@ -89,6 +296,23 @@ def delete_item(item_id: str, user: UserRead):
         raise HTTPException(status_code=403, detail="Not authorized to delete this item")
 
     # Delete the item
-    item_table.delete_item(Key={"id": item_id})
+    if ITEM_COUNTER_ENABLED:
+        # The owner condition keeps a concurrent double delete from
+        # decrementing the counter twice
+        try:
+            _write_counted(user.id, {"Delete": {
+                "TableName": ITEMS_TABLE,
+                "Key": {"id": item_id},
+                "ConditionExpression": "owner_id = :owner",
+                "ExpressionAttributeValues": {":owner": user.id},
+            }}, -1)
+        except dynamodb_client.exceptions.TransactionCanceledException as error:
+            # Only a failed owner condition means the item is gone; conflicts
+            # and throttling are not a 404
+            if _cancellation_codes(error)[:1] == ["ConditionalCheckFailed"]:
+                raise HTTPException(status_code=404, detail="Item not found")
+            raise
+    else:
+        item_table.delete_item(Key={"id": item_id})
 
     return Response(status_code=204)
\ No newline at end of file
@@ -0,0 +1,247 @@
+#crud/item_import.py
+import codecs
+import csv
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator
+
+from botocore.exceptions import ClientError
+from pydantic import ValidationError
+
+from core.config import ITEM_COUNTER_ENABLED
+from core.governor import StorageUnavailable
+from core.ids import new_item_id
+from crud.item import ensure_item_count
+from db import dynamodb_client, item_table, user_table, ITEMS_TABLE
+from schemas.item import ItemCreate, ItemImportReport, ItemImportRowError
+from schemas.user import UserRead
+
+log = logging.getLogger("app.crud.item_import")
+
+BATCH_SIZE = 25          # BatchWriteItem maximum
+MAX_IN_FLIGHT = 4        # concurrent BatchWriteItem calls per import
+MAX_BATCH_ATTEMPTS = 6   # retries of UnprocessedItems before giving up
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Decode a UTF-8 byte stream (a leading BOM is dropped) into lines,
+    keeping their line endings. Only the current partial line is held."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        start = 0
+        while (end := pending.find("\n", start)) != -1:
+            yield pending[start:end + 1]
+            start = end + 1
+        pending = pending[start:]
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def iter_rows(lines: Iterable[str], fmt: str) -> Iterator[tuple[int, dict | Exception]]:
+    """Yield (row number, raw row) pairs, or (row number, error) for rows
+    that cannot be parsed. Rows are numbered from 1 and read lazily."""
+    if fmt == "csv":
+        # Allow fields up to DynamoDB's 400 KB item size (default is 128 KB)
+        csv.field_size_limit(max(csv.field_size_limit(), 400 * 1024))
+        reader = csv.DictReader(lines)
+        row_no = 0
+        while True:
+            row_no += 1
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as exc:
+                yield row_no, exc
+                continue
+            yield row_no, row
+
+    for row_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield row_no, exc
+            continue
+        if not isinstance(row, dict):
+            yield row_no, ValueError("row must be a JSON object")
+            continue
+        yield row_no, row
+
+
+def _describe(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in exc.errors()
+        )
+    return str(exc)
+
+
+def _write_batch(items: list) -> set:
+    """Write items with BatchWriteItem; return the ids DynamoDB still left
+    unprocessed after MAX_BATCH_ATTEMPTS (every other item is written)."""
+    # BatchWriteItem may accept only part of a batch under throttling;
+    # resend the remainder with exponential backoff
+    requests = [{"PutRequest": {"Item": item}} for item in items]
+    for attempt in range(MAX_BATCH_ATTEMPTS):
+        try:
+            response = dynamodb_client.batch_write_item(RequestItems={ITEMS_TABLE: requests})
+        except (ClientError, StorageUnavailable):
+            if attempt == 0:
+                raise  # nothing written yet
+            # Earlier attempts wrote part of the batch: report the rest
+            log.warning("Import batch retry failed", exc_info=True)
+            break
+        requests = response.get("UnprocessedItems", {}).get(ITEMS_TABLE, [])
+        if not requests:
+            return set()
+        if attempt + 1 < MAX_BATCH_ATTEMPTS:
+            time.sleep(min(0.05 * 2 ** attempt, 2.0))
+    return {request["PutRequest"]["Item"]["id"] for request in requests}
+
+
+class _Checkpoint:
+    """Tracks the offset below which every row is either written or reported
+    as failed, while batches complete out of order."""
+
+    def __init__(self, offset: int):
+        self._lock = threading.Lock()
+        self._pending: dict[int, int] = {}  # batch id -> first row of batch
+        self.read_up_to = offset
+        self.value = offset
+
+    def started(self, batch_id: int, first_row: int) -> None:
+        with self._lock:
+            self._pending[batch_id] = first_row
+
+    def finished(self, batch_id: int, on_checkpoint: Callable[[int], None] | None = None) -> int:
+        # The callback runs under the lock, so saved offsets never go back
+        with self._lock:
+            self._pending.pop(batch_id, None)
+            self.value = min(self._pending.values(), default=self.read_up_to + 1) - 1
+            if on_checkpoint:
+                on_checkpoint(self.value)
+            return self.value
+
+
+def import_items(lines: Iterable[str],
+                 fmt: str,
+                 user: UserRead,
+                 offset: int = 0,
+                 max_in_flight: int = MAX_IN_FLIGHT,
+                 on_checkpoint: Callable[[int], None] | None = None) -> ItemImportReport:
+    """Validate rows against ItemCreate and write them with concurrent
+    BatchWriteItem calls.
+
+    At most `max_in_flight` batches are outstanding; parsing blocks until a
+    slot frees up, so memory stays bounded however large the input is. Rows
+    up to `offset` are skipped, which resumes an import from a checkpoint;
+    `on_checkpoint` gets each new one from the batch threads, one call at a
+    time and never lower than the last.
+    """
+    if ITEM_COUNTER_ENABLED:
+        # Seed the counter before any batch adds to it
+        ensure_item_count(user.id)
+    report = ItemImportReport(imported=0, failed=[], checkpoint=offset)
+    report_lock = threading.Lock()
+    window = threading.BoundedSemaphore(max_in_flight)
+    checkpoint = _Checkpoint(offset)
+
+    def fail(row_no: int, error: str) -> None:
+        with report_lock:
+            report.failed.append(ItemImportRowError(row=row_no, error=error))
+
+    def write_rows_one_by_one(rows: list) -> int:
+        # A batch is rejected as a whole when one item is invalid (e.g. too
+        # large); isolate the offending rows so the rest still land
+        written = 0
+        for row_no, item in rows:
+            try:
+                item_table.put_item(Item=item)
+                written += 1
+            except (ClientError, StorageUnavailable) as exc:
+                fail(row_no, f"write failed: {exc}")
+        return written
+
+    def write_rows(rows: list) -> int:
+        # Every row ends up either counted as written or listed in `failed`,
+        # never both, so failed rows can be resubmitted as they are
+        try:
+            unprocessed = _write_batch([item for _, item in rows])
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") == "ValidationException":
+                return write_rows_one_by_one(rows)
+            unprocessed, error = {item["id"] for _, item in rows}, exc
+        except StorageUnavailable as exc:
+            unprocessed, error = {item["id"] for _, item in rows}, exc
+        else:
+            error = f"still unprocessed after {MAX_BATCH_ATTEMPTS} attempts"
+        if unprocessed:
+            log.warning("Import batch failed: %d of %d rows not written", len(unprocessed), len(rows))
+            for row_no, item in rows:
+                if item["id"] in unprocessed:
+                    fail(row_no, f"write failed: {error}")
+        return len(rows) - len(unprocessed)
+
+    def run_batch(batch_id: int, rows: list) -> None:
+        try:
+            written = write_rows(rows)
+            with report_lock:
+                report.imported += written
+            if ITEM_COUNTER_ENABLED and written:
+                try:
+                    user_table.update_item(
+                        Key={"id": user.id},
+                        UpdateExpression="ADD item_count :delta",
+                        ExpressionAttributeValues={":delta": written},
+                    )
+                except (ClientError, StorageUnavailable):
+                    # The rows are written; only the cached count drifts
+                    log.warning("Item counter update failed after import batch", exc_info=True)
+        finally:
+            window.release()
+            checkpoint.finished(batch_id, on_checkpoint)
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        batch, batch_id = [], 0
+
+        def submit():
+            nonlocal batch, batch_id
+            window.acquire()  # back-pressure: wait for a free slot
+            executor.submit(run_batch, batch_id, batch)
+            batch, batch_id = [], batch_id + 1
+
+        for row_no, row in iter_rows(lines, fmt):
+            if row_no <= offset:
+                continue
+            # read_up_to only moves past a row once it is failed or in a
+            # started batch, so a finishing batch cannot checkpoint past it
+            if isinstance(row, Exception):
+                fail(row_no, _describe(row))
+                checkpoint.read_up_to = row_no
+                continue
+            try:
+                item_data = ItemCreate.model_validate(row)
+            except ValidationError as exc:
+                fail(row_no, _describe(exc))
+                checkpoint.read_up_to = row_no
+                continue
+            if not batch:
+                checkpoint.started(batch_id, row_no)
+            batch.append((row_no, {"id": new_item_id(), "owner_id": user.id, **item_data.model_dump()}))
+            checkpoint.read_up_to = row_no
+            if len(batch) == BATCH_SIZE:
+                submit()
+        if batch:
+            submit()
+
+    report.failed.sort(key=lambda err: err.row)
+    report.checkpoint = checkpoint.read_up_to
+    return report
@@ -1,17 +1,62 @@
 # db.py
+import logging
 import os
 import boto3
+from botocore.config import Config
+
+from core.config import (
+    DYNAMODB_MAX_ATTEMPTS,
+    GOVERNOR_ENABLED,
+    GOVERNOR_MAX_RATE,
+    GOVERNOR_MIN_RATE,
+    GOVERNOR_MAX_WAIT,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_SECONDS,
+    DYNAMODB_FAULTS,
+    DYNAMODB_EMULATOR,
+    DDB_CALL_TRACKING,
+    TRACING_ENABLED,
+    HEDGE_ENABLED,
+    HEDGE_PERCENTILE,
+    HEDGE_MIN_DELAY_MS,
+    HEDGE_MAX_DELAY_MS,
+    HEDGE_BUDGET,
+)
+from core.governor import AdaptiveTokenBucket, StorageGovernor
+from core.hedging import HedgedReader
+
+log = logging.getLogger("app.db")
 
 AWS_REGION = os.getenv("REGION", "us-east-2")
 
-def get_dynamodb():
+def get_dynamodb(session=None):
+    # `session` lets tools open an independent connection (own model cache
+    # and pool); the app uses boto3's default session
+    session = session or boto3
+    config = None
+    if DYNAMODB_MAX_ATTEMPTS:
+        config = Config(retries={"mode": "standard", "total_max_attempts": DYNAMODB_MAX_ATTEMPTS})
+    if DYNAMODB_EMULATOR:
+        # Requests never leave the process; the endpoint and keys are placeholders
+        from emulator import shared_emulator
+        resource = session.resource(
+            "dynamodb",
+            region_name="us-east-1",
+            endpoint_url="http://dynamodb.emulator",
+            aws_access_key_id="emulator",
+            aws_secret_access_key="emulator",
+            config=config,
+        )
+        shared_emulator().install(resource.meta.client)
+        return resource
     if os.getenv("LOCAL_TESTING") == "1":
-        return boto3.resource(
+        return session.resource(
             "dynamodb",
             region_name="us-east-1",
-            endpoint_url="http://localhost:8000"
+            endpoint_url="http://localhost:8000",
+            config=config,
         )
-    return boto3.resource("dynamodb", region_name=AWS_REGION)
+    return session.resource("dynamodb", region_name=AWS_REGION, config=config)
 
 dynamodb = get_dynamodb()
 
@@ -25,3 +70,110 @@ if not USERS_TABLE or not ITEMS_TABLE:
 
 user_table = dynamodb.Table(USERS_TABLE)
 item_table = dynamodb.Table(ITEMS_TABLE)
+
+# Low-level client for multi-table operations (transactions, batches).
+# It shares the resource's connection pool and Python <-> DynamoDB type mapping.
+dynamodb_client = dynamodb.meta.client
+
+# Every table/client call above goes through this one client, so the
+# governor's hooks cover all of them
+governor = None
+if GOVERNOR_ENABLED:
+    governor = StorageGovernor(
+        AdaptiveTokenBucket(max_rate=GOVERNOR_MAX_RATE, min_rate=GOVERNOR_MIN_RATE),
+        failure_threshold=BREAKER_FAILURE_THRESHOLD,
+        reset_timeout=BREAKER_RESET_SECONDS,
+        max_wait=GOVERNOR_MAX_WAIT,
+    )
+    governor.install(dynamodb_client)
+
+# Calls are attributed to the request in flight (middleware/ddb_calls.py)
+call_tracker = None
+if DDB_CALL_TRACKING:
+    from core.ddb_calls import CallTracker
+    call_tracker = CallTracker()
+    call_tracker.install(dynamodb_client)
+
+# One span per call, under the span that made it (core/tracing.py)
+if TRACING_ENABLED:
+    from core.tracing import DynamoDBSpans
+    DynamoDBSpans().install(dynamodb_client)
+
+fault_injector = None
+if DYNAMODB_FAULTS:
+    from core.faults import FaultInjector, parse_fault_rates
+    fault_injector = FaultInjector(parse_fault_rates(DYNAMODB_FAULTS))
+    fault_injector.install(dynamodb_client)
+    log.warning("DynamoDB fault injection enabled: %s", DYNAMODB_FAULTS)
+
+
+hedged_reader = None
+if HEDGE_ENABLED:
+    hedged_reader = HedgedReader(
+        percentile=HEDGE_PERCENTILE,
+        min_delay=HEDGE_MIN_DELAY_MS / 1000,
+        max_delay=HEDGE_MAX_DELAY_MS / 1000,
+        budget_ratio=HEDGE_BUDGET,
+    )
+    hedged_reader.install(dynamodb_client)
+
+
+def point_read(table, **kwargs) -> dict:
+    # GetItem on the critical path; hedged when HEDGE_ENABLED. Only for
+    # reads: a duplicate must be harmless
+    if hedged_reader is None:
+        return table.get_item(**kwargs)
+    return hedged_reader.call(table.get_item, **kwargs)
+
+
+def prime_connection() -> None:
+    """Open (or refresh) a pooled HTTPS connection to DynamoDB.
+
+    A GetItem on a key that never exists is the cheapest call the Lambda role
+    is allowed to make; failures are logged and ignored.
+    """
+    try:
+        user_table.get_item(Key={"id": "__warmup__"}, ProjectionExpression="id")
+    except Exception:
+        log.warning("DynamoDB connection priming failed", exc_info=True)
+
+
+# Operations the app issues; their request/response shapes are resolved
+# eagerly by prime_service_model()
+PRIMED_OPERATIONS = (
+    "GetItem", "PutItem", "UpdateItem", "DeleteItem", "Query",
+    "BatchWriteItem", "TransactWriteItems",
+)
+
+
+def _resolve_shape(shape, seen: set) -> None:
+    if shape is None or shape.name in seen:
+        return
+    seen.add(shape.name)
+    for member in getattr(shape, "members", {}).values():
+        _resolve_shape(member, seen)
+    for attr in ("member", "key", "value"):
+        _resolve_shape(getattr(shape, attr, None), seen)
+
+
+def prime_service_model() -> None:
+    """Resolve the request/response shapes of PRIMED_OPERATIONS.
+
+    botocore loads the DynamoDB model lazily and resolves each operation's
+    shapes on first use; this does it at init instead. Failures are logged
+    and ignored: the shapes then load lazily as before.
+    """
+    try:
+        model = dynamodb_client.meta.service_model
+        seen = set()
+        for name in PRIMED_OPERATIONS:
+            operation = model.operation_model(name)
+            _resolve_shape(operation.input_shape, seen)
+            _resolve_shape(operation.output_shape, seen)
+    except Exception:
+        log.warning("DynamoDB service model priming failed", exc_info=True)
+
+
+def prime() -> None:
+    prime_service_model()
+    prime_connection()
@@ -1,8 +1,13 @@
-from fastapi import Depends, HTTPException
+from botocore.exceptions import ClientError
+from fastapi import Depends, Header, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from core.config import ALGORITHM, SECRET_KEY
-from db import user_table
+from core.governor import THROTTLE_CODES, StorageUnavailable
+from core.security import verify_profiling_token
+from core.singleflight import SingleFlight
+from core.tracing import span
+from db import point_read, user_table
 from schemas.user import UserRead
 import logging
 
@@ -11,7 +16,22 @@ log = logging.getLogger("app.dependencies")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/user/login/")
 
+# Concurrent requests for the same user share one in-flight get_item
+_user_reads = SingleFlight()
+
+
+def _fetch_user(user_id: str):
+    response = point_read(user_table, Key={"id": user_id})
+    return response.get("Item")
+
+
 def get_current_user(token: str = Depends(oauth2_scheme)) -> UserRead:
+    # Token check and user lookup, as one span of the request's trace
+    with span("auth"):
+        return _authenticate(token)
+
+
+def _authenticate(token: str) -> UserRead:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id = payload.get("sub")
@@ -22,8 +42,13 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> UserRead:
 
     # Get user from DynamoDB
     try:
-        response = user_table.get_item(Key={"id": user_id})
-        user = response.get("Item")
+        user = _user_reads.do(("user", user_id), _fetch_user, user_id)
+    except StorageUnavailable:
+        raise  # 503 + Retry-After from the exception handler
+    except ClientError as exc:
+        if exc.response.get("Error", {}).get("Code") in THROTTLE_CODES:
+            raise  # also answered with 503 + Retry-After
+        raise HTTPException(status_code=500, detail="Error fetching user from DB")
     except Exception:
         raise HTTPException(status_code=500, detail="Error fetching user from DB")
 
@@ -31,3 +56,11 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> UserRead:
         raise HTTPException(status_code=401, detail="User not found")
 
     return UserRead(**user)
+
+
+def require_profiling_token(x_profile_token: str | None = Header(None)) -> dict:
+    # Operator endpoints: the same signed token that enables request profiling
+    claims = verify_profiling_token(x_profile_token) if x_profile_token else None
+    if claims is None:
+        raise HTTPException(status_code=403, detail="Profiling token required")
+    return claims
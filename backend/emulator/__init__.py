@@ -0,0 +1,5 @@
+# emulator/__init__.py
+from emulator.engine import DynamoDBEmulator, shared_emulator
+from emulator.errors import DynamoDBError
+
+__all__ = ["DynamoDBEmulator", "DynamoDBError", "shared_emulator"]
@@ -0,0 +1,705 @@
+# emulator/engine.py
+import copy
+import json
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+
+from core.faults import local_response
+from emulator.errors import DynamoDBError, conditional_check_failed, resource_not_found, validation_error
+from emulator.expressions import (
+    Placeholders,
+    apply_update,
+    evaluate,
+    parse_condition,
+    parse_projection,
+    parse_update,
+    paths_in,
+    project,
+)
+from emulator.values import equals, item_size, key_part, sort_key, validate_value, value_type
+
+MAX_ITEM_BYTES = 400 * 1024
+MAX_BATCH_WRITE = 25
+MAX_BATCH_GET = 100
+MAX_TRANSACT_ITEMS = 100
+ACCOUNT_ARN = "arn:aws:dynamodb:us-east-1:000000000000:table"
+
+
+class _Index:
+    def __init__(self, name: str | None, key_schema: list, projection: dict | None = None):
+        self.name = name
+        self.hash_key = next(k["AttributeName"] for k in key_schema if k["KeyType"] == "HASH")
+        self.range_key = next((k["AttributeName"] for k in key_schema if k["KeyType"] == "RANGE"), None)
+        self.key_schema = key_schema
+        self.projection = projection or {"ProjectionType": "ALL"}
+        # hash key -> set of table primary keys (GSIs are sparse)
+        self.partitions: dict = defaultdict(set)
+
+    @property
+    def key_names(self) -> tuple:
+        return (self.hash_key, self.range_key) if self.range_key else (self.hash_key,)
+
+    def covers(self, item: dict) -> bool:
+        return all(name in item for name in self.key_names)
+
+    def project(self, item: dict, table_keys: tuple) -> dict:
+        kind = self.projection.get("ProjectionType", "ALL")
+        if kind == "ALL":
+            return item
+        keep = set(self.key_names) | set(table_keys)
+        if kind == "INCLUDE":
+            keep |= set(self.projection.get("NonKeyAttributes", []))
+        return {k: v for k, v in item.items() if k in keep}
+
+
+class _Table:
+    def __init__(self, request: dict):
+        self.name = request["TableName"]
+        self.key_schema = request["KeySchema"]
+        self.attribute_definitions = request["AttributeDefinitions"]
+        self.attribute_types = {a["AttributeName"]: a["AttributeType"] for a in self.attribute_definitions}
+        self.billing_mode = request.get("BillingMode", "PROVISIONED")
+        self.created_at = time.time()
+        self.primary = _Index(None, self.key_schema)
+        self.gsis = {
+            gsi["IndexName"]: _Index(gsi["IndexName"], gsi["KeySchema"], gsi.get("Projection"))
+            for gsi in request.get("GlobalSecondaryIndexes", [])
+        }
+        self.request = request
+        self.items: dict = {}  # primary key tuple -> item
+
+        for index in (self.primary, *self.gsis.values()):
+            for name in index.key_names:
+                if name not in self.attribute_types:
+                    raise validation_error(
+                        "One or more parameter values were invalid: Some index key attributes are not defined "
+                        f"in AttributeDefinitions. Keys: [{name}]")
+
+    # -- keys -----------------------------------------------------------
+    def key_of(self, item: dict) -> tuple:
+        return tuple(key_part(item[name]) for name in self.primary.key_names)
+
+    def check_key(self, key: dict) -> tuple:
+        if set(key) != set(self.primary.key_names):
+            raise validation_error("The provided key element does not match the schema")
+        self._check_key_types(key, self.primary.key_names, "")
+        return self.key_of(key)
+
+    def _check_key_types(self, item: dict, names: tuple, index_name: str) -> None:
+        for name in names:
+            value = item[name]
+            expected = self.attribute_types[name]
+            if value_type(value) != expected:
+                if index_name:
+                    raise validation_error(
+                        "One or more parameter values were invalid: Type mismatch for Index Key "
+                        f"{name} Expected: {expected} Actual: {value_type(value)} IndexName: {index_name}")
+                raise validation_error(
+                    "One or more parameter values were invalid: Type mismatch for key "
+                    f"{name} expected: {expected} actual: {value_type(value)}")
+            if expected in ("S", "B") and value[expected] == "":
+                if index_name:
+                    raise validation_error(
+                        "One or more parameter values are not valid. A value specified for a secondary index key "
+                        f"is not supported. The AttributeValue for a key attribute cannot contain an empty string "
+                        f"value. IndexName: {index_name}, IndexKey: {name}")
+                raise validation_error(
+                    "One or more parameter values are not valid. The AttributeValue for a key attribute cannot "
+                    f"contain an empty string value. Key: {name}")
+
+    def validate_item(self, item: dict) -> None:
+        for name, value in item.items():
+            validate_value(value)
+        missing = [name for name in self.primary.key_names if name not in item]
+        if missing:
+            raise validation_error(f"One or more parameter values were invalid: Missing the key {missing[0]} in the item")
+        self._check_key_types(item, self.primary.key_names, "")
+        for index in self.gsis.values():
+            present = tuple(name for name in index.key_names if name in item)
+            self._check_key_types(item, present, index.name)
+        if item_size(item) > MAX_ITEM_BYTES:
+            raise validation_error("Item size has exceeded the maximum allowed size")
+
+    # -- storage --------------------------------------------------------
+    def get(self, key: tuple) -> dict | None:
+        return self.items.get(key)
+
+    def put(self, item: dict) -> dict | None:
+        key = self.key_of(item)
+        old = self.items.get(key)
+        if old is not None:
+            self._unindex(key, old)
+        self.items[key] = item
+        for index in self.gsis.values():
+            if index.covers(item):
+                index.partitions[key_part(item[index.hash_key])].add(key)
+        return old
+
+    def delete(self, key: tuple) -> dict | None:
+        old = self.items.pop(key, None)
+        if old is not None:
+            self._unindex(key, old)
+        return old
+
+    def _unindex(self, key: tuple, item: dict) -> None:
+        for index in self.gsis.values():
+            if index.covers(item):
+                partition = index.partitions.get(key_part(item[index.hash_key]))
+                if partition is not None:
+                    partition.discard(key)
+                    if not partition:
+                        del index.partitions[key_part(item[index.hash_key])]
+
+    def index(self, name: str | None) -> _Index:
+        if name is None:
+            return self.primary
+        if name not in self.gsis:
+            raise validation_error(f"The table does not have the specified index: {name}")
+        return self.gsis[name]
+
+    def order(self, index: _Index, item: dict) -> tuple:
+        # Items with equal index keys are ordered by table key, deterministically
+        parts = [sort_key(item[index.range_key])] if index.range_key else []
+        parts.extend(sort_key(item[name]) for name in self.primary.key_names)
+        return tuple(parts)
+
+    def key_attributes(self, index: _Index, item: dict) -> dict:
+        names = dict.fromkeys((*self.primary.key_names, *index.key_names))
+        return {name: item[name] for name in names}
+
+    def describe(self) -> dict:
+        description = {
+            "TableName": self.name,
+            "TableStatus": "ACTIVE",
+            "TableArn": f"{ACCOUNT_ARN}/{self.name}",
+            "KeySchema": self.key_schema,
+            "AttributeDefinitions": self.attribute_definitions,
+            "CreationDateTime": self.created_at,
+            "ItemCount": len(self.items),
+            "TableSizeBytes": sum(item_size(item) for item in self.items.values()),
+            "BillingModeSummary": {"BillingMode": self.billing_mode},
+        }
+        if self.gsis:
+            description["GlobalSecondaryIndexes"] = [
+                {
+                    "IndexName": index.name,
+                    "KeySchema": index.key_schema,
+                    "Projection": index.projection,
+                    "IndexStatus": "ACTIVE",
+                    "IndexArn": f"{ACCOUNT_ARN}/{self.name}/index/{index.name}",
+                    "ItemCount": sum(len(keys) for keys in index.partitions.values()),
+                }
+                for index in self.gsis.values()
+            ]
+        return description
+
+
+def _read_units(size: int, consistent: bool) -> float:
+    units = max(1, math.ceil(size / 4096))
+    return float(units) if consistent else units / 2
+
+
+def _write_units(size: int) -> float:
+    return float(max(1, math.ceil(size / 1024)))
+
+
+class _Capacity:
+    """Consumed capacity of one request, reported per ReturnConsumedCapacity."""
+
+    def __init__(self):
+        self.tables: dict = defaultdict(lambda: {"table": 0.0, "indexes": defaultdict(float)})
+
+    def add(self, table: str, units: float, index: str | None = None) -> None:
+        entry = self.tables[table]
+        if index is None:
+            entry["table"] += units
+        else:
+            entry["indexes"][index] += units
+
+    def report(self, mode: str | None) -> list:
+        if mode not in ("TOTAL", "INDEXES"):
+            return []
+        reports = []
+        for table, entry in self.tables.items():
+            report = {"TableName": table,
+                      "CapacityUnits": entry["table"] + sum(entry["indexes"].values())}
+            if mode == "INDEXES":
+                report["Table"] = {"CapacityUnits": entry["table"]}
+                if entry["indexes"]:
+                    report["GlobalSecondaryIndexes"] = {
+                        name: {"CapacityUnits": units} for name, units in entry["indexes"].items()}
+            reports.append(report)
+        return reports
+
+
+class DynamoDBEmulator:
+    """In-memory DynamoDB for the subset of the API this app uses.
+
+    Speaks the JSON wire protocol, so it plugs under boto3 (see install())
+    and everything above it (resources, type serialization, botocore events,
+    retries) runs unchanged. Supports table create/describe/delete/list,
+    Get/Put/Update/DeleteItem, Query and Scan on tables and GSIs, BatchGet/
+    BatchWriteItem, TransactGet/TransactWriteItems, condition/filter/
+    projection/update expressions, pagination and consumed capacity.
+
+    `page_bytes` is the Query/Scan page size (1 MB in DynamoDB); lower it to
+    exercise pagination with small data. `calls` counts operations and
+    `consumed` accumulates capacity units per table.
+    """
+
+    def __init__(self, page_bytes: int = 1024 * 1024):
+        self.page_bytes = page_bytes
+        self.tables: dict[str, _Table] = {}
+        self.calls: Counter = Counter()
+        self.consumed: dict = defaultdict(lambda: {"read": 0.0, "write": 0.0})
+        self._lock = threading.RLock()
+
+    # -- plumbing -------------------------------------------------------
+    def install(self, client) -> None:
+        client.meta.events.register("before-send.dynamodb", self._before_send,
+                                    unique_id=f"dynamodb-emulator-{id(self)}")
+
+    def reset(self) -> None:
+        with self._lock:
+            self.tables.clear()
+            self.calls.clear()
+            self.consumed.clear()
+
+    def _before_send(self, request, **kwargs):
+        target = request.headers["X-Amz-Target"]
+        if isinstance(target, bytes):
+            target = target.decode("ascii")
+        operation = target.split(".", 1)[1]
+        payload = json.loads(request.body or b"{}")
+        status, result = self.handle(operation, payload)
+        data = json.dumps(result).encode("utf-8")
+        return local_response(request.url, status, data, {"x-amzn-RequestId": "emulator"})
+
+    def handle(self, operation: str, payload: dict) -> tuple[int, dict]:
+        handler = getattr(self, f"_op_{operation}", None)
+        if handler is None:
+            error = DynamoDBError("UnknownOperationException", f"Operation {operation} is not supported by the emulator")
+            return error.status, error.body()
+        try:
+            with self._lock:
+                self.calls[operation] += 1
+                return 200, handler(payload)
+        except DynamoDBError as error:
+            return error.status, error.body()
+
+    def _table(self, name: str) -> _Table:
+        table = self.tables.get(name)
+        if table is None:
+            raise resource_not_found(f"Requested resource not found: Table: {name} not found")
+        return table
+
+    def _finish(self, response: dict, capacity: _Capacity, payload: dict, kind: str = "read",
+                single: bool = True) -> dict:
+        for table, entry in capacity.tables.items():
+            self.consumed[table][kind] += entry["table"] + sum(entry["indexes"].values())
+        reports = capacity.report(payload.get("ReturnConsumedCapacity"))
+        if reports:
+            response["ConsumedCapacity"] = reports[0] if single else reports
+        return response
+
+    def _charge_write(self, capacity: _Capacity, table: _Table, old: dict | None, new: dict | None,
+                      factor: float = 1.0) -> None:
+        size = max(item_size(old) if old else 0, item_size(new) if new else 0)
+        capacity.add(table.name, _write_units(size) * factor)
+        for index in table.gsis.values():
+            if (old and index.covers(old)) or (new and index.covers(new)):
+                capacity.add(table.name, _write_units(size) * factor, index.name)
+
+    @staticmethod
+    def _placeholders(payload: dict) -> Placeholders:
+        return Placeholders(payload.get("ExpressionAttributeNames"), payload.get("ExpressionAttributeValues"))
+
+    def _check_condition(self, payload: dict, placeholders: Placeholders, item: dict | None) -> None:
+        expression = payload.get("ConditionExpression")
+        if expression is None:
+            return
+        if not evaluate(item or {}, parse_condition(expression, placeholders)):
+            old = item if payload.get("ReturnValuesOnConditionCheckFailure") == "ALL_OLD" else None
+            raise conditional_check_failed(old)
+
+    # -- tables ---------------------------------------------------------
+    def _op_CreateTable(self, payload: dict) -> dict:
+        name = payload["TableName"]
+        if name in self.tables:
+            raise DynamoDBError("ResourceInUseException", f"Table already exists: {name}")
+        table = _Table(payload)
+        self.tables[name] = table
+        return {"TableDescription": table.describe()}
+
+    def _op_DescribeTable(self, payload: dict) -> dict:
+        return {"Table": self._table(payload["TableName"]).describe()}
+
+    def _op_DeleteTable(self, payload: dict) -> dict:
+        table = self._table(payload["TableName"])
+        del self.tables[table.name]
+        description = table.describe()
+        description["TableStatus"] = "DELETING"
+        return {"TableDescription": description}
+
+    def _op_ListTables(self, payload: dict) -> dict:
+        return {"TableNames": sorted(self.tables)}
+
+    # -- single items ---------------------------------------------------
+    def _projected(self, item: dict | None, payload: dict, placeholders: Placeholders) -> dict | None:
+        if item is None or not payload.get("ProjectionExpression"):
+            return item
+        return project(item, parse_projection(payload["ProjectionExpression"], placeholders))
+
+    def _op_GetItem(self, payload: dict) -> dict:
+        table = self._table(payload["TableName"])
+        key = table.check_key(payload["Key"])
+        placeholders = self._placeholders(payload)
+        item = self._projected(table.get(key), payload, placeholders)
+        placeholders.check_unused()
+        capacity = _Capacity()
+        stored = table.get(key)
+        capacity.add(table.name, _read_units(item_size(stored) if stored else 0, payload.get("ConsistentRead", False)))
+        response = {"Item": copy.deepcopy(item)} if item is not None else {}
+        return self._finish(response, capacity, payload)
+
+    def _op_PutItem(self, payload: dict) -> dict:
+        table = self._table(payload["TableName"])
+        item = payload["Item"]
+        table.validate_item(item)
+        placeholders = self._placeholders(payload)
+        old = table.get(table.key_of(item))
+        self._check_condition(payload, placeholders, old)
+        placeholders.check_unused()
+        table.put(copy.deepcopy(item))
+        capacity = _Capacity()
+        self._charge_write(capacity, table, old, item)
+        response = {"Attributes": old} if old is not None and payload.get("ReturnValues") == "ALL_OLD" else {}
+        return self._finish(response, capacity, payload, "write")
+
+    def _op_DeleteItem(self, payload: dict) -> dict:
+        table = self._table(payload["TableName"])
+        key = table.check_key(payload["Key"])
+        placeholders = self._placeholders(payload)
+        old = table.get(key)
+        self._check_condition(payload, placeholders, old)
+        placeholders.check_unused()
+        table.delete(key)
+        capacity = _Capacity()
+        self._charge_write(capacity, table, old, None)
+        response = {"Attributes": old} if old is not None and payload.get("ReturnValues") == "ALL_OLD" else {}
+        return self._finish(response, capacity, payload, "write")
+
+    def _updated_item(self, table: _Table, payload: dict, placeholders: Placeholders) -> tuple:
+        key = table.check_key(payload["Key"])
+        old = table.get(key)
+        self._check_condition(payload, placeholders, old)
+        base = old if old is not None else copy.deepcopy(payload["Key"])
+        if "UpdateExpression" in payload:
+            clauses = parse_update(payload["UpdateExpression"], placeholders)
+            new, touched = apply_update(base, clauses)
+        elif payload.get("AttributeUpdates"):
+            raise validation_error("AttributeUpdates is not supported by the emulator; use UpdateExpression")
+        else:
+            new, touched = copy.deepcopy(base), set()
+        for name in table.primary.key_names:
+            if name in touched:
+                raise validation_error(
+                    f"One or more parameter values were invalid: Cannot update attribute {name}. "
+                    "This attribute is part of the key")
+        table.validate_item(new)
+        return key, old, new, touched
+
+    def _op_UpdateItem(self, payload: dict) -> dict:
+        table = self._table(payload["TableName"])
+        placeholders = self._placeholders(payload)
+        key, old, new, touched = self._updated_item(table, payload, placeholders)
+        placeholders.check_unused()
+        table.put(new)
+        capacity = _Capacity()
+        self._charge_write(capacity, table, old, new)
+
+        mode = payload.get("ReturnValues", "NONE")
+        response = {}
+        if mode == "ALL_NEW":
+            response["Attributes"] = copy.deepcopy(new)
+        elif mode == "ALL_OLD" and old is not None:
+            response["Attributes"] = copy.deepcopy(old)
+        elif mode == "UPDATED_NEW":
+            response["Attributes"] = {k: copy.deepcopy(new[k]) for k in touched if k in new}
+        elif mode == "UPDATED_OLD" and old is not None:
+            response["Attributes"] = {k: copy.deepcopy(old[k]) for k in touched if k in old}
+        if response.get("Attributes") == {}:
+            del response["Attributes"]
+        return self._finish(response, capacity, payload, "write")
+
+    # -- query / scan ---------------------------------------------------
+    def _key_condition(self, table: _Table, index: _Index, payload: dict, placeholders: Placeholders):
+        if "KeyConditionExpression" not in payload:
+            raise validation_error("Either the KeyConditions or KeyConditionExpression parameter must be specified in the request.")
+        node = parse_condition(payload["KeyConditionExpression"], placeholders)
+        for path in paths_in(node):
+            if len(path) != 1 or path[0] not in index.key_names:
+                raise validation_error(f"Query condition missed key schema element: {index.hash_key}"
+                                       if path[0] != index.hash_key else "Query key condition not supported")
+        hash_value = self._hash_value(node, index.hash_key)
+        if hash_value is None:
+            raise validation_error(f"Query condition missed key schema element: {index.hash_key}")
+        return node, hash_value
+
+    def _hash_value(self, node, hash_key: str):
+        if node[0] == "cmp" and node[1] == "=":
+            left, right = node[2], node[3]
+            if left[0] == "path" and left[1] == (hash_key,) and right[0] == "value":
+                return right[1]
+            if right[0] == "path" and right[1] == (hash_key,) and left[0] == "value":
+                return left[1]
+        if node[0] == "and":
+            return self._hash_value(node[1], hash_key) or self._hash_value(node[2], hash_key)
+        return None
+
+    def _read_page(self, table: _Table, index: _Index, candidates: list, payload: dict,
+                   placeholders: Placeholders, capacity: _Capacity) -> dict:
+        ascending = payload.get("ScanIndexForward", True)
+        candidates.sort(key=lambda item: table.order(index, item), reverse=not ascending)
+
+        start = payload.get("ExclusiveStartKey")
+        if start is not None:
+            if any(name not in start for name in (*table.primary.key_names, *index.key_names)):
+                raise validation_error("The provided starting key is invalid")
+            boundary = table.order(index, start)
+            candidates = [item for item in candidates
+                          if (table.order(index, item) > boundary if ascending
+                              else table.order(index, item) < boundary)]
+
+        filter_node = None
+        if payload.get("FilterExpression"):
+            filter_node = parse_condition(payload["FilterExpression"], placeholders)
+        projection = None
+        if payload.get("ProjectionExpression"):
+            projection = parse_projection(payload["ProjectionExpression"], placeholders)
+        placeholders.check_unused()
+
+        limit = payload.get("Limit")
+        if limit is not None and limit < 1:
+            raise validation_error("1 validation error detected: Value at 'limit' failed to satisfy constraint: "
+                                   "Member must have value greater than or equal to 1")
+        count_only = payload.get("Select") == "COUNT"
+
+        items, scanned, read_bytes, last = [], 0, 0, None
+        for item in candidates:
+            stored = index.project(item, table.primary.key_names)
+            scanned += 1
+            read_bytes += item_size(stored)
+            if filter_node is None or evaluate(stored, filter_node):
+                items.append(stored)
+            if (limit is not None and scanned >= limit) or read_bytes >= self.page_bytes:
+                if scanned < len(candidates):
+                    last = table.key_attributes(index, item)
+                elif limit is not None and scanned >= limit:
+                    # DynamoDB stops at the limit without checking for more
+                    last = table.key_attributes(index, item)
+                break
+
+        consistent = payload.get("ConsistentRead", False) and index.name is None
+        capacity.add(table.name, _read_units(read_bytes, consistent), index.name)
+
+        response = {"Count": len(items), "ScannedCount": scanned}
+        if not count_only:
+            if projection is not None:
+                items = [project(item, projection) for item in items]
+            response["Items"] = copy.deepcopy(items)
+        if last is not None:
+            response["LastEvaluatedKey"] = copy.deepcopy(last)
+        return response
+
+    def _op_Query(self, payload: dict) -> dict:
+        table = self._table(payload["TableName"])
+        index = table.index(payload.get("IndexName"))
+        if payload.get("ConsistentRead") and index.name is not None:
+            raise validation_error("Consistent reads are not supported on global secondary indexes")
+        placeholders = self._placeholders(payload)
+        node, hash_value = self._key_condition(table, index, payload, placeholders)
+        if index.name is None:
+            candidates = [item for item in table.items.values() if equals(item[index.hash_key], hash_value)]
+        else:
+            keys = index.partitions.get(key_part(hash_value), ())
+            candidates = [table.items[key] for key in keys]
+        candidates = [item for item in candidates if evaluate(item, node)]
+        capacity = _Capacity()
+        response = self._read_page(table, index, candidates, payload, placeholders, capacity)
+        return self._finish(response, capacity, payload)
+
+    def _op_Scan(self, payload: dict) -> dict:
+        table = self._table(payload["TableName"])
+        index = table.index(payload.get("IndexName"))
+        placeholders = self._placeholders(payload)
+        candidates = [item for item in table.items.values() if index.covers(item)]
+        capacity = _Capacity()
+        # Scans go in table-key order regardless of index
+        response = self._read_page(table, index, candidates, {**payload, "ScanIndexForward": True},
+                                   placeholders, capacity)
+        return self._finish(response, capacity, payload)
+
+    # -- batches --------------------------------------------------------
+    def _op_BatchWriteItem(self, payload: dict) -> dict:
+        requests = payload.get("RequestItems", {})
+        total = sum(len(entries) for entries in requests.values())
+        if total == 0 or total > MAX_BATCH_WRITE:
+            raise validation_error(
+                "1 validation error detected: Value at 'requestItems' failed to satisfy constraint: "
+                f"Member must have length less than or equal to {MAX_BATCH_WRITE}")
+
+        planned = []
+        for name, entries in requests.items():
+            table = self._table(name)
+            seen = set()
+            for entry in entries:
+                if "PutRequest" in entry:
+                    item = entry["PutRequest"]["Item"]
+                    table.validate_item(item)
+                    key = table.key_of(item)
+                    planned.append((table, key, item))
+                else:
+                    key = table.check_key(entry["DeleteRequest"]["Key"])
+                    planned.append((table, key, None))
+                if key in seen:
+                    raise validation_error("Provided list of item keys contains duplicates")
+                seen.add(key)
+
+        capacity = _Capacity()
+        for table, key, item in planned:
+            if item is not None:
+                old = table.put(copy.deepcopy(item))
+            else:
+                old = table.delete(key)
+            self._charge_write(capacity, table, old, item)
+        response = {"UnprocessedItems": {}}
+        return self._finish(response, capacity, payload, "write", single=False)
+
+    def _op_BatchGetItem(self, payload: dict) -> dict:
+        requests = payload.get("RequestItems", {})
+        total = sum(len(spec.get("Keys", [])) for spec in requests.values())
+        if total == 0 or total > MAX_BATCH_GET:
+            raise validation_error(
+                "1 validation error detected: Value at 'requestItems' failed to satisfy constraint: "
+                f"Member must have length less than or equal to {MAX_BATCH_GET}")
+        capacity = _Capacity()
+        responses = {}
+        for name, spec in requests.items():
+            table = self._table(name)
+            placeholders = self._placeholders(spec)
+            projection = parse_projection(spec["ProjectionExpression"], placeholders) \
+                if spec.get("ProjectionExpression") else None
+            placeholders.check_unused()
+            keys = [table.check_key(key) for key in spec["Keys"]]
+            if len(set(keys)) != len(keys):
+                raise validation_error("Provided list of item keys contains duplicates")
+            found = []
+            for key in keys:
+                item = table.get(key)
+                capacity.add(name, _read_units(item_size(item) if item else 0, spec.get("ConsistentRead", False)))
+                if item is not None:
+                    found.append(copy.deepcopy(project(item, projection) if projection else item))
+            responses[name] = found
+        response = {"Responses": responses, "UnprocessedKeys": {}}
+        return self._finish(response, capacity, payload, single=False)
+
+    # -- transactions ---------------------------------------------------
+    def _op_TransactWriteItems(self, payload: dict) -> dict:
+        actions = payload.get("TransactItems", [])
+        if not actions or len(actions) > MAX_TRANSACT_ITEMS:
+            raise validation_error(
+                "1 validation error detected: Value at 'transactItems' failed to satisfy constraint: "
+                f"Member must have length less than or equal to {MAX_TRANSACT_ITEMS}")
+
+        planned, seen = [], set()
+        for action in actions:
+            (kind, spec), = action.items()
+            table = self._table(spec["TableName"])
+            placeholders = self._placeholders(spec)
+            key = table.check_key(spec["Key"]) if kind != "Put" else None
+            if kind == "Put":
+                table.validate_item(spec["Item"])
+                key = table.key_of(spec["Item"])
+            if (table.name, key) in seen:
+                raise validation_error("Transaction request cannot include multiple operations on one item")
+            seen.add((table.name, key))
+            planned.append((kind, spec, table, key, placeholders))
+
+        # Evaluate every condition against the current state first; any
+        # failure cancels the whole transaction
+        reasons, results = [], []
+        for kind, spec, table, key, placeholders in planned:
+            old = table.get(key)
+            try:
+                if kind == "Update":
+                    _, _, new, _ = self._updated_item(table, spec, placeholders)
+                else:
+                    self._check_condition(spec, placeholders, old)
+                    if kind == "ConditionCheck" and "ConditionExpression" not in spec:
+                        raise validation_error("ConditionCheck requires a ConditionExpression")
+                    new = copy.deepcopy(spec["Item"]) if kind == "Put" else None
+                placeholders.check_unused()
+                reasons.append({"Code": "None"})
+                results.append((kind, table, key, old, new))
+            except DynamoDBError as error:
+                if error.code == "ConditionalCheckFailedException":
+                    reason = {"Code": "ConditionalCheckFailed", "Message": error.message}
+                    if "Item" in error.extra:
+                        reason["Item"] = error.extra["Item"]
+                    reasons.append(reason)
+                    results.append(None)
+                else:
+                    raise
+        if any(reason["Code"] != "None" for reason in reasons):
+            codes = ", ".join(reason["Code"] for reason in reasons)
+            raise DynamoDBError(
+                "TransactionCanceledException",
+                f"Transaction cancelled, please refer cancellation reasons for specific reasons [{codes}]",
+                CancellationReasons=reasons,
+            )
+
+        capacity = _Capacity()
+        for kind, table, key, old, new in results:
+            if kind in ("Put", "Update"):
+                table.put(new)
+            elif kind == "Delete":
+                table.delete(key)
+            # Transactional writes cost twice a normal write
+            if kind == "ConditionCheck":
+                capacity.add(table.name, _read_units(item_size(old) if old else 0, True) * 2)
+            else:
+                self._charge_write(capacity, table, old, new, factor=2.0)
+        return self._finish({}, capacity, payload, "write", single=False)
+
+    def _op_TransactGetItems(self, payload: dict) -> dict:
+        actions = payload.get("TransactItems", [])
+        if not actions or len(actions) > MAX_TRANSACT_ITEMS:
+            raise validation_error("Member must have length less than or equal to 100")
+        capacity = _Capacity()
+        responses = []
+        for action in actions:
+            spec = action["Get"]
+            table = self._table(spec["TableName"])
+            placeholders = self._placeholders(spec)
+            item = self._projected(table.get(table.check_key(spec["Key"])), spec, placeholders)
+            placeholders.check_unused()
+            stored = table.get(table.check_key(spec["Key"]))
+            capacity.add(table.name, _read_units(item_size(stored) if stored else 0, True) * 2)
+            responses.append({"Item": copy.deepcopy(item)} if item is not None else {})
+        return self._finish({"Responses": responses}, capacity, payload, single=False)
+
+
+_shared: DynamoDBEmulator | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_emulator() -> DynamoDBEmulator:
+    """The process-wide emulator, so every client/session sees the same data."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = DynamoDBEmulator()
+        return _shared
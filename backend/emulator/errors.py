@@ -0,0 +1,29 @@
+# emulator/errors.py
+
+
+class DynamoDBError(Exception):
+    """An error response: HTTP status, DynamoDB error code and message, plus
+    any extra top-level fields (CancellationReasons, Item, ...)."""
+
+    def __init__(self, code: str, message: str, status: int = 400, **extra):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.status = status
+        self.extra = extra
+
+    def body(self) -> dict:
+        return {"__type": f"com.amazonaws.dynamodb.v20120810#{self.code}", "message": self.message, **self.extra}
+
+
+def validation_error(message: str) -> DynamoDBError:
+    return DynamoDBError("ValidationException", message)
+
+
+def conditional_check_failed(item: dict | None = None) -> DynamoDBError:
+    extra = {"Item": item} if item is not None else {}
+    return DynamoDBError("ConditionalCheckFailedException", "The conditional request failed", **extra)
+
+
+def resource_not_found(message: str = "Requested resource not found") -> DynamoDBError:
+    return DynamoDBError("ResourceNotFoundException", message)
@@ -0,0 +1,549 @@
+# emulator/expressions.py
+# Parser and evaluator for condition, key-condition, filter, projection and
+# update expressions.
+import base64
+import copy
+import re
+from decimal import Decimal
+
+from emulator.errors import validation_error
+from emulator.values import SET_TYPES, compare, equals, format_number, to_decimal, value_type, size_of_value
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<name>#[A-Za-z0-9_]+)|(?P<value>:[A-Za-z0-9_]+)|(?P<op><>|<=|>=|[=<>(),.\[\]+\-])"
+    r"|(?P<ident>[A-Za-z_][A-Za-z0-9_]*)|(?P<int>\d+))"
+)
+_KEYWORDS = {"AND", "OR", "NOT", "BETWEEN", "IN", "SET", "REMOVE", "ADD", "DELETE"}
+_BOOL_FUNCTIONS = {"attribute_exists", "attribute_not_exists", "attribute_type", "begins_with", "contains"}
+_COMPARATORS = {"=", "<>", "<", "<=", ">", ">="}
+
+
+class Placeholders:
+    """ExpressionAttributeNames/Values of one request, tracking which ones
+    the request's expressions actually used (unused ones are an error)."""
+
+    def __init__(self, names: dict | None, values: dict | None):
+        self.names = names or {}
+        self.values = values or {}
+        self.used_names: set = set()
+        self.used_values: set = set()
+
+    def name(self, token: str) -> str:
+        if token not in self.names:
+            raise validation_error(
+                f"An expression attribute name used in the document path is not defined; attribute name: {token}"
+            )
+        self.used_names.add(token)
+        return self.names[token]
+
+    def value(self, token: str) -> dict:
+        if token not in self.values:
+            raise validation_error(
+                f"An expression attribute value used in expression is not defined; attribute value: {token}"
+            )
+        self.used_values.add(token)
+        return self.values[token]
+
+    def check_unused(self) -> None:
+        unused_names = set(self.names) - self.used_names
+        if unused_names:
+            raise validation_error(
+                f"Value provided in ExpressionAttributeNames unused in expressions: keys: {{{', '.join(sorted(unused_names))}}}"
+            )
+        unused_values = set(self.values) - self.used_values
+        if unused_values:
+            raise validation_error(
+                f"Value provided in ExpressionAttributeValues unused in expressions: keys: {{{', '.join(sorted(unused_values))}}}"
+            )
+
+
+def _tokenize(expression: str) -> list:
+    tokens, pos = [], 0
+    expression = expression.rstrip()
+    while pos < len(expression):
+        match = _TOKEN.match(expression, pos)
+        if not match or match.end() == pos:
+            raise validation_error(f"Invalid expression: Syntax error; token: {expression[pos:pos + 10]!r}")
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == "ident" and text.upper() in _KEYWORDS:
+            kind, text = "kw", text.upper()
+        tokens.append((kind, text))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, expression: str, placeholders: Placeholders):
+        if not expression or not expression.strip():
+            raise validation_error("Invalid expression: The expression can not be empty;")
+        self.tokens = _tokenize(expression)
+        self.pos = 0
+        self.placeholders = placeholders
+
+    # -- token helpers --------------------------------------------------
+    def peek(self, offset: int = 0):
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def next(self):
+        token = self.peek()
+        if token[0] is None:
+            raise validation_error("Invalid expression: Syntax error; token: <EOF>")
+        self.pos += 1
+        return token
+
+    def accept(self, kind: str, text: str | None = None) -> bool:
+        token = self.peek()
+        if token[0] == kind and (text is None or token[1] == text):
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, kind: str, text: str | None = None):
+        token = self.next()
+        if token[0] != kind or (text is not None and token[1] != text):
+            raise validation_error(f"Invalid expression: Syntax error; token: {token[1]!r}")
+        return token
+
+    def done(self) -> None:
+        if self.peek()[0] is not None:
+            raise validation_error(f"Invalid expression: Syntax error; token: {self.peek()[1]!r}")
+
+    # -- operands -------------------------------------------------------
+    def path(self):
+        kind, text = self.next()
+        if kind == "name":
+            segments = [self.placeholders.name(text)]
+        elif kind == "ident":
+            segments = [text]
+        else:
+            raise validation_error(f"Invalid expression: Syntax error; token: {text!r}")
+        while True:
+            if self.accept("op", "."):
+                kind, text = self.next()
+                if kind == "name":
+                    segments.append(self.placeholders.name(text))
+                elif kind == "ident":
+                    segments.append(text)
+                else:
+                    raise validation_error(f"Invalid expression: Syntax error; token: {text!r}")
+            elif self.accept("op", "["):
+                segments.append(int(self.expect("int")[1]))
+                self.expect("op", "]")
+            else:
+                return ("path", tuple(segments))
+
+    def operand(self):
+        kind, text = self.peek()
+        if kind == "value":
+            self.next()
+            return ("value", self.placeholders.value(text))
+        if kind == "ident" and text == "size" and self.peek(1) == ("op", "("):
+            self.next()
+            self.expect("op", "(")
+            path = self.path()
+            self.expect("op", ")")
+            return ("size", path)
+        return self.path()
+
+    # -- conditions -----------------------------------------------------
+    def condition(self):
+        node = self.and_condition()
+        while self.accept("kw", "OR"):
+            node = ("or", node, self.and_condition())
+        return node
+
+    def and_condition(self):
+        node = self.not_condition()
+        while self.accept("kw", "AND"):
+            node = ("and", node, self.not_condition())
+        return node
+
+    def not_condition(self):
+        if self.accept("kw", "NOT"):
+            return ("not", self.not_condition())
+        return self.primary_condition()
+
+    def primary_condition(self):
+        if self.accept("op", "("):
+            node = self.condition()
+            self.expect("op", ")")
+            return node
+        kind, text = self.peek()
+        if kind == "ident" and text in _BOOL_FUNCTIONS and self.peek(1) == ("op", "("):
+            self.next()
+            self.expect("op", "(")
+            args = [self.operand()]
+            while self.accept("op", ","):
+                args.append(self.operand())
+            self.expect("op", ")")
+            return ("func", text, tuple(args))
+
+        left = self.operand()
+        kind, text = self.next()
+        if kind == "op" and text in _COMPARATORS:
+            return ("cmp", text, left, self.operand())
+        if (kind, text) == ("kw", "BETWEEN"):
+            low = self.operand()
+            self.expect("kw", "AND")
+            return ("between", left, low, self.operand())
+        if (kind, text) == ("kw", "IN"):
+            self.expect("op", "(")
+            options = [self.operand()]
+            while self.accept("op", ","):
+                options.append(self.operand())
+            self.expect("op", ")")
+            return ("in", left, tuple(options))
+        raise validation_error(f"Invalid expression: Syntax error; token: {text!r}")
+
+    # -- update ---------------------------------------------------------
+    def update(self) -> dict:
+        clauses = {}
+        while self.peek()[0] is not None:
+            kind, clause = self.next()
+            if kind != "kw" or clause not in ("SET", "REMOVE", "ADD", "DELETE"):
+                raise validation_error(f"Invalid UpdateExpression: Syntax error; token: {clause!r}")
+            if clause in clauses:
+                raise validation_error(f"Invalid UpdateExpression: The \"{clause}\" section can only be used once in an update expression;")
+            actions = []
+            while True:
+                path = self.path()
+                if clause == "SET":
+                    self.expect("op", "=")
+                    actions.append((path, self.set_value()))
+                elif clause == "REMOVE":
+                    actions.append((path, None))
+                else:
+                    value = self.operand()
+                    if value[0] != "value":
+                        raise validation_error(f"Invalid UpdateExpression: Syntax error; {clause} requires a value")
+                    actions.append((path, value))
+                if not self.accept("op", ","):
+                    break
+            clauses[clause] = actions
+        return clauses
+
+    def set_value(self):
+        node = self.set_operand()
+        if self.accept("op", "+"):
+            return ("plus", node, self.set_operand())
+        if self.accept("op", "-"):
+            return ("minus", node, self.set_operand())
+        return node
+
+    def set_operand(self):
+        kind, text = self.peek()
+        if kind == "ident" and text in ("if_not_exists", "list_append") and self.peek(1) == ("op", "("):
+            self.next()
+            self.expect("op", "(")
+            first = self.path() if text == "if_not_exists" else self.set_operand()
+            self.expect("op", ",")
+            second = self.set_operand()
+            self.expect("op", ")")
+            return (text, first, second)
+        return self.operand()
+
+
+def parse_condition(expression: str, placeholders: Placeholders):
+    parser = _Parser(expression, placeholders)
+    node = parser.condition()
+    parser.done()
+    return node
+
+
+def parse_update(expression: str, placeholders: Placeholders) -> dict:
+    parser = _Parser(expression, placeholders)
+    return parser.update()
+
+
+def parse_projection(expression: str, placeholders: Placeholders) -> list:
+    parser = _Parser(expression, placeholders)
+    paths = [parser.path()]
+    while parser.accept("op", ","):
+        paths.append(parser.path())
+    parser.done()
+    return paths
+
+
+# -- evaluation ---------------------------------------------------------
+
+def resolve(item: dict, path) -> dict | None:
+    segments = path[1]
+    value = item.get(segments[0])
+    for segment in segments[1:]:
+        if value is None:
+            return None
+        if isinstance(segment, int):
+            elements = value.get("L")
+            value = elements[segment] if elements is not None and segment < len(elements) else None
+        else:
+            members = value.get("M")
+            value = members.get(segment) if members is not None else None
+    return value
+
+
+def _operand(item: dict, node) -> dict | None:
+    if node[0] == "value":
+        return node[1]
+    if node[0] == "size":
+        value = resolve(item, node[1])
+        if value is None:
+            return None
+        kind = value_type(value)
+        if kind in ("S", "B", "N"):
+            size = size_of_value(value) if kind != "S" else len(value["S"].encode("utf-8"))
+        elif kind in ("L", "M") or kind in SET_TYPES:
+            size = len(value[kind])
+        else:
+            raise validation_error("Invalid ConditionExpression: Incorrect operand type for operator or function; operator or function: size")
+        return {"N": str(size)}
+    return resolve(item, node)
+
+
+def _begins_with(value, prefix) -> bool:
+    if value is None or prefix is None:
+        return False
+    kind = value_type(value)
+    if kind != value_type(prefix) or kind not in ("S", "B"):
+        return False
+    if kind == "S":
+        return value["S"].startswith(prefix["S"])
+    return base64.b64decode(value["B"]).startswith(base64.b64decode(prefix["B"]))
+
+
+def _contains(value, operand) -> bool:
+    if value is None or operand is None:
+        return False
+    kind = value_type(value)
+    if kind == "S":
+        return value_type(operand) == "S" and operand["S"] in value["S"]
+    if kind in SET_TYPES:
+        element_type = kind[0]
+        return value_type(operand) == element_type and any(
+            equals({element_type: element}, operand) for element in value[kind])
+    if kind == "L":
+        return any(equals(element, operand) for element in value["L"])
+    return False
+
+
+def evaluate(item: dict, node) -> bool:
+    tag = node[0]
+    if tag == "and":
+        return evaluate(item, node[1]) and evaluate(item, node[2])
+    if tag == "or":
+        return evaluate(item, node[1]) or evaluate(item, node[2])
+    if tag == "not":
+        return not evaluate(item, node[1])
+    if tag == "cmp":
+        return compare(_operand(item, node[2]), _operand(item, node[3]), node[1])
+    if tag == "between":
+        value = _operand(item, node[1])
+        return compare(value, _operand(item, node[2]), ">=") and compare(value, _operand(item, node[3]), "<=")
+    if tag == "in":
+        value = _operand(item, node[1])
+        return any(equals(value, _operand(item, option)) for option in node[2])
+    if tag == "func":
+        name, args = node[1], node[2]
+        if name in ("attribute_exists", "attribute_not_exists"):
+            if len(args) != 1 or args[0][0] != "path":
+                raise validation_error(f"Invalid ConditionExpression: Incorrect number of operands for operator or function; operator or function: {name}")
+            exists = resolve(item, args[0]) is not None
+            return exists if name == "attribute_exists" else not exists
+        if len(args) != 2:
+            raise validation_error(f"Invalid ConditionExpression: Incorrect number of operands for operator or function; operator or function: {name}")
+        if name == "attribute_type":
+            value, wanted = _operand(item, args[0]), _operand(item, args[1])
+            return value is not None and wanted is not None and value_type(value) == wanted.get("S")
+        if name == "begins_with":
+            return _begins_with(_operand(item, args[0]), _operand(item, args[1]))
+        return _contains(_operand(item, args[0]), _operand(item, args[1]))
+    raise validation_error("Invalid ConditionExpression")
+
+
+def paths_in(node) -> list:
+    """All document paths referenced by a condition (for key conditions)."""
+    tag = node[0]
+    if tag == "path":
+        return [node[1]]
+    if tag == "value":
+        return []
+    if tag == "size":
+        return [node[1][1]]
+    if tag == "func":
+        operands = node[2]
+    elif tag == "in":
+        operands = (node[1], *node[2])
+    elif tag == "cmp":
+        operands = node[2:]
+    else:  # and/or/not/between
+        operands = node[1:]
+    return [path for operand in operands for path in paths_in(operand)]
+
+
+def project(item: dict, paths: list) -> dict:
+    result: dict = {}
+    for path in paths:
+        value = resolve(item, path)
+        if value is None:
+            continue
+        segments = path[1]
+        if len(segments) == 1:
+            result[segments[0]] = value
+            continue
+        container = result
+        for i, segment in enumerate(segments[:-1]):
+            following = segments[i + 1]
+            empty = {"L": []} if isinstance(following, int) else {"M": {}}
+            if isinstance(segment, int):
+                container["L"].append(empty)
+                container = container["L"][-1]
+            else:
+                target = container if container is result else container["M"]
+                container = target.setdefault(segment, empty)
+        last = segments[-1]
+        if isinstance(last, int):
+            container["L"].append(value)
+        else:
+            (container if container is result else container["M"])[last] = value
+    return result
+
+
+# -- update application ---------------------------------------------------
+
+def _invalid_path() -> Exception:
+    return validation_error("The document path provided in the update expression is invalid for update")
+
+
+def _set_path(item: dict, segments: tuple, value: dict) -> None:
+    if len(segments) == 1:
+        item[segments[0]] = value
+        return
+    parent = resolve(item, ("path", segments[:-1]))
+    last = segments[-1]
+    if parent is None:
+        raise _invalid_path()
+    if isinstance(last, int):
+        if "L" not in parent:
+            raise _invalid_path()
+        if last < len(parent["L"]):
+            parent["L"][last] = value
+        else:
+            parent["L"].append(value)
+    else:
+        if "M" not in parent:
+            raise _invalid_path()
+        parent["M"][last] = value
+
+
+def _remove_path(item: dict, segments: tuple) -> None:
+    if len(segments) == 1:
+        item.pop(segments[0], None)
+        return
+    parent = resolve(item, ("path", segments[:-1]))
+    last = segments[-1]
+    if parent is None:
+        return
+    if isinstance(last, int):
+        if "L" in parent and last < len(parent["L"]):
+            del parent["L"][last]
+    elif "M" in parent:
+        parent["M"].pop(last, None)
+
+
+def _wrong_operand(operator: str) -> Exception:
+    return validation_error(
+        f"An operand in the update expression has an incorrect data type; operator or function: {operator}")
+
+
+def _set_value(item: dict, node) -> dict:
+    tag = node[0]
+    if tag == "if_not_exists":
+        existing = resolve(item, node[1])
+        return existing if existing is not None else _set_value(item, node[2])
+    if tag == "list_append":
+        first, second = _set_value(item, node[1]), _set_value(item, node[2])
+        if first is None or second is None or "L" not in first or "L" not in second:
+            raise _wrong_operand("list_append")
+        return {"L": first["L"] + second["L"]}
+    if tag in ("plus", "minus"):
+        first, second = _set_value(item, node[1]), _set_value(item, node[2])
+        operator = "+" if tag == "plus" else "-"
+        if first is None or second is None:
+            raise validation_error("The provided expression refers to an attribute that does not exist in the item")
+        if "N" not in first or "N" not in second:
+            raise _wrong_operand(operator)
+        a, b = to_decimal(first["N"]), to_decimal(second["N"])
+        return {"N": format_number(a + b if tag == "plus" else a - b)}
+    value = _operand(item, node)
+    if value is None:
+        raise validation_error("The provided expression refers to an attribute that does not exist in the item")
+    return value
+
+
+def apply_update(item: dict, clauses: dict) -> tuple[dict, set]:
+    """Apply parsed update clauses to a copy of `item`.
+
+    Right-hand sides are evaluated against the item as it was before the
+    update, like DynamoDB. Returns (new item, top-level attributes touched).
+    """
+    seen = []
+    for actions in clauses.values():
+        for path, _ in actions:
+            segments = path[1]
+            for other in seen:
+                shorter = min(len(segments), len(other))
+                if segments[:shorter] == other[:shorter]:
+                    raise validation_error(
+                        "Invalid UpdateExpression: Two document paths overlap with each other; "
+                        "must remove or rewrite one of these paths")
+            seen.append(segments)
+
+    original = item
+    updated = copy.deepcopy(item)
+    touched = {segments[0] for segments in seen}
+
+    computed = [(path, _set_value(original, value)) for path, value in clauses.get("SET", [])]
+    for path, value in computed:
+        _set_path(updated, path[1], value)
+
+    for path, _ in clauses.get("REMOVE", []):
+        _remove_path(updated, path[1])
+
+    for path, (_, value) in clauses.get("ADD", []):
+        existing = resolve(updated, path)
+        kind = value_type(value)
+        if kind == "N":
+            if existing is not None and "N" not in existing:
+                raise _wrong_operand("ADD")
+            base = to_decimal(existing["N"]) if existing is not None else Decimal(0)
+            _set_path(updated, path[1], {"N": format_number(base + to_decimal(value["N"]))})
+        elif kind in SET_TYPES:
+            if existing is None:
+                _set_path(updated, path[1], value)
+            elif value_type(existing) != kind:
+                raise _wrong_operand("ADD")
+            else:
+                merged = list(existing[kind]) + [e for e in value[kind] if not any(
+                    equals({kind[0]: e}, {kind[0]: x}) for x in existing[kind])]
+                _set_path(updated, path[1], {kind: merged})
+        else:
+            raise _wrong_operand("ADD")
+
+    for path, (_, value) in clauses.get("DELETE", []):
+        kind = value_type(value)
+        if kind not in SET_TYPES:
+            raise _wrong_operand("DELETE")
+        existing = resolve(updated, path)
+        if existing is None:
+            continue
+        if value_type(existing) != kind:
+            raise _wrong_operand("DELETE")
+        remaining = [e for e in existing[kind] if not any(
+            equals({kind[0]: e}, {kind[0]: x}) for x in value[kind])]
+        if remaining:
+            _set_path(updated, path[1], {kind: remaining})
+        else:
+            _remove_path(updated, path[1])
+
+    return updated, touched
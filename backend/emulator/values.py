@@ -0,0 +1,149 @@
+# emulator/values.py
+# Helpers over DynamoDB wire-format attribute values ({"S": "x"}, {"N": "1"}, ...)
+import base64
+from decimal import Decimal, InvalidOperation
+
+from emulator.errors import validation_error
+
+SCALAR_TYPES = ("S", "N", "B")
+SET_TYPES = ("SS", "NS", "BS")
+
+
+def value_type(value: dict) -> str:
+    (kind,) = value.keys()
+    return kind
+
+
+def to_decimal(raw: str) -> Decimal:
+    try:
+        number = Decimal(raw)
+    except InvalidOperation:
+        raise validation_error(f"A value provided cannot be converted into a number: {raw!r}")
+    if not number.is_finite():
+        raise validation_error(f"A value provided cannot be converted into a number: {raw!r}")
+    return number
+
+
+def format_number(number: Decimal) -> str:
+    if number == number.to_integral_value():
+        return str(number.quantize(Decimal(1)))
+    return format(number.normalize(), "f")
+
+
+def _bytes(raw: str) -> bytes:
+    return base64.b64decode(raw)
+
+
+def key_part(value: dict):
+    """Hashable identity of a key value (numbers compare numerically)."""
+    kind = value_type(value)
+    if kind == "N":
+        return ("N", to_decimal(value["N"]))
+    if kind == "B":
+        return ("B", _bytes(value["B"]))
+    return ("S", value["S"])
+
+
+def sort_key(value: dict):
+    """Ordering of key values: UTF-8 bytes for strings, numeric for numbers."""
+    kind = value_type(value)
+    if kind == "N":
+        return to_decimal(value["N"])
+    if kind == "B":
+        return _bytes(value["B"])
+    return value["S"].encode("utf-8")
+
+
+def _normalize(value: dict):
+    kind = value_type(value)
+    raw = value[kind]
+    if kind == "N":
+        return kind, to_decimal(raw)
+    if kind == "B":
+        return kind, _bytes(raw)
+    if kind == "NS":
+        return kind, frozenset(to_decimal(n) for n in raw)
+    if kind == "BS":
+        return kind, frozenset(_bytes(b) for b in raw)
+    if kind == "SS":
+        return kind, frozenset(raw)
+    if kind == "L":
+        return kind, tuple(_normalize(v) for v in raw)
+    if kind == "M":
+        return kind, tuple(sorted((k, _normalize(v)) for k, v in raw.items()))
+    return kind, raw
+
+
+def equals(a: dict | None, b: dict | None) -> bool:
+    if a is None or b is None:
+        return False
+    return _normalize(a) == _normalize(b)
+
+
+def compare(a: dict | None, b: dict | None, op: str) -> bool:
+    if op == "=":
+        return equals(a, b)
+    if op == "<>":
+        # A missing attribute is "not equal" to any value
+        return not equals(a, b)
+    if a is None or b is None:
+        return False
+    kind = value_type(a)
+    if kind != value_type(b) or kind not in SCALAR_TYPES:
+        return False
+    x, y = sort_key(a), sort_key(b)
+    return {"<": x < y, "<=": x <= y, ">": x > y, ">=": x >= y}[op]
+
+
+def size_of_value(value: dict) -> int:
+    kind = value_type(value)
+    raw = value[kind]
+    if kind == "S":
+        return len(raw.encode("utf-8"))
+    if kind == "N":
+        digits = len(to_decimal(raw).as_tuple().digits)
+        return (digits + 1) // 2 + 1
+    if kind == "B":
+        return len(_bytes(raw))
+    if kind in ("BOOL", "NULL"):
+        return 1
+    if kind == "SS":
+        return sum(len(s.encode("utf-8")) for s in raw)
+    if kind == "NS":
+        return sum(size_of_value({"N": n}) for n in raw)
+    if kind == "BS":
+        return sum(len(_bytes(b)) for b in raw)
+    if kind == "L":
+        return 3 + sum(1 + size_of_value(v) for v in raw)
+    # M
+    return 3 + sum(1 + len(k.encode("utf-8")) + size_of_value(v) for k, v in raw.items())
+
+
+def item_size(item: dict) -> int:
+    return sum(len(name.encode("utf-8")) + size_of_value(value) for name, value in item.items())
+
+
+def validate_value(value, where: str = "") -> None:
+    if not isinstance(value, dict) or len(value) != 1:
+        raise validation_error(f"Supplied AttributeValue is empty, must contain exactly one of the supported datatypes{where}")
+    kind = value_type(value)
+    raw = value[kind]
+    if kind == "N":
+        to_decimal(raw)
+    elif kind in SET_TYPES:
+        if not raw:
+            raise validation_error("One or more parameter values were invalid: An empty set is not allowed")
+        if kind == "NS":
+            numbers = [to_decimal(n) for n in raw]
+            if len(set(numbers)) != len(numbers):
+                raise validation_error("Input collection contains duplicates")
+        elif len(set(raw)) != len(raw):
+            raise validation_error("Input collection contains duplicates")
+    elif kind == "L":
+        for element in raw:
+            validate_value(element, where)
+    elif kind == "M":
+        for element in raw.values():
+            validate_value(element, where)
+    elif kind not in ("S", "B", "BOOL", "NULL"):
+        raise validation_error(f"Supplied AttributeValue has unsupported datatype {kind}")
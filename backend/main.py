@@ -1,15 +1,53 @@
 # main.py
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException
 from mangum import Mangum
 
+from core.config import (
+    COMPRESSION_MIN_BYTES,
+    WARMER_PRIME_DB,
+    PRIME_ON_INIT,
+    PROFILING_ENABLED,
+    PROFILE_INTERVAL_MS,
+    PROFILE_OUTPUT,
+    PROFILE_MAX_STACKS,
+    CONTINUOUS_PROFILING,
+    CONTINUOUS_PROFILE_INTERVAL_MS,
+    CONTINUOUS_PROFILE_WINDOW_SECONDS,
+    CONTINUOUS_PROFILE_WINDOWS,
+    MEMORY_PROFILING,
+    MEMORY_TRACE_FRAMES,
+    DDB_CALL_TRACKING,
+    DDB_CALL_BUDGET,
+    DDB_WARN_REPEATED_KEYS,
+    TRACING_ENABLED,
+    TRACE_SAMPLE_RATE,
+    TRACE_EXPORT,
+    TRACE_BATCH_SIZE,
+    TRACE_FLUSH_SECONDS,
+)
 from core.logging import configure_logging
 from core.errors import (
     http_exception_handler,
     validation_exception_handler,
     client_error_handler,
+    storage_unavailable_handler,
     unhandled_exception_handler,
 )
+from core.governor import StorageUnavailable
+from core.lambda_stream import StreamingLambdaHandler, encode_prelude
+from core.profiling import start_continuous, stop_continuous
+from core.tracing import configure_exporter, start_export_thread, stop_export_thread
+from db import prime, prime_connection
+from middleware.compression import CompressionMiddleware
+from middleware.ddb_calls import DynamoDBCallMiddleware
+from middleware.fastpath import FastPathMiddleware
 from middleware.logging import RequestResponseLogger
+from middleware.memory import MemoryAccountingMiddleware
+from middleware.profiling import ProfilingMiddleware
+from middleware.tracing import TracingMiddleware
+from routes.debug import debug_router
 from routes.item import item_router
 from routes.user import user_router
 
@@ -22,37 +60,178 @@ ALLOWED_ORIGINS = [
     "https://d19njcc0e7y07z.cloudfront.net",  # CloudFront website domain
     "http://localhost:5500"  # Local development
 ]
+CORS_ALLOW_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+CORS_ALLOW_HEADERS = ["Content-Type", "Authorization"]
+CORS_MAX_AGE = 86400  # browsers cap this (Chromium: 2h), but fewer preflights either way
 
 # 1) Logging first
 configure_logging()
 
-app = FastAPI(title="FastAPI + DynamoDB on Lambda")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Server mode only: the Lambda handlers run Mangum with lifespan="off"
+    if CONTINUOUS_PROFILING:
+        start_continuous(
+            interval=CONTINUOUS_PROFILE_INTERVAL_MS / 1000,
+            window=CONTINUOUS_PROFILE_WINDOW_SECONDS,
+            keep=CONTINUOUS_PROFILE_WINDOWS,
+        )
+    # Span batches are written off the event loop; Lambda flushes inline
+    start_export_thread()
+    yield
+    stop_export_thread()
+    stop_continuous()
+
+
+app = FastAPI(title="FastAPI + DynamoDB on Lambda", lifespan=lifespan)
+
+# Compression innermost, so it sees the final body/media type and streams
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_BYTES)
 
 # CORS (attach CORS kwargs to CORSMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=False,   # using Bearer tokens, not cookies
-    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization"],
+    allow_methods=CORS_ALLOW_METHODS,
+    allow_headers=CORS_ALLOW_HEADERS,
+    max_age=CORS_MAX_AGE,
 )
 
 # Your request/response logger (no CORS kwargs)
 app.add_middleware(RequestResponseLogger)
 
+# DynamoDB calls per request, until the last streamed byte
+if DDB_CALL_TRACKING:
+    app.add_middleware(DynamoDBCallMiddleware, max_calls=DDB_CALL_BUDGET, warn_repeats=DDB_WARN_REPEATED_KEYS)
+
+# Requests with a valid X-Profile-Token are profiled, logging and all
+if PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        interval=PROFILE_INTERVAL_MS / 1000,
+        output=PROFILE_OUTPUT,
+        max_stacks=PROFILE_MAX_STACKS,
+    )
+
+# Allocations per request and route, including logging and profiling
+if MEMORY_PROFILING:
+    app.add_middleware(MemoryAccountingMiddleware, frames=MEMORY_TRACE_FRAMES)
+
+# Root span around everything below, so its duration is the request's
+if TRACING_ENABLED:
+    configure_exporter(TRACE_EXPORT, batch_size=TRACE_BATCH_SIZE, flush_interval=TRACE_FLUSH_SECONDS)
+    app.add_middleware(TracingMiddleware, sample_rate=TRACE_SAMPLE_RATE)
+
+# Outermost: allowed preflights and health pings are answered here, before
+# logging, CORS and routing
+app.add_middleware(
+    FastPathMiddleware,
+    allow_origins=ALLOWED_ORIGINS,
+    allow_methods=CORS_ALLOW_METHODS,
+    allow_headers=CORS_ALLOW_HEADERS,
+    max_age=CORS_MAX_AGE,
+    health_path="/api/health",
+)
+
 # Register routers
 app.include_router(item_router, prefix="/api/item")
 app.include_router(user_router, prefix="/api/user")
+app.include_router(debug_router, prefix="/api/debug")
 
 app.add_exception_handler(HTTPException, http_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(ClientError, client_error_handler)
+app.add_exception_handler(StorageUnavailable, storage_unavailable_handler)
 app.add_exception_handler(Exception, unhandled_exception_handler)
 
-# Healthcheck (handy for logs)
+# Healthcheck (answered by FastPathMiddleware; kept here for the OpenAPI docs)
 @app.get("/api/health")
 def health():
     return {"status": "ok"}
 
 # Lambda handler
-handler = Mangum(app, lifespan="off")
+asgi_handler = Mangum(app, lifespan="off")
+
+
+def is_warmup_event(event) -> bool:
+    # serverless-plugin-warmup / custom warmers send {"warmer": true} or
+    # {"source": "serverless-plugin-warmup"}; EventBridge schedules send
+    # {"source": "aws.events", "detail-type": "Scheduled Event"}
+    if not isinstance(event, dict):
+        return False
+    return (
+        event.get("warmer") is True
+        or event.get("source") in ("serverless-plugin-warmup", "aws.events")
+        or event.get("detail-type") == "Scheduled Event"
+    )
+
+
+def handler(event, context):
+    # Warmers never reach Mangum's event translation or the app
+    if is_warmup_event(event):
+        if WARMER_PRIME_DB:
+            prime_connection()
+        return {"statusCode": 200, "body": "warm"}
+    return asgi_handler(event, context)
+
+
+# Lambda response streaming variant (see core/lambda_stream.py): the item
+# listing and export are written page by page instead of buffered
+asgi_stream_handler = StreamingLambdaHandler(app)
+
+
+def stream_handler(event, context, response_stream):
+    if is_warmup_event(event):
+        if WARMER_PRIME_DB:
+            prime_connection()
+        response_stream.write(encode_prelude(200, [(b"content-type", b"text/plain")]) + b"warm")
+        response_stream.close()
+        return
+    asgi_stream_handler(event, context, response_stream)
+
+
+def prime_hot_paths() -> None:
+    """Run one dummy pass through each per-request code path at init."""
+    from jose import jwt
+    from core.config import ALGORITHM, SECRET_KEY
+    from core.security import create_access_token, pwd_context
+    from core.serialization import dumps, trusted_items
+    from schemas.item import ItemCreate, ItemListQuery, ItemRead
+    from schemas.user import UserLogin, UserRead
+
+    # pydantic validators/serializers and the orjson encoder
+    item = ItemRead(id="prime", owner_id="prime", name="prime", description="prime")
+    ItemCreate.model_validate({"name": "prime", "description": "prime"})
+    ItemListQuery(fields="id,name")
+    UserLogin(username="prime", password="prime-password")
+    UserRead(id="prime", username="prime").model_dump()
+    dumps(trusted_items([item.model_dump()]))
+
+    # JWT encode/decode
+    jwt.decode(create_access_token({"sub": "prime"}), SECRET_KEY, algorithms=[ALGORITHM])
+
+    # passlib picks and self-tests its bcrypt backend on first use (cheap
+    # rounds); a real hash/verify stays on the request path
+    pwd_context.handler().get_backend()
+
+    # Starlette builds the middleware stack on the first ASGI call, and
+    # Mangum's event translation runs here too (answered by the fast path)
+    asgi_handler({
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": "/api/health",
+        "rawQueryString": "",
+        "headers": {"host": "prime"},
+        "requestContext": {
+            "http": {"method": "GET", "path": "/api/health", "protocol": "HTTP/1.1", "sourceIp": "127.0.0.1"},
+            "stage": "$default",
+        },
+        "isBase64Encoded": False,
+    }, None)
+
+
+if PRIME_ON_INIT:
+    prime()
+    prime_hot_paths()
@@ -0,0 +1,183 @@
+# middleware/compression.py
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+DEFAULT_MEDIA_TYPES = ("application/json", "application/x-ndjson")
+
+
+def _accepted_encodings(accept_encoding: str) -> dict:
+    """{coding: q} from an Accept-Encoding header; q defaults to 1 and
+    entries with a malformed q are ignored."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, *params = (piece.strip() for piece in part.split(";"))
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = min(max(float(value), 0.0), 1.0)
+                except ValueError:
+                    q = None
+        if q is not None:
+            accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    # Highest q wins, ties go to br. q=0 refuses a coding even when * allows
+    # everything else, and * only covers codings not listed by name.
+    accepted = _accepted_encodings(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in ("br", "gzip") if brotli is not None else ("gzip",):
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    # An explicitly preferred identity means no compression
+    if accepted.get("identity", 0.0) > best_q:
+        return None
+    return best
+
+
+class _Compressor:
+    # Uniform compress/flush/finish over gzip and brotli
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=4)
+        else:
+            self._gz = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        if self.encoding == "br":
+            out = self._br.process(data)
+            return out + self._br.flush() if flush else out
+        out = self._gz.compress(data)
+        return out + self._gz.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._br.finish()
+        return self._gz.flush()
+
+
+class CompressionMiddleware:
+    """Compress JSON/NDJSON responses with brotli or gzip per Accept-Encoding.
+
+    Plain ASGI (not BaseHTTPMiddleware) so streaming responses are compressed
+    chunk by chunk, each chunk flushed, instead of being buffered. Bodies
+    shorter than `minimum_size` and responses that already carry a
+    Content-Encoding are passed through untouched. Mangum base64-encodes the
+    compressed body for API Gateway because it is not valid UTF-8 text.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024,
+                 media_types: tuple = DEFAULT_MEDIA_TYPES):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.media_types = tuple(media_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(send, encoding, self.minimum_size, self.media_types)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, send: Send, encoding: str, minimum_size: int, media_types: tuple):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.media_types = media_types
+        self.start_message: Message | None = None
+        self.mode = None  # None (undecided), "passthrough" or "compress"
+        self.pending: list = []
+        self.pending_size = 0
+        self.compressor: _Compressor | None = None
+
+    def _eligible(self) -> bool:
+        headers = Headers(raw=self.start_message["headers"])
+        if "content-encoding" in headers or self.start_message["status"] in (204, 304):
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return content_type in self.media_types
+
+    async def _start_passthrough(self) -> None:
+        self.mode = "passthrough"
+        await self._send(self.start_message)
+        for chunk in self.pending:
+            await self._send({"type": "http.response.body", "body": chunk, "more_body": True})
+        self.pending = []
+
+    async def _start_compression(self, more_body: bool) -> bytes:
+        self.mode = "compress"
+        self.compressor = _Compressor(self.encoding)
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        buffered = b"".join(self.pending)
+        self.pending = []
+        if more_body:
+            del headers["Content-Length"]
+            await self._send(self.start_message)
+            return self.compressor.compress(buffered, flush=True)
+        body = self.compressor.compress(buffered, flush=False) + self.compressor.finish()
+        headers["Content-Length"] = str(len(body))
+        await self._send(self.start_message)
+        return body
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.mode is None:
+            if not self._eligible():
+                await self._start_passthrough()
+            else:
+                # Hold chunks until the size threshold is crossed or the
+                # response ends, so small streamed bodies stay uncompressed
+                self.pending.append(body)
+                self.pending_size += len(body)
+                if self.pending_size < self.minimum_size:
+                    if more_body:
+                        return
+                    self.pending.pop()
+                    await self._start_passthrough()
+                    await self._send(message)
+                    return
+                data = await self._start_compression(more_body)
+                await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+                return
+
+        if self.mode == "passthrough":
+            await self._send(message)
+            return
+
+        if more_body:
+            data = self.compressor.compress(body, flush=True)
+        else:
+            data = self.compressor.compress(body, flush=False) + self.compressor.finish()
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
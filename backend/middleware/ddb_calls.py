@@ -0,0 +1,34 @@
+# middleware/ddb_calls.py
+import logging
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from core.ddb_calls import log, track
+
+
+class DynamoDBCallMiddleware:
+    """Scope core.ddb_calls tracking to each request.
+
+    Calls are counted until the response is fully sent, so streamed
+    listings include the pages queried while streaming. When the request
+    ends, the calls are checked against `max_calls` and for repeated keys
+    (warnings on "app.ddb"); the per-request summary is logged at DEBUG.
+    """
+
+    def __init__(self, app: ASGIApp, max_calls: int = 0, warn_repeats: bool = True):
+        self.app = app
+        self.max_calls = max_calls
+        self.warn_repeats = warn_repeats
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with track(max_calls=self.max_calls, warn_repeats=self.warn_repeats) as calls:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                route = scope.get("route")
+                calls.route = f"{scope['method']} {route.path if route is not None else '<unmatched>'}"
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("DynamoDB calls", extra={"path": calls.route, "ddb_calls": calls.summary()})
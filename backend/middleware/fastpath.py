@@ -0,0 +1,94 @@
+# middleware/fastpath.py
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+HEALTH_BODY = b'{"status":"ok"}'
+
+
+class FastPathMiddleware:
+    """Answer CORS preflights and liveness pings before the middleware stack.
+
+    Sits outermost. An allowed preflight (OPTIONS with Origin and
+    Access-Control-Request-Method) and GET/HEAD on the health path are
+    answered from header lists built once at startup: no logging, no request
+    id, no routing. Anything else, including preflights that would be
+    rejected, falls through to CORSMiddleware and the app unchanged.
+    """
+
+    def __init__(self, app: ASGIApp,
+                 allow_origins: list,
+                 allow_methods: list,
+                 allow_headers: list,
+                 max_age: int = 600,
+                 health_path: str = "/api/health"):
+        self.app = app
+        self.allow_any_origin = "*" in allow_origins
+        self.allow_origins = {o.encode("latin-1") for o in allow_origins if o != "*"}
+        self.allow_methods = {m.upper().encode("latin-1") for m in allow_methods}
+        self.allow_headers = {h.lower() for h in allow_headers}
+        self.health_path = health_path
+
+        self.preflight_headers = [
+            (b"access-control-allow-methods", ", ".join(allow_methods).encode("latin-1")),
+            (b"access-control-allow-headers", ", ".join(allow_headers).encode("latin-1")),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+            (b"content-length", b"0"),
+            (b"vary", b"Origin"),
+        ]
+        self.health_headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(HEALTH_BODY)).encode("latin-1")),
+            (b"cache-control", b"no-store"),
+        ]
+
+    def _origin_allowed(self, origin: bytes) -> bool:
+        return self.allow_any_origin or origin in self.allow_origins
+
+    def _headers_allowed(self, requested: bytes) -> bool:
+        names = (h.strip().lower() for h in requested.decode("latin-1").split(","))
+        return all(not name or name in self.allow_headers for name in names)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            method = scope["method"]
+            if method == "OPTIONS":
+                if await self._preflight(scope, send):
+                    return
+            elif scope["path"] == self.health_path and method in ("GET", "HEAD"):
+                await self._health(scope, send, method == "HEAD")
+                return
+        await self.app(scope, receive, send)
+
+    async def _preflight(self, scope: Scope, send: Send) -> bool:
+        origin = request_method = None
+        request_headers = b""
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+        if (origin is None or request_method is None
+                or not self._origin_allowed(origin)
+                or request_method.upper() not in self.allow_methods
+                or not self._headers_allowed(request_headers)):
+            return False
+
+        allow_origin = b"*" if self.allow_any_origin else origin
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"access-control-allow-origin", allow_origin), *self.preflight_headers],
+        })
+        await send({"type": "http.response.body", "body": b""})
+        return True
+
+    async def _health(self, scope: Scope, send: Send, head: bool) -> None:
+        headers = self.health_headers
+        for name, value in scope["headers"]:
+            if name == b"origin" and self._origin_allowed(value):
+                allow_origin = b"*" if self.allow_any_origin else value
+                headers = [*headers, (b"access-control-allow-origin", allow_origin), (b"vary", b"Origin")]
+                break
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"" if head else HEALTH_BODY})
@@ -0,0 +1,99 @@
+# middleware/profiling.py
+import logging
+import os
+import re
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.profiling import SamplingProfiler, folded
+from core.security import verify_profiling_token
+
+log = logging.getLogger("app.profiling")
+
+PROFILE_HEADER = b"x-profile-token"
+# Request ids may come from the client (X-Request-ID); only safe ones name files
+_SAFE_ID = re.compile(r"[A-Za-z0-9_-]{1,128}")
+
+
+class ProfilingMiddleware:
+    """Profile single requests on demand.
+
+    A request with a valid X-Profile-Token header runs under a
+    SamplingProfiler; when it completes, the folded stacks are logged with
+    the request id ("app.profiling", extra `profile`) or, if `output` is a
+    directory, written to <request id>.folded there. Other requests only pay
+    for the header lookup. An invalid token is logged and the request is
+    served unprofiled.
+
+    Samples cover every busy thread of the process, which for Lambda (one
+    request per sandbox) is exactly this request's work.
+    """
+
+    def __init__(self, app: ASGIApp, interval: float = 0.002, output: str = "log",
+                 max_stacks: int | None = 500):
+        self.app = app
+        self.interval = interval
+        self.output = output
+        self.max_stacks = max_stacks
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = next((v for k, v in scope["headers"] if k == PROFILE_HEADER), None)
+        if token is None:
+            await self.app(scope, receive, send)
+            return
+        if verify_profiling_token(token.decode("latin-1")) is None:
+            log.warning("Invalid profiling token", extra={"path": scope["path"], "method": scope["method"]})
+            await self.app(scope, receive, send)
+            return
+        await self._profiled(scope, receive, send)
+
+    async def _profiled(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = {"status_code": None, "request_id": None}
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response["status_code"] = message["status"]
+                for key, value in message.get("headers", ()):
+                    if key.lower() == b"x-request-id":
+                        response["request_id"] = value.decode("latin-1")
+            await send(message)
+
+        profiler = SamplingProfiler(interval=self.interval, fine=True).start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            duration_ms = int((time.perf_counter() - start) * 1000)
+            self._emit(scope, response, duration_ms, profiler)
+
+    def _emit(self, scope: Scope, response: dict, duration_ms: int, profiler: SamplingProfiler) -> None:
+        request_id = response["request_id"]
+        if not request_id or not _SAFE_ID.fullmatch(request_id):
+            request_id = f"profile-{int(time.time() * 1000)}"
+        text = folded(profiler.counts, self.max_stacks)
+        extra = {
+            "request_id": request_id,
+            "method": scope["method"],
+            "path": scope["path"],
+            "status_code": response["status_code"],
+            "duration_ms": duration_ms,
+            "profile_samples": profiler.samples,
+        }
+        if self.output == "log":
+            extra["profile"] = text
+        else:
+            try:
+                os.makedirs(self.output, exist_ok=True)
+                path = os.path.join(self.output, f"{request_id}.folded")
+                with open(path, "w") as f:
+                    f.write(text)
+                extra["profile_file"] = path
+            except OSError:
+                log.warning("Could not write profile; logging it instead", exc_info=True)
+                extra["profile"] = text
+        log.info("Request profile", extra=extra)
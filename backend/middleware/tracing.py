@@ -0,0 +1,56 @@
+# middleware/tracing.py
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.tracing import activate, start_trace
+
+TRACEPARENT_HEADER = b"traceparent"
+
+
+class TracingMiddleware:
+    """Root span per request.
+
+    Continues the caller's trace when the request carries a valid W3C
+    `traceparent` (honoring its sampled flag), else starts one sampled at
+    `sample_rate`. The span is named "<method> <route template>" once routing
+    is done and ends after the last body chunk; the response carries a
+    `traceparent` naming it, so clients can find their trace.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 1.0):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        traceparent = next((v for k, v in scope["headers"] if k == TRACEPARENT_HEADER), None)
+        root = start_trace(
+            f"{scope['method']} {scope['path']}",
+            traceparent.decode("latin-1") if traceparent is not None else None,
+            self.sample_rate,
+            **{"http.method": scope["method"], "http.path": scope["path"]},
+        )
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                root.attributes["http.status_code"] = message["status"]
+                if message["status"] >= 500:
+                    root.error = str(message["status"])
+                headers = list(message.get("headers", ()))
+                headers.append((TRACEPARENT_HEADER, root.traceparent().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            with activate(root):
+                await self.app(scope, receive, send_wrapper)
+        except BaseException as exc:
+            root.error = type(exc).__name__
+            raise
+        finally:
+            route = scope.get("route")
+            if route is not None:
+                root.name = f"{scope['method']} {route.path}"
+                root.attributes["http.route"] = route.path
+            root.end()
@@ -0,0 +1,78 @@
+# routes/debug.py
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from core import memory
+from core.config import PROFILE_MAX_STACKS
+from core.profiling import continuous_profiler, folded
+from dependencies import require_profiling_token
+
+debug_router = APIRouter(dependencies=[Depends(require_profiling_token)])
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="seconds")
+
+
+@debug_router.get("/profile/")
+def read_profile(windows: Optional[int] = Query(None, ge=0, description="closed windows to include (default all)"),
+                 format: Literal["folded", "json"] = "folded",
+                 download: bool = False):
+    profiler = continuous_profiler()
+    if profiler is None:
+        raise HTTPException(status_code=404, detail="Continuous profiling is not enabled")
+
+    snapshot = profiler.snapshot(last=windows)
+    if format == "json":
+        return {
+            "start": _iso(snapshot["start"]),
+            "end": _iso(snapshot["end"]),
+            "samples": snapshot["samples"],
+            "windows": snapshot["windows"],
+            "interval_ms": profiler.interval * 1000,
+            "stacks": [{"stack": list(stack), "count": count}
+                       for stack, count in snapshot["counts"].most_common(PROFILE_MAX_STACKS)],
+        }
+
+    headers = {
+        "X-Profile-Samples": str(snapshot["samples"]),
+        "X-Profile-Start": _iso(snapshot["start"]),
+        "X-Profile-End": _iso(snapshot["end"]),
+    }
+    if download:
+        stamp = datetime.fromtimestamp(snapshot["end"], timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        headers["Content-Disposition"] = f'attachment; filename="profile-{stamp}.folded"'
+    return PlainTextResponse(folded(snapshot["counts"], PROFILE_MAX_STACKS), headers=headers)
+
+
+def _require_tracing() -> None:
+    if not memory.tracing():
+        raise HTTPException(status_code=404, detail="Memory profiling is not enabled")
+
+
+@debug_router.get("/memory/")
+def read_memory():
+    _require_tracing()
+    current, peak = tracemalloc.get_traced_memory()
+    return {"traced_bytes": current, "traced_peak_bytes": peak, "routes": memory.route_stats()}
+
+
+@debug_router.post("/memory/snapshot/")
+def take_memory_snapshot():
+    """Baseline for /memory/diff/; take it, send traffic, then diff."""
+    _require_tracing()
+    return memory.mark()
+
+
+@debug_router.get("/memory/diff/")
+def read_memory_diff(top: int = Query(20, ge=1, le=200),
+                     group: Literal["lineno", "filename", "traceback"] = "lineno"):
+    _require_tracing()
+    result = memory.diff(top=top, group=group)
+    if result is None:
+        raise HTTPException(status_code=409, detail="No memory snapshot; POST /memory/snapshot/ first")
+    return result
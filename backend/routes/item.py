@@ -1,20 +1,79 @@
-from fastapi import APIRouter, Depends
-from schemas.item import ItemCreate, ItemRead, ItemUpdate
+from typing import Annotated, Literal
+
+from anyio import from_thread
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from schemas.item import ItemCreate, ItemRead, ItemUpdate, ItemListQuery, ItemExportQuery, ItemPartial, ItemCount, ItemImportReport
 from schemas.user import UserRead
-from crud.item import create_item, get_items, update_item, delete_item
+from core.lambda_stream import STREAMING_SCOPE_KEY
+from core.serialization import FastJSONResponse, trusted_item, trusted_items, ndjson_stream, json_array_stream
+from crud.item import create_item, get_items, iter_items, iter_item_pages, count_items, update_item, delete_item
+from crud.item_import import import_items, iter_lines
 from dependencies import get_current_user
 
 item_router = APIRouter()
 
-@item_router.post("/create/", response_model=ItemRead)
+@item_router.post("/create/", response_model=ItemRead, response_class=FastJSONResponse)
 def create_new_item(item: ItemCreate,
     current_user: UserRead = Depends(get_current_user)):
-    return create_item(item, current_user)
+    return FastJSONResponse(trusted_item(create_item(item, current_user)))
+
+
+# Items come straight from our own table, so they are projected to the
+# response fields and encoded without re-validation; ItemPartial documents
+# the shape (only requested fields are present when ?fields= is given)
+@item_router.get("/read/", response_model=list[ItemPartial], response_class=FastJSONResponse)
+def read_items(request: Request,
+    query: Annotated[ItemListQuery, Query()],
+    current_user: UserRead = Depends(get_current_user)):
+    if request.scope.get(STREAMING_SCOPE_KEY):
+        # Lambda response streaming: send each DynamoDB page as it arrives
+        return StreamingResponse(
+            json_array_stream(iter_items(current_user, query), query.fields),
+            media_type="application/json",
+        )
+    return FastJSONResponse(trusted_items(get_items(current_user, query), query.fields))
+
+
+@item_router.get("/export/", response_class=StreamingResponse)
+def export_items(query: Annotated[ItemExportQuery, Query()],
+    current_user: UserRead = Depends(get_current_user)):
+    # NDJSON, streamed as each DynamoDB page arrives
+    pages = iter_item_pages(current_user, query.fields)
+    headers = {"Content-Encoding": "gzip", "Vary": "Accept-Encoding"} if query.gzip else None
+    return StreamingResponse(
+        ndjson_stream(pages, query.fields, gzip=query.gzip),
+        media_type="application/x-ndjson",
+        headers=headers,
+    )
 
 
-@item_router.get("/read/", response_model=list[ItemRead])
-def read_items(current_user: UserRead = Depends(get_current_user)):
-    return get_items(current_user)
+@item_router.post("/import/", response_model=ItemImportReport)
+async def import_items_upload(request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    offset: int = Query(0, ge=0),
+    current_user: UserRead = Depends(get_current_user)):
+    # The body is NDJSON or CSV (with a name,description header). Rows are
+    # validated and written in concurrent batches as they are parsed, and
+    # the body is read only as fast as batches complete.
+    stream = request.stream()
+
+    def body_chunks():
+        # Runs in the worker thread: pull each chunk from the event loop
+        while True:
+            try:
+                yield from_thread.run(stream.__anext__)
+            except StopAsyncIteration:
+                return
+
+    return await run_in_threadpool(import_items, iter_lines(body_chunks()), format, current_user, offset)
+
+
+@item_router.get("/count/", response_model=ItemCount)
+def read_item_count(mode: Literal["query", "cached"] = "query",
+    current_user: UserRead = Depends(get_current_user)):
+    return count_items(current_user, mode)
 
 
 @item_router.put("/update/{item_id}", response_model=ItemRead)
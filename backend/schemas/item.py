@@ -1,20 +1,119 @@
 # item.py
-from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from typing import Literal, Optional
+from datetime import datetime, timezone
+
+# name is the range key of owner-name-index: non-empty, and DynamoDB caps
+# range key values at 1024 bytes (UTF-8)
+NAME_MAX_BYTES = 1024
+
+def _name_fits_index_key(value: Optional[str]) -> Optional[str]:
+    if value is not None and len(value.encode("utf-8")) > NAME_MAX_BYTES:
+        raise ValueError(f"name must be at most {NAME_MAX_BYTES} bytes (UTF-8)")
+    return value
 
 class ItemBase(BaseModel):
-    name: str
+    name: str = Field(..., min_length=1)
     description: str
 
     model_config = ConfigDict(from_attributes=True)
 
 class ItemCreate(ItemBase):
-    pass
+    @field_validator("name")
+    @classmethod
+    def name_fits(cls, value):
+        return _name_fits_index_key(value)
 
 class ItemRead(ItemBase):
     id: str
     owner_id: str
 
 class ItemUpdate(BaseModel):
-    name: Optional[str]
-    description: Optional[str]
\ No newline at end of file
+    # Both keys are required, as before; a null value leaves that field
+    # unchanged (name cannot be stored as NULL: it is an index key)
+    name: Optional[str] = Field(..., min_length=1)
+    description: Optional[str]
+
+    @field_validator("name")
+    @classmethod
+    def name_fits(cls, value):
+        return _name_fits_index_key(value)
+
+class ItemPartial(BaseModel):
+    # Response shape for projected reads (?fields=); unset fields are omitted
+    id: Optional[str] = None
+    owner_id: Optional[str] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+
+ITEM_FIELDS = tuple(ItemPartial.model_fields)
+
+class ItemFieldsQuery(BaseModel):
+    fields: Optional[tuple[str, ...]] = None
+
+    @field_validator("fields", mode="before")
+    @classmethod
+    def split_fields(cls, value):
+        # Accept ?fields=id,name as well as repeated ?fields= params
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = [value]
+        names = tuple(dict.fromkeys(n.strip() for v in value for n in v.split(",") if n.strip()))
+        unknown = [n for n in names if n not in ITEM_FIELDS]
+        if unknown or not names:
+            raise ValueError(f"fields must be a comma-separated subset of {', '.join(ITEM_FIELDS)}")
+        return names
+
+    # Frozen so it is hashable and can key single-flight reads
+    model_config = ConfigDict(frozen=True)
+
+class ItemListQuery(ItemFieldsQuery):
+    sort: Literal["created", "name"] = "created"
+    order: Literal["asc", "desc"] = "asc"
+    limit: Optional[int] = Field(None, ge=1, le=1000)
+    name_prefix: Optional[str] = Field(None, min_length=1)
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+    @field_validator("name_prefix")
+    @classmethod
+    def prefix_fits(cls, value):
+        return _name_fits_index_key(value)
+
+    @field_validator("created_after", "created_before")
+    @classmethod
+    def as_utc(cls, value):
+        # The window maps onto UUIDv7 ids, whose timestamps start at 1970;
+        # naive datetimes are UTC, as in core.ids
+        if value is not None:
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            if value.timestamp() < 0:
+                raise ValueError("must not be before 1970-01-01T00:00:00Z")
+        return value
+
+    @model_validator(mode="after")
+    def ordered_window(self):
+        if self.created_after and self.created_before and self.created_after > self.created_before:
+            raise ValueError("created_after must not be later than created_before")
+        return self
+
+class ItemExportQuery(ItemFieldsQuery):
+    gzip: bool = False
+
+class ItemCount(BaseModel):
+    count: int
+    # "query": counted with Select=COUNT; "counter": maintained item_count
+    source: Literal["query", "counter"]
+
+class ItemImportRowError(BaseModel):
+    row: int
+    error: str
+
+class ItemImportReport(BaseModel):
+    imported: int
+    failed: list[ItemImportRowError]
+    # Rows up to here are written or listed in `failed`; pass it back as
+    # ?offset= to resume an interrupted import
+    checkpoint: int
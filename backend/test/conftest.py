@@ -1,18 +1,19 @@
-import boto3
 import pytest
 import os
 from botocore.exceptions import ClientError
 
+# Tests run against the in-process emulator unless LOCAL_TESTING=1 points
+# them at DynamoDB Local (Docker, localhost:8000). Set before the app's
+# modules are imported, since db.py connects at import time
+if os.getenv("LOCAL_TESTING") != "1":
+    os.environ.setdefault("DYNAMODB_EMULATOR", "1")
+os.environ.setdefault("USERS_TABLE", "users")
+os.environ.setdefault("ITEMS_TABLE", "items")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_dynamodb():
-    os.environ["LOCAL_TESTING"] = "1"
-
-    # Connect to DynamoDB Local (running in Docker)
-    dynamodb = boto3.resource(
-        "dynamodb",
-        endpoint_url="http://localhost:8000",  # docker container mapped to host
-        region_name="us-east-1",
-    )
+    from db import dynamodb
 
     def create_table_if_not_exists(table_name, key_schema, attribute_definitions, global_secondary_indexes=None):
         try:
@@ -63,12 +64,28 @@ def setup_dynamodb():
         key_schema=[{"AttributeName": "id", "KeyType": "HASH"}],
         attribute_definitions=[
             {"AttributeName": "id", "AttributeType": "S"},
-            {"AttributeName": "owner_id", "AttributeType": "S"}
+            {"AttributeName": "owner_id", "AttributeType": "S"},
+            {"AttributeName": "name", "AttributeType": "S"}
         ],
         global_secondary_indexes=[
             {
-                "IndexName": "owner-id-index",
-                "KeySchema": [{"AttributeName": "owner_id", "KeyType": "HASH"}],
+                "IndexName": "owner-created-index",
+                "KeySchema": [
+                    {"AttributeName": "owner_id", "KeyType": "HASH"},
+                    {"AttributeName": "id", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+                "ProvisionedThroughput": {
+                    "ReadCapacityUnits": 5,
+                    "WriteCapacityUnits": 5,
+                },
+            },
+            {
+                "IndexName": "owner-name-index",
+                "KeySchema": [
+                    {"AttributeName": "owner_id", "KeyType": "HASH"},
+                    {"AttributeName": "name", "KeyType": "RANGE"},
+                ],
                 "Projection": {"ProjectionType": "ALL"},
                 "ProvisionedThroughput": {
                     "ReadCapacityUnits": 5,
@@ -0,0 +1,107 @@
+import base64
+import gzip
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from mangum import Mangum
+
+import middleware.compression
+from middleware.compression import CompressionMiddleware, choose_encoding
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+
+@app.get("/big")
+def big():
+    return JSONResponse([{"name": f"item {i}"} for i in range(50)])
+
+
+@app.get("/small")
+def small():
+    return JSONResponse({"ok": True})
+
+
+@app.get("/text")
+def text():
+    return PlainTextResponse("x" * 1000)
+
+
+@app.get("/stream")
+def stream():
+    return StreamingResponse((b'{"n": %d}\n' % i for i in range(100)), media_type="application/x-ndjson")
+
+
+client = TestClient(app)
+
+
+def raw_get(path, accept_encoding="gzip"):
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_large_json_is_gzipped():
+    response, body = raw_get("/big")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(body)
+    assert gzip.decompress(body) == client.get("/big", headers={"Accept-Encoding": "identity"}).content
+
+
+def test_small_and_non_json_bodies_are_untouched():
+    for path in ("/small", "/text"):
+        response, _ = raw_get(path)
+        assert "content-encoding" not in response.headers
+
+
+def test_identity_clients_get_plain_responses():
+    response, _ = raw_get("/big", accept_encoding="gzip;q=0, identity")
+
+    assert "content-encoding" not in response.headers
+
+
+def test_refused_coding_is_not_overridden_by_wildcard():
+    response, _ = raw_get("/big", accept_encoding="gzip;q=0, *")
+
+    assert "content-encoding" not in response.headers
+
+
+def test_choose_encoding_prefers_by_q(monkeypatch):
+    monkeypatch.setattr(middleware.compression, "brotli", object())
+
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("gzip;q=1, br;q=0.5") == "gzip"
+    assert choose_encoding("br;q=0, *;q=0.1") == "gzip"
+    assert choose_encoding("gzip;level=9;q=0.4, identity;q=0.8") is None
+    assert choose_encoding("gzip;q=bad") is None
+
+
+def test_streaming_ndjson_is_compressed_chunk_by_chunk():
+    response, body = raw_get("/stream")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(body).count(b"\n") == 100
+
+
+def test_mangum_returns_compressed_body_base64_encoded():
+    handler = Mangum(app, lifespan="off")
+    event = {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": "/big",
+        "rawQueryString": "",
+        "headers": {"accept-encoding": "gzip", "host": "example.com"},
+        "requestContext": {
+            "http": {"method": "GET", "path": "/big", "protocol": "HTTP/1.1", "sourceIp": "127.0.0.1"},
+            "stage": "$default",
+        },
+        "isBase64Encoded": False,
+    }
+
+    result = handler(event, {})
+
+    assert result["isBase64Encoded"] is True
+    assert gzip.decompress(base64.b64decode(result["body"])).startswith(b'[{"name":"item 0"}')
@@ -0,0 +1,107 @@
+import logging
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core import ddb_calls
+from main import app
+
+client = TestClient(app)
+
+# DynamoDB calls each endpoint may make; every authenticated request pays
+# one GetItem on users for get_current_user
+BUDGETS = {
+    "create": {"users GetItem": 1, "items PutItem": 1},
+    "list": {"users GetItem": 1, "items.owner-created-index Query": 1},
+    "update": {"users GetItem": 1, "items GetItem": 1, "items UpdateItem": 1},
+    "delete": {"users GetItem": 1, "items GetItem": 1, "items DeleteItem": 1},
+    "profile": {"users GetItem": 1},
+}
+
+
+@pytest.fixture(scope="module")
+def headers():
+    credentials = {"username": "ddb-calls", "password": "password123"}
+    client.post("/api/user/register/", json=credentials)
+    token = client.post("/api/user/login/", json=credentials).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _calls(send) -> ddb_calls.RequestCalls:
+    with ddb_calls.capture() as finished:
+        send()
+    (calls,) = finished
+    return calls
+
+
+def test_endpoint_call_budgets(headers):
+    created = _calls(lambda: client.post("/api/item/create/", json={"name": "n", "description": "d"},
+                                         headers=headers))
+    item_id = client.get("/api/item/read/", headers=headers).json()[0]["id"]
+    requests = {
+        "create": created,
+        "list": _calls(lambda: client.get("/api/item/read/", headers=headers)),
+        "update": _calls(lambda: client.put(f"/api/item/update/{item_id}", json={"name": "m", "description": "d"},
+                                            headers=headers)),
+        "delete": _calls(lambda: client.delete(f"/api/item/delete/{item_id}", headers=headers)),
+        "profile": _calls(lambda: client.get("/api/user/profile/", headers=headers)),
+    }
+    for name, calls in requests.items():
+        assert dict(calls.by_operation()) == BUDGETS[name], name
+        assert all(call.duration_ms is not None for call in calls.calls)
+
+
+def test_repeated_key_warns_once_per_route(headers, caplog):
+    ddb_calls.reset_warnings()
+    item_id = client.post("/api/item/create/", json={"name": "n", "description": "d"}, headers=headers).json()["id"]
+    with caplog.at_level(logging.WARNING, logger="app.ddb"):
+        calls = _calls(lambda: client.put(f"/api/item/update/{item_id}", json={"name": "a", "description": "d"},
+                                          headers=headers))
+        client.put(f"/api/item/update/{item_id}", json={"name": "b", "description": "d"}, headers=headers)
+
+    (repeat,) = calls.repeated_keys()
+    assert repeat["table"] == "items" and repeat["operations"] == ["GetItem", "UpdateItem"]
+    assert repeat["key"].startswith("id#") and item_id not in repeat["key"]
+    (record,) = [r for r in caplog.records if r.name == "app.ddb"]
+    assert record.getMessage() == "Repeated DynamoDB key lookup"
+    assert record.path == "PUT /api/item/update/{item_id}"
+
+
+def test_call_budget_and_outside_requests():
+    from db import user_table
+
+    ddb_calls.reset_warnings()
+    user_table.get_item(Key={"id": "untracked"})  # no request: not recorded
+    with ddb_calls.track(route="GET /test", max_calls=1) as calls:
+        user_table.get_item(Key={"id": "a"})
+        user_table.get_item(Key={"id": "a"})
+    assert calls.count("GetItem", "users") == 2 and len(calls.repeated_keys()) == 1
+    assert ddb_calls.current_calls() is None
+
+
+def test_hedged_duplicates_are_not_counted_as_calls(headers, monkeypatch):
+    import db
+    from core.hedging import HedgedReader
+
+    def slow_primary(context=None, **kwargs):
+        if not (context or {}).get("hedge"):
+            time.sleep(0.05)
+
+    reader = HedgedReader(max_delay=0.01, budget_ratio=1.0)
+    reader.install(db.dynamodb_client)
+    events = db.dynamodb_client.meta.events
+    events.register("before-call.dynamodb", slow_primary, unique_id="test-slow-primary")
+    monkeypatch.setattr(db, "hedged_reader", reader)
+    try:
+        item_id = client.post("/api/item/create/", json={"name": "n", "description": "d"},
+                              headers=headers).json()["id"]
+        calls = _calls(lambda: client.put(f"/api/item/update/{item_id}", json={"name": "h", "description": "d"},
+                                          headers=headers))
+    finally:
+        events.unregister("before-call.dynamodb", unique_id="test-slow-primary")
+        events.unregister("before-parameter-build.dynamodb", unique_id="hedge-mark")
+
+    assert reader.stats["hedged"] >= 1 and calls.hedges >= 1
+    assert dict(calls.by_operation()) == BUDGETS["update"]
+    assert [entry["operations"] for entry in calls.repeated_keys()] == [["GetItem", "UpdateItem"]]
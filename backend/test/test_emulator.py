@@ -0,0 +1,191 @@
+import boto3
+import pytest
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+
+from emulator import DynamoDBEmulator
+
+
+@pytest.fixture
+def emulator():
+    return DynamoDBEmulator()
+
+
+@pytest.fixture
+def ddb(emulator):
+    resource = boto3.resource(
+        "dynamodb", region_name="us-east-1", endpoint_url="http://dynamodb.emulator",
+        aws_access_key_id="x", aws_secret_access_key="x",
+    )
+    emulator.install(resource.meta.client)
+    resource.create_table(
+        TableName="items",
+        KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+        AttributeDefinitions=[
+            {"AttributeName": "id", "AttributeType": "S"},
+            {"AttributeName": "owner_id", "AttributeType": "S"},
+            {"AttributeName": "name", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexes=[{
+            "IndexName": "owner-name-index",
+            "KeySchema": [{"AttributeName": "owner_id", "KeyType": "HASH"},
+                          {"AttributeName": "name", "KeyType": "RANGE"}],
+            "Projection": {"ProjectionType": "ALL"},
+        }],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    return resource
+
+
+def error_code(exc_info) -> str:
+    return exc_info.value.response["Error"]["Code"]
+
+
+def test_put_get_update_delete_with_conditions(ddb):
+    table = ddb.Table("items")
+    table.put_item(Item={"id": "1", "owner_id": "u", "name": "a", "qty": 1})
+
+    with pytest.raises(ClientError) as exc:
+        table.put_item(Item={"id": "1", "owner_id": "u", "name": "b"},
+                       ConditionExpression="attribute_not_exists(id)")
+    assert error_code(exc) == "ConditionalCheckFailedException"
+
+    updated = table.update_item(
+        Key={"id": "1"},
+        UpdateExpression="SET qty = qty + :one, tags = list_append(if_not_exists(tags, :empty), :tag) REMOVE #n",
+        ExpressionAttributeNames={"#n": "name"},
+        ExpressionAttributeValues={":one": 1, ":empty": [], ":tag": ["x"]},
+        ReturnValues="ALL_NEW",
+    )["Attributes"]
+    assert updated == {"id": "1", "owner_id": "u", "qty": 2, "tags": ["x"]}
+
+    with pytest.raises(ClientError) as exc:
+        table.update_item(Key={"id": "1"}, UpdateExpression="SET id = :v",
+                          ExpressionAttributeValues={":v": "2"})
+    assert error_code(exc) == "ValidationException"
+
+    old = table.delete_item(Key={"id": "1"}, ReturnValues="ALL_OLD")["Attributes"]
+    assert old["qty"] == 2
+    assert "Item" not in table.get_item(Key={"id": "1"})
+
+
+def test_rejects_invalid_requests(ddb):
+    table = ddb.Table("items")
+    with pytest.raises(ClientError) as exc:
+        table.put_item(Item={"id": ""})
+    assert error_code(exc) == "ValidationException"
+    with pytest.raises(ClientError) as exc:
+        table.put_item(Item={"id": "1", "name": ""})  # empty GSI key
+    assert error_code(exc) == "ValidationException"
+    with pytest.raises(ClientError) as exc:
+        table.get_item(Key={"id": "1"}, ExpressionAttributeNames={"#unused": "name"},
+                       ProjectionExpression="id")
+    assert error_code(exc) == "ValidationException"
+    with pytest.raises(ClientError) as exc:
+        table.put_item(Item={"id": "1", "blob": "x" * 410_000})
+    assert error_code(exc) == "ValidationException"
+
+
+def test_query_gsi_pages_in_range_key_order(ddb, emulator):
+    table = ddb.Table("items")
+    for i, name in enumerate(["delta", "alpha", "charlie", "bravo", "echo"]):
+        table.put_item(Item={"id": str(i), "owner_id": "u", "name": name})
+    table.put_item(Item={"id": "x", "owner_id": "other", "name": "alpha"})
+    table.put_item(Item={"id": "y", "owner_id": "u"})  # not in the sparse index
+
+    names, kwargs, pages = [], {}, 0
+    while True:
+        page = table.query(IndexName="owner-name-index", Limit=2,
+                           KeyConditionExpression=Key("owner_id").eq("u"), **kwargs)
+        names += [item["name"] for item in page["Items"]]
+        pages += 1
+        if "LastEvaluatedKey" not in page:
+            break
+        assert set(page["LastEvaluatedKey"]) == {"id", "owner_id", "name"}
+        kwargs["ExclusiveStartKey"] = page["LastEvaluatedKey"]
+    assert names == ["alpha", "bravo", "charlie", "delta", "echo"]
+    assert pages == 3
+
+    page = table.query(IndexName="owner-name-index", ScanIndexForward=False,
+                       KeyConditionExpression=Key("owner_id").eq("u") & Key("name").begins_with("c"),
+                       FilterExpression=Attr("id").ne("9"))
+    assert [item["name"] for item in page["Items"]] == ["charlie"]
+
+    count = table.query(IndexName="owner-name-index", Select="COUNT",
+                        KeyConditionExpression=Key("owner_id").eq("u"))
+    assert count["Count"] == 5 and "Items" not in count
+
+    emulator.page_bytes = 1
+    page = table.query(IndexName="owner-name-index", KeyConditionExpression=Key("owner_id").eq("u"))
+    assert len(page["Items"]) == 1 and "LastEvaluatedKey" in page
+
+
+def test_batch_write_is_validated_before_applying(ddb):
+    client = ddb.meta.client  # maps Python <-> DynamoDB types, like db.dynamodb_client
+    with pytest.raises(ClientError) as exc:
+        client.batch_write_item(RequestItems={"items": [
+            {"PutRequest": {"Item": {"id": "1"}}},
+            {"DeleteRequest": {"Key": {"id": "1"}}},
+        ]})
+    assert error_code(exc) == "ValidationException"
+    assert "Item" not in ddb.Table("items").get_item(Key={"id": "1"})
+
+    client.batch_write_item(RequestItems={"items": [
+        {"PutRequest": {"Item": {"id": str(i)}}} for i in range(25)
+    ]})
+    got = client.batch_get_item(RequestItems={"items": {"Keys": [{"id": "3"}, {"id": "99"}]}})
+    assert got["Responses"]["items"] == [{"id": "3"}]
+
+
+def test_transaction_is_all_or_nothing(ddb):
+    client = ddb.meta.client
+    client.put_item(TableName="items", Item={"id": "a", "n": 1})
+
+    with pytest.raises(ClientError) as exc:
+        client.transact_write_items(TransactItems=[
+            {"Put": {"TableName": "items", "Item": {"id": "b"}}},
+            {"Update": {"TableName": "items", "Key": {"id": "a"},
+                        "UpdateExpression": "SET n = n + :one",
+                        "ConditionExpression": "n > :one",
+                        "ExpressionAttributeValues": {":one": 1},
+                        "ReturnValuesOnConditionCheckFailure": "ALL_OLD"}},
+        ])
+    assert error_code(exc) == "TransactionCanceledException"
+    reasons = exc.value.response["CancellationReasons"]
+    assert [r["Code"] for r in reasons] == ["None", "ConditionalCheckFailed"]
+    assert reasons[1]["Item"] == {"id": {"S": "a"}, "n": {"N": "1"}}  # errors are not deserialized
+    assert "Item" not in client.get_item(TableName="items", Key={"id": "b"})
+
+    with pytest.raises(ClientError) as exc:
+        client.transact_write_items(TransactItems=[
+            {"Put": {"TableName": "items", "Item": {"id": "a"}}},
+            {"Delete": {"TableName": "items", "Key": {"id": "a"}}},
+        ])
+    assert error_code(exc) == "ValidationException"
+
+    response = client.transact_write_items(ReturnConsumedCapacity="TOTAL", TransactItems=[
+        {"Put": {"TableName": "items", "Item": {"id": "b"}}},
+        {"Update": {"TableName": "items", "Key": {"id": "a"},
+                    "UpdateExpression": "SET n = n + :one",
+                    "ExpressionAttributeValues": {":one": 1}}},
+    ])
+    assert response["ConsumedCapacity"] == [{"TableName": "items", "CapacityUnits": 4.0}]
+    got = client.transact_get_items(TransactItems=[{"Get": {"TableName": "items", "Key": {"id": "a"}}}])
+    assert got["Responses"][0]["Item"]["n"] == 2
+
+
+def test_consumed_capacity(ddb, emulator):
+    table = ddb.Table("items")
+    put = table.put_item(Item={"id": "1", "owner_id": "u", "name": "n", "body": "x" * 3000},
+                         ReturnConsumedCapacity="INDEXES")["ConsumedCapacity"]
+    assert put["Table"] == {"CapacityUnits": 3.0}
+    assert put["GlobalSecondaryIndexes"] == {"owner-name-index": {"CapacityUnits": 3.0}}
+    assert put["CapacityUnits"] == 6.0
+
+    read = table.get_item(Key={"id": "1"}, ReturnConsumedCapacity="TOTAL")["ConsumedCapacity"]
+    assert read["CapacityUnits"] == 0.5
+    read = table.get_item(Key={"id": "1"}, ConsistentRead=True, ReturnConsumedCapacity="TOTAL")["ConsumedCapacity"]
+    assert read["CapacityUnits"] == 1.0
+
+    assert emulator.consumed["items"] == {"read": 1.5, "write": 6.0}
+    assert emulator.calls["PutItem"] == 1 and emulator.calls["GetItem"] == 2
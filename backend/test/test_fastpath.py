@@ -0,0 +1,38 @@
+import logging
+
+from fastapi.testclient import TestClient
+
+from main import app
+
+client = TestClient(app)
+
+PREFLIGHT = {
+    "Origin": "http://localhost:5500",
+    "Access-Control-Request-Method": "POST",
+    "Access-Control-Request-Headers": "content-type, authorization",
+}
+
+
+def test_preflight_is_answered_without_logging(caplog):
+    with caplog.at_level(logging.INFO, logger="app.request"):
+        response = client.options("/api/item/create/", headers=PREFLIGHT)
+
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "http://localhost:5500"
+    assert response.headers["access-control-max-age"] == "86400"
+    assert not [r for r in caplog.records if r.name.startswith("app.")]
+
+
+def test_disallowed_preflight_falls_through_to_cors():
+    response = client.options("/api/item/create/", headers={**PREFLIGHT, "Origin": "https://evil.example"})
+
+    assert response.status_code == 400
+
+
+def test_health_is_answered_directly(caplog):
+    with caplog.at_level(logging.INFO, logger="app.request"):
+        response = client.get("/api/health")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+    assert not [r for r in caplog.records if r.name.startswith("app.")]
@@ -0,0 +1,142 @@
+import boto3
+import pytest
+from botocore.config import Config
+
+from core.faults import FaultInjector, fault_response, local_response, parse_fault_rates
+from core.governor import AdaptiveTokenBucket, CircuitBreaker, StorageGovernor, StorageUnavailable
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_bucket_backs_off_on_throttle_and_recovers():
+    clock = FakeClock()
+    bucket = AdaptiveTokenBucket(max_rate=100, min_rate=5, clock=clock, sleep=clock.sleep)
+
+    assert bucket.on_throttle()
+    assert not bucket.on_throttle()  # within cooldown: one burst counts once
+    assert bucket.rate == 50
+    clock.now += 1
+    bucket.on_throttle()
+    assert bucket.rate == 25
+
+    for _ in range(10_000):
+        bucket.on_success()
+    assert bucket.rate == 100
+
+
+def test_bucket_sheds_when_wait_exceeds_limit():
+    clock = FakeClock()
+    bucket = AdaptiveTokenBucket(max_rate=10, min_rate=1, burst=1, clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire(max_wait=0)
+    assert not bucket.acquire(max_wait=0.05)
+    assert bucket.acquire(max_wait=0.2)
+    assert clock.now == pytest.approx(0.1)
+
+
+def test_breaker_opens_half_opens_and_closes():
+    clock = FakeClock()
+    changes = []
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=5, clock=clock,
+                             on_change=lambda old, new: changes.append(new))
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+    assert breaker.retry_after() == 5
+
+    clock.now += 5
+    assert breaker.allow()       # the probe
+    assert not breaker.allow()   # only one probe at a time
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now += 5
+    assert breaker.allow()
+    breaker.record_success()
+    assert changes == ["open", "half_open", "open", "half_open", "closed"]
+
+
+def _ok(request, **kwargs):
+    return local_response(request.url, 200, b"{}")
+
+
+@pytest.fixture
+def governed_client():
+    clock = FakeClock()
+    client = boto3.client(
+        "dynamodb", region_name="us-east-1", endpoint_url="http://dynamodb.invalid",
+        aws_access_key_id="x", aws_secret_access_key="x",
+        config=Config(retries={"mode": "standard", "total_max_attempts": 1}),
+    )
+    client.meta.events.register("before-send.dynamodb", _ok)
+    governor = StorageGovernor(AdaptiveTokenBucket(max_rate=100, min_rate=5, clock=clock, sleep=clock.sleep),
+                               failure_threshold=3, reset_timeout=10, max_wait=0.1, clock=clock)
+    governor.install(client)
+    faults = FaultInjector()
+    faults.install(client)
+    return client, governor, faults, clock
+
+
+def test_governor_trips_on_injected_faults_and_recovers(governed_client):
+    client, governor, faults, clock = governed_client
+    faults.script = ["throttle", "error", "unavailable", "error"]
+
+    for _ in range(4):
+        with pytest.raises(client.exceptions.ClientError):
+            client.get_item(TableName="t", Key={"id": {"S": "1"}})
+    assert governor.breaker.state == CircuitBreaker.OPEN
+    assert governor.bucket.rate == 50
+
+    with pytest.raises(StorageUnavailable) as excinfo:
+        client.get_item(TableName="t", Key={"id": {"S": "1"}})
+    assert excinfo.value.retry_after == 10
+
+    clock.now += 10
+    client.get_item(TableName="t", Key={"id": {"S": "1"}})
+    assert governor.breaker.state == CircuitBreaker.CLOSED
+    assert governor.stats["breaker_opened"] == 1
+    assert governor.stats["rejected"] == 1
+
+
+def test_throttles_lower_the_rate_but_do_not_open_the_breaker(governed_client):
+    client, governor, faults, clock = governed_client
+    faults.script = ["throttle"] * 5
+
+    for _ in range(5):
+        clock.now += 1  # past the throttle cooldown
+        with pytest.raises(client.exceptions.ProvisionedThroughputExceededException):
+            client.get_item(TableName="t", Key={"id": {"S": "1"}})
+    assert governor.breaker.state == CircuitBreaker.CLOSED
+    assert governor.bucket.rate == 5
+    assert governor.stats["throttles"] == 5 and governor.stats["failures"] == 0
+
+
+def test_conditional_failures_do_not_count_against_the_breaker(governed_client):
+    client, governor, faults, clock = governed_client
+    client.meta.events.register_first(
+        "before-send.dynamodb",
+        lambda request, **kwargs: fault_response(request.url, 400, "ConditionalCheckFailedException"),
+    )
+
+    for _ in range(5):
+        with pytest.raises(client.exceptions.ConditionalCheckFailedException):
+            client.get_item(TableName="t", Key={"id": {"S": "1"}})
+    assert governor.stats["failures"] == 0
+    assert governor.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_parse_fault_rates():
+    assert parse_fault_rates("throttle=0.2, error=0.05") == {"throttle": 0.2, "error": 0.05}
+    with pytest.raises(ValueError):
+        parse_fault_rates("explode=1")
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+from core.hedging import HedgeBudget, HedgedReader, LatencyTracker
+
+
+def test_percentile_over_recent_samples():
+    tracker = LatencyTracker(window=100)
+    for ms in range(1, 201):
+        tracker.record(ms / 1000)
+
+    assert tracker.percentile(50) == pytest.approx(0.151)
+    assert tracker.percentile(99) == pytest.approx(0.2)
+
+
+def test_budget_caps_hedges_to_a_share_of_calls():
+    budget = HedgeBudget(ratio=0.25, burst=1)
+    spent = 0
+    for _ in range(100):
+        budget.earn()
+        spent += budget.spend()
+
+    assert spent == 25
+
+
+def test_slow_primary_is_hedged_and_first_answer_wins():
+    reader = HedgedReader(max_delay=0.01, budget_ratio=1.0)
+    calls = []
+    release = threading.Event()
+
+    def read():
+        calls.append(None)
+        if len(calls) == 1:
+            release.wait(1)  # the primary hangs
+            return "primary"
+        return "hedge"
+
+    try:
+        assert reader.call(read) == "hedge"
+    finally:
+        release.set()
+    assert reader.stats["hedged"] == 1
+    assert reader.stats["hedge_won"] == 1
+
+
+def test_fast_calls_are_not_hedged():
+    reader = HedgedReader(max_delay=0.5, budget_ratio=1.0)
+
+    assert reader.call(lambda: "ok") == "ok"
+    assert reader.stats["hedged"] == 0
+
+
+def test_over_budget_waits_for_the_primary():
+    reader = HedgedReader(max_delay=0.001, budget_ratio=0.0)
+
+    assert reader.call(lambda: time.sleep(0.02) or "primary") == "primary"
+    assert reader.stats["over_budget"] == 1
+
+
+def test_failed_attempt_falls_back_to_the_other():
+    reader = HedgedReader(max_delay=0.01, budget_ratio=1.0)
+    calls = []
+
+    def read():
+        calls.append(None)
+        if len(calls) == 1:
+            time.sleep(0.05)
+            return "primary"
+        raise RuntimeError("hedge failed")
+
+    assert reader.call(read) == "primary"
+
+
+def test_full_pool_runs_the_read_on_the_callers_thread():
+    reader = HedgedReader(max_delay=0.5, budget_ratio=1.0, max_workers=1)
+    release = threading.Event()
+    blocker = threading.Thread(target=reader.call, args=(lambda: release.wait(1),))
+    blocker.start()
+    time.sleep(0.05)
+    try:
+        assert reader.call(threading.current_thread) is threading.current_thread()
+    finally:
+        release.set()
+        blocker.join()
+    assert reader.stats["inline"] == 1
@@ -0,0 +1,25 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from core.ids import new_item_id, id_floor, id_ceiling, id_created_at
+
+
+def test_item_ids_are_uuid7_and_sort_in_creation_order():
+    ids = [new_item_id() for _ in range(2000)]
+
+    assert all(uuid.UUID(i).version == 7 for i in ids)
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_time_bounds_bracket_ids_minted_in_window():
+    before = datetime.now(timezone.utc) - timedelta(seconds=1)
+    item_id = new_item_id()
+    after = datetime.now(timezone.utc) + timedelta(seconds=1)
+
+    assert id_floor(before) <= item_id <= id_ceiling(after)
+    assert before <= id_created_at(item_id) <= after
+
+
+def test_legacy_uuid4_ids_have_no_creation_time():
+    assert id_created_at(str(uuid.uuid4())) is None
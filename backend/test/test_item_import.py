@@ -0,0 +1,79 @@
+import json
+import random
+import time
+
+from botocore.exceptions import ClientError
+
+import crud.item_import
+from crud.item_import import import_items, iter_lines
+from schemas.user import UserRead
+
+
+def _user(user_id: str) -> UserRead:
+    return UserRead(id=user_id, username=user_id)
+
+
+def _rows(names) -> list:
+    return [json.dumps({"name": name, "description": "d"}) + "\n" for name in names]
+
+
+def test_iter_lines_across_chunk_boundaries():
+    data = "﻿namé,description\r\nä,\"multi\nline\"\nlast".encode("utf-8")
+    chunks = [data[i:i + 1] for i in range(len(data))]
+    assert list(iter_lines(chunks)) == ["namé,description\r\n", "ä,\"multi\n", "line\"\n", "last"]
+    assert list(iter_lines([data])) == list(iter_lines(chunks))
+
+
+def test_unprocessed_rows_are_failed_not_imported(monkeypatch):
+    client = crud.item_import.dynamodb_client
+    real_batch_write = client.batch_write_item
+
+    def partial_batch_write(RequestItems):
+        (table, requests), = RequestItems.items()
+        stuck = [r for r in requests if r["PutRequest"]["Item"]["name"].startswith("stuck")]
+        if len(stuck) < len(requests):
+            real_batch_write(RequestItems={table: [r for r in requests if r not in stuck]})
+        return {"UnprocessedItems": {table: stuck} if stuck else {}}
+
+    monkeypatch.setattr(crud.item_import, "MAX_BATCH_ATTEMPTS", 2)
+    monkeypatch.setattr(client, "batch_write_item", partial_batch_write)
+    report = import_items(_rows(["ok 1", "stuck 2", "ok 3"]), "ndjson", _user("import-partial"))
+
+    assert report.imported == 2
+    assert [error.row for error in report.failed] == [2]
+    assert report.checkpoint == 3
+
+
+def test_counter_failure_does_not_fail_written_rows(monkeypatch):
+    def failing_update(**kwargs):
+        raise ClientError({"Error": {"Code": "InternalServerError", "Message": "boom"}}, "UpdateItem")
+
+    monkeypatch.setattr(crud.item_import, "ITEM_COUNTER_ENABLED", True)
+    monkeypatch.setattr(crud.item_import, "ensure_item_count", lambda owner_id: None)
+    monkeypatch.setattr(crud.item_import.user_table, "update_item", failing_update)
+    report = import_items(_rows(["a", "b"]), "ndjson", _user("import-counter"))
+
+    assert report.imported == 2 and report.failed == []
+
+
+def test_checkpoints_never_go_back_when_batches_finish_out_of_order(monkeypatch):
+    client = crud.item_import.dynamodb_client
+    real_batch_write = client.batch_write_item
+
+    def jittered_batch_write(RequestItems):
+        time.sleep(random.uniform(0, 0.01))
+        return real_batch_write(RequestItems=RequestItems)
+
+    saved = []
+
+    def save(value):
+        time.sleep(random.uniform(0, 0.003))  # widen the window between computing and saving
+        saved.append(value)
+
+    monkeypatch.setattr(crud.item_import, "BATCH_SIZE", 2)
+    monkeypatch.setattr(client, "batch_write_item", jittered_batch_write)
+    report = import_items(_rows([f"n{i}" for i in range(40)]), "ndjson", _user("import-order"),
+                          max_in_flight=8, on_checkpoint=save)
+
+    assert report.imported == 40 and report.checkpoint == 40
+    assert saved == sorted(saved) and saved[-1] == 40
@@ -1,3 +1,4 @@
+import json
 import pytest
 from fastapi.testclient import TestClient
 from main import app
@@ -13,13 +14,13 @@ def test_client():
 def auth_token(test_client):
     # Register user
     test_client.post(
-        "/user/register/",
+        "/api/user/register/",
         json={"username": "John", "password": "password123"}
     )
 
     # Login
     response = test_client.post(
-        "/user/login/",
+        "/api/user/login/",
         json={"username": "John", "password": "password123"}
     )
     assert response.status_code == 200
@@ -30,7 +31,7 @@ def auth_token(test_client):
 def created_item_id(test_client, auth_token):
     headers = {"Authorization": f"Bearer {auth_token}"}
     response = test_client.post(
-        "/item/create/",
+        "/api/item/create/",
         headers=headers,
         json={"name": "Test item", "description": "Test description"}
     )
@@ -49,7 +50,7 @@ def test_create_item(created_item_id):
 def test_update_item(test_client, auth_token, created_item_id):
     headers = {"Authorization": f"Bearer {auth_token}"}
     response = test_client.put(
-        f"/item/update/{created_item_id}",
+        f"/api/item/update/{created_item_id}",
         headers=headers,
         json={"name": "Updated Item", "description": "Updated Description"}
     )
@@ -64,7 +65,7 @@ def test_update_item(test_client, auth_token, created_item_id):
 
 def test_read_item(test_client, auth_token):
     headers = {"Authorization": f"Bearer {auth_token}"}
-    response = test_client.get("/item/read/", headers=headers)
+    response = test_client.get("/api/item/read/", headers=headers)
 
     print("Status:", response.status_code)
     print("Body:", response.json())
@@ -76,8 +77,210 @@ def test_read_item(test_client, auth_token):
 def test_delete_item(test_client, auth_token, created_item_id):
     headers = {"Authorization": f"Bearer {auth_token}"}
     response = test_client.delete(
-        f"/item/delete/{created_item_id}",
+        f"/api/item/delete/{created_item_id}",
         headers=headers
     )
 
     assert response.status_code == 204
+
+
+def test_read_items_sorted_by_name_with_prefix(test_client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    for name in ["Prefix b", "Prefix a", "Other"]:
+        test_client.post(
+            "/api/item/create/",
+            headers=headers,
+            json={"name": name, "description": "Sorted listing"}
+        )
+
+    response = test_client.get(
+        "/api/item/read/",
+        headers=headers,
+        params={"sort": "name", "name_prefix": "Prefix "}
+    )
+
+    assert response.status_code == 200
+    assert [item["name"] for item in response.json()] == ["Prefix a", "Prefix b"]
+
+
+def test_read_items_projects_requested_fields(test_client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    response = test_client.get(
+        "/api/item/read/",
+        headers=headers,
+        params={"fields": "id,name"}
+    )
+
+    assert response.status_code == 200
+    assert all(set(item) == {"id", "name"} for item in response.json())
+
+
+def test_count_items_matches_listing(test_client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    listed = test_client.get("/api/item/read/", headers=headers).json()
+
+    response = test_client.get("/api/item/count/", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json() == {"count": len(listed), "source": "query"}
+
+
+def test_export_items_streams_ndjson(test_client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    listed = test_client.get("/api/item/read/", headers=headers).json()
+
+    response = test_client.get("/api/item/export/", headers=headers, params={"gzip": "true"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert [item["id"] for item in exported] == [item["id"] for item in listed]
+
+
+def test_import_items_reports_bad_rows(test_client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    body = "\n".join([
+        json.dumps({"name": "Imported 1", "description": "From NDJSON"}),
+        "not json",
+        json.dumps({"name": "Imported 2"}),
+        json.dumps({"name": "Imported 3", "description": "From NDJSON"}),
+    ])
+
+    response = test_client.post("/api/item/import/", headers=headers, content=body)
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["imported"] == 2
+    assert [error["row"] for error in report["failed"]] == [2, 3]
+    assert report["checkpoint"] == 4
+
+
+def test_streamed_listing_matches_buffered_listing(test_client, auth_token):
+    import main
+    from core.lambda_stream import invoke_streaming
+
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    listed = test_client.get("/api/item/read/", headers=headers).json()
+    event = {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": "/api/item/read/",
+        "rawQueryString": "",
+        "headers": {"host": "example.com", "authorization": f"Bearer {auth_token}"},
+        "requestContext": {
+            "http": {"method": "GET", "path": "/api/item/read/", "protocol": "HTTP/1.1", "sourceIp": "127.0.0.1"},
+            "stage": "$default",
+        },
+        "isBase64Encoded": False,
+    }
+
+    stream = invoke_streaming(main.stream_handler, event)
+
+    assert stream.prelude["statusCode"] == 200
+    assert json.loads(stream.body) == listed
+
+
+def test_read_items_rejects_invalid_created_window(test_client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    for params in (
+        {"created_after": "2026-01-02T00:00:00Z", "created_before": "2026-01-01T00:00:00Z"},
+        {"created_after": "1969-12-31T23:59:59Z"},
+    ):
+        response = test_client.get("/api/item/read/", headers=headers, params=params)
+        assert response.status_code == 422
+
+
+def test_update_with_null_leaves_field_unchanged(test_client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    item_id = test_client.post(
+        "/api/item/create/",
+        headers=headers,
+        json={"name": "Kept name", "description": "Old description"}
+    ).json()["id"]
+
+    response = test_client.put(
+        f"/api/item/update/{item_id}",
+        headers=headers,
+        json={"name": None, "description": "New description"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "Kept name"
+    assert response.json()["description"] == "New description"
+
+    # Both keys are still required
+    response = test_client.put(f"/api/item/update/{item_id}", headers=headers, json={"description": "x"})
+    assert response.status_code == 422
+
+
+def test_item_names_must_fit_the_index_key(test_client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    too_long = "é" * 513  # 1026 bytes in UTF-8
+
+    response = test_client.post(
+        "/api/item/create/",
+        headers=headers,
+        json={"name": too_long, "description": "d"}
+    )
+    assert response.status_code == 422
+
+    item_id = test_client.post(
+        "/api/item/create/",
+        headers=headers,
+        json={"name": "é" * 512, "description": "d"}
+    ).json()["id"]
+    response = test_client.put(
+        f"/api/item/update/{item_id}",
+        headers=headers,
+        json={"name": too_long, "description": None}
+    )
+    assert response.status_code == 422
+
+
+def test_item_counter_seeds_from_existing_items(test_client, monkeypatch):
+    import crud.item
+
+    credentials = {"username": "counter-user", "password": "password123"}
+    test_client.post("/api/user/register/", json=credentials)
+    token = test_client.post("/api/user/login/", json=credentials).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # Two items from before the counter was enabled
+    for name in ("Before 1", "Before 2"):
+        test_client.post("/api/item/create/", headers=headers, json={"name": name, "description": "d"})
+
+    monkeypatch.setattr(crud.item, "ITEM_COUNTER_ENABLED", True)
+    item_id = test_client.post(
+        "/api/item/create/", headers=headers, json={"name": "After", "description": "d"}
+    ).json()["id"]
+    assert test_client.get("/api/item/count/", headers=headers, params={"mode": "cached"}).json() == \
+        {"count": 3, "source": "counter"}
+
+    assert test_client.delete(f"/api/item/delete/{item_id}", headers=headers).status_code == 204
+    assert test_client.delete(f"/api/item/delete/{item_id}", headers=headers).status_code == 404
+    assert test_client.get("/api/item/count/", headers=headers, params={"mode": "cached"}).json() == \
+        {"count": 2, "source": "counter"}
+
+
+def test_delete_conflict_is_not_reported_as_missing(test_client, auth_token, monkeypatch):
+    import crud.item
+
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    item_id = test_client.post(
+        "/api/item/create/", headers=headers, json={"name": "Contended", "description": "d"}
+    ).json()["id"]
+
+    client = crud.item.dynamodb_client
+    conflict = client.exceptions.TransactionCanceledException(
+        {"Error": {"Code": "TransactionCanceledException", "Message": "Transaction cancelled"},
+         "CancellationReasons": [{"Code": "TransactionConflict"}, {"Code": "None"}]},
+        "TransactWriteItems",
+    )
+
+    def cancelled(**kwargs):
+        raise conflict
+
+    monkeypatch.setattr(crud.item, "ITEM_COUNTER_ENABLED", True)
+    monkeypatch.setattr(client, "transact_write_items", cancelled)
+    response = test_client.delete(f"/api/item/delete/{item_id}", headers=headers)
+    assert response.status_code == 500
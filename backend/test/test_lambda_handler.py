@@ -0,0 +1,75 @@
+import pytest
+
+import main
+
+
+API_EVENT = {
+    "version": "2.0",
+    "routeKey": "$default",
+    "rawPath": "/api/health",
+    "rawQueryString": "",
+    "headers": {"host": "example.com"},
+    "requestContext": {
+        "http": {"method": "GET", "path": "/api/health", "protocol": "HTTP/1.1", "sourceIp": "127.0.0.1"},
+        "stage": "$default",
+    },
+    "isBase64Encoded": False,
+}
+
+
+@pytest.mark.parametrize("event", [
+    {"warmer": True, "concurrency": 1},
+    {"source": "serverless-plugin-warmup"},
+    {"source": "aws.events", "detail-type": "Scheduled Event", "detail": {}},
+])
+def test_warmup_events_short_circuit_before_mangum(monkeypatch, event):
+    primed = []
+    monkeypatch.setattr(main, "prime_connection", lambda: primed.append(True))
+    monkeypatch.setattr(main, "asgi_handler", lambda *args: pytest.fail("warmer reached Mangum"))
+
+    assert main.handler(event, None) == {"statusCode": 200, "body": "warm"}
+    assert primed == [True]
+
+
+def test_http_events_go_through_mangum():
+    response = main.handler(API_EVENT, None)
+
+    assert response["statusCode"] == 200
+    assert response["body"] == '{"status":"ok"}'
+
+
+def test_priming_resolves_the_service_model(monkeypatch):
+    import boto3
+    import db
+
+    # A fresh client: the shared one was resolved by earlier requests
+    client = boto3.client("dynamodb", region_name="us-east-1")
+    operations = [client.meta.service_model.operation_model(name) for name in db.PRIMED_OPERATIONS]
+    assert not any("input_shape" in operation.__dict__ for operation in operations)
+
+    monkeypatch.setattr(db, "dynamodb_client", client)
+    db.prime_service_model()
+
+    for operation in operations:
+        assert "input_shape" in operation.__dict__ and "output_shape" in operation.__dict__
+        assert "members" in operation.input_shape.__dict__
+
+
+def test_priming_builds_the_middleware_stack(monkeypatch):
+    monkeypatch.setattr(main.app, "middleware_stack", None)
+    main.prime_hot_paths()
+
+    assert main.app.middleware_stack is not None
+
+
+def test_service_model_priming_failure_falls_back_to_lazy_loading(monkeypatch, caplog):
+    import db
+    from botocore.exceptions import DataNotFoundError
+
+    def missing(*args, **kwargs):
+        raise DataNotFoundError(data_path="dynamodb/2012-08-10/service-2")
+
+    monkeypatch.setattr(db.dynamodb_client.meta.service_model, "operation_model", missing)
+    db.prime_service_model()
+
+    assert "DynamoDB service model priming failed" in caplog.text
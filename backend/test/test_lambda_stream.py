@@ -0,0 +1,68 @@
+import json
+
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+
+from core.lambda_stream import PRELUDE_DELIMITER, StreamingLambdaHandler, invoke_streaming
+
+app = FastAPI()
+
+
+@app.get("/pages")
+def pages():
+    return StreamingResponse((f"page {i}\n".encode() for i in range(3)), media_type="text/plain")
+
+
+@app.post("/echo")
+def echo(body: dict, response: Response):
+    response.set_cookie("session", "abc")
+    return body
+
+
+@app.get("/boom")
+def boom():
+    raise RuntimeError("boom")
+
+
+handler = StreamingLambdaHandler(app)
+
+
+def event(method: str, path: str, body: str | None = None) -> dict:
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": path,
+        "rawQueryString": "",
+        "headers": {"host": "example.com", "content-type": "application/json"},
+        "requestContext": {
+            "http": {"method": method, "path": path, "protocol": "HTTP/1.1", "sourceIp": "127.0.0.1"},
+            "stage": "$default",
+        },
+        "body": body,
+        "isBase64Encoded": False,
+    }
+
+
+def test_prelude_is_written_before_body_chunks():
+    stream = invoke_streaming(handler, event("GET", "/pages"))
+
+    assert stream.writes[0][1].endswith(PRELUDE_DELIMITER)
+    assert stream.prelude["statusCode"] == 200
+    assert stream.prelude["headers"]["content-type"].startswith("text/plain")
+    assert stream.chunks == [b"page 0\n", b"page 1\n", b"page 2\n"]
+    assert stream.closed
+
+
+def test_request_body_and_cookies_round_trip():
+    stream = invoke_streaming(handler, event("POST", "/echo", json.dumps({"a": 1})))
+
+    assert stream.prelude["statusCode"] == 200
+    assert stream.prelude["cookies"][0].startswith("session=abc")
+    assert json.loads(stream.body) == {"a": 1}
+
+
+def test_unhandled_error_still_closes_with_500():
+    stream = invoke_streaming(handler, event("GET", "/boom"))
+
+    assert stream.prelude["statusCode"] == 500
+    assert stream.closed
@@ -0,0 +1,59 @@
+import gzip
+import json
+import logging
+
+from core.logging import JsonFormatter
+from tools.log_analyzer import OTHER_ROUTE, Analyzer, bucket, main, normalize_path
+
+
+def _line(path: str, status: int, ms: int, request_id: str, method: str = "GET") -> bytes:
+    record = logging.LogRecord("app.request", logging.INFO, __file__, 1, "HTTP response", None, None)
+    record.__dict__.update({"request_id": request_id, "method": method, "path": path,
+                            "status_code": status, "duration_ms": ms})
+    return JsonFormatter().format(record).encode()
+
+
+def test_normalize_and_buckets():
+    assert normalize_path("/api/item/update/0190f5c2-7a3e-7cc1-9f00-000000000001") == "/api/item/update/{id}"
+    assert normalize_path("/api/item/read/") == "/api/item/read/"
+    assert bucket(42.7) == 42 and bucket(1234) == 1230 and bucket(98765) == 98700
+
+
+def test_report_from_formatter_output():
+    analyzer = Analyzer(top=2)
+    for i in range(100):
+        analyzer.feed(_line("/api/item/read/", 500 if i == 0 else 200, i + 1, f"read-{i}"))
+    analyzer.feed(_line("/api/item/delete/0190f5c2-7a3e-7cc1-9f00-000000000001", 404, 7, "del", "DELETE"))
+    analyzer.feed(b"2026-10-18T10:00:00.000Z\t" + _line("/api/item/read/", 200, 1000, "prefixed"))
+    analyzer.feed(b'{"message": "HTTP request", "path": "/api/item/read/"}')
+    analyzer.feed(b"START RequestId: abc Version: $LATEST")
+
+    report = analyzer.report()
+    read = report["routes"]["GET /api/item/read/"]
+    assert read["requests"] == 101 and read["server_error_rate"] == round(1 / 101, 4)
+    assert read["p50_ms"] == 51 and read["p99_ms"] == 100 and read["max_ms"] == 1000
+    assert sum(bar["count"] for bar in read["histogram"]) == 101
+    assert report["routes"]["DELETE /api/item/delete/{id}"]["client_error_rate"] == 1.0
+    assert [entry["request_id"] for entry in report["slowest"]] == ["prefixed", "read-99"]
+    assert report["lines"] == 104 and report["requests"] == 102
+
+
+def test_cli_reads_gzip(tmp_path, capsys):
+    path = tmp_path / "export.log.gz"
+    with gzip.open(path, "wb") as f:
+        f.write(_line("/api/user/profile/", 200, 3, "only") + b"\n")
+    assert main([str(path), "--json"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["routes"]["GET /api/user/profile/"]["p50_ms"] == 3
+
+
+def test_routes_past_the_cap_are_counted_as_other():
+    analyzer = Analyzer(max_routes=2)
+    analyzer.feed(_line("/api/item/read/", 200, 5, "read"))
+    for i, probe in enumerate(["/.env", "/wp-login.php", "/admin.php", "/.git/config"]):
+        analyzer.feed(_line(probe, 404, 1, f"probe-{i}"))
+    analyzer.feed(_line("/api/item/read/", 200, 5, "read-again"))
+
+    routes = analyzer.report()["routes"]
+    assert list(routes) == [OTHER_ROUTE, "GET /api/item/read/", "GET /.env"]
+    assert routes[OTHER_ROUTE]["requests"] == 3 and routes[OTHER_ROUTE]["client_error_rate"] == 1.0
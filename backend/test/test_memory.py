@@ -0,0 +1,59 @@
+import logging
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core import memory
+from core.security import create_profiling_token
+from main import app
+from middleware.memory import MemoryAccountingMiddleware
+
+
+@pytest.fixture
+def traced():
+    memory.reset()
+    yield TestClient(MemoryAccountingMiddleware(app))
+    tracemalloc.stop()
+    memory.reset()
+
+
+def test_requests_are_accounted_per_route(traced, caplog):
+    with caplog.at_level(logging.INFO, logger="app.memory"):
+        traced.get("/api/item/read/")
+        traced.get("/api/item/read/")
+        traced.get("/api/no-such-route")
+
+    stats = memory.route_stats()
+    assert stats["GET /api/item/read/"]["requests"] == 2
+    assert stats["GET <unmatched>"]["requests"] == 1
+    assert stats["GET /api/item/read/"]["peak_bytes_max"] > 0
+    record = [r for r in caplog.records if r.name == "app.memory"][0]
+    assert record.status_code == 401 and record.request_id
+    assert record.alloc_peak_bytes >= record.alloc_net_bytes
+
+
+def test_snapshot_diff_finds_retained_allocations(traced):
+    retained = []
+    memory.mark()
+    retained.extend(bytearray(1024) for _ in range(200))
+    result = memory.diff(top=5)
+    assert result["growth_bytes"] >= 200 * 1024
+    assert "test_memory.py" in result["top"][0]["where"][-1]
+
+
+def test_memory_endpoints(traced):
+    headers = {"X-Profile-Token": create_profiling_token()}
+    assert traced.get("/api/debug/memory/diff/", headers=headers).status_code == 409
+    assert traced.post("/api/debug/memory/snapshot/", headers=headers).json()["traces"] > 0
+    traced.get("/api/item/read/")
+
+    body = traced.get("/api/debug/memory/diff/?top=3", headers=headers).json()
+    assert len(body["top"]) <= 3
+    assert "GET /api/item/read/" in traced.get("/api/debug/memory/", headers=headers).json()["routes"]
+    assert traced.get("/api/debug/memory/").status_code == 403
+
+
+def test_memory_endpoints_need_tracing():
+    headers = {"X-Profile-Token": create_profiling_token()}
+    assert TestClient(app).get("/api/debug/memory/", headers=headers).status_code == 404
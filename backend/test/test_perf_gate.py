@@ -0,0 +1,18 @@
+from bench.gate import judge, relative_change
+
+
+def test_fails_only_when_the_whole_interval_exceeds_tolerance():
+    baseline = [10.0, 10.2, 9.9, 10.1, 10.0]
+
+    assert judge("load.list.p99_ms", baseline, [10.1, 9.8, 10.3, 10.0, 10.2])["status"] == "ok"
+    assert judge("load.list.p99_ms", baseline, [14.0, 14.2, 13.9, 14.1, 14.3])["status"] == "FAIL"
+    # Median is past the tolerance but one run in range: not conclusive
+    assert judge("load.list.p99_ms", baseline, [9.9, 13.0, 13.1, 10.0, 13.2])["status"] == "noisy"
+    assert judge("load.list.p99_ms", baseline, [5.0, 5.1, 4.9, 5.0, 5.2])["status"] == "better"
+
+
+def test_higher_is_better_metrics_regress_when_they_drop():
+    assert relative_change("load.throughput_rps", 400, 200) == 1.0
+    assert relative_change("load.list.p50_ms", 4, 2) == -0.5
+    verdict = judge("load.throughput_rps", [400, 410, 405], [250, 255, 260])
+    assert verdict["status"] == "FAIL"
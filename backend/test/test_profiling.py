@@ -0,0 +1,120 @@
+import logging
+import time
+
+from fastapi.testclient import TestClient
+
+from core.profiling import ContinuousProfiler, SamplingProfiler, folded
+from core.security import create_access_token, create_profiling_token, verify_profiling_token
+from main import app
+
+client = TestClient(app)
+
+
+def _busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(100))
+
+
+def test_sampler_folds_busy_stacks():
+    import threading
+
+    worker = threading.Thread(target=_busy, args=(0.1,), name="busy-1")
+    with SamplingProfiler(interval=0.001) as profiler:
+        worker.start()
+        worker.join()
+    text = folded(profiler.counts)
+    busy = [line for line in text.splitlines() if line.startswith("busy;")]
+    assert busy and any("test_profiling:_busy" in line for line in busy)
+    stack, count = busy[0].rsplit(" ", 1)
+    assert int(count) > 0 and stack.split(";")[0] == "busy"
+
+
+def test_profiling_tokens_are_not_access_tokens():
+    assert verify_profiling_token(create_profiling_token()) is not None
+    assert verify_profiling_token(create_access_token({"sub": "user-id"})) is None
+    assert verify_profiling_token("not-a-token") is None
+
+    response = client.get("/api/user/profile/", headers={"Authorization": f"Bearer {create_profiling_token()}"})
+    assert response.status_code == 401
+
+
+def test_profiled_request_logs_folded_stacks(caplog):
+    headers = {"X-Profile-Token": create_profiling_token()}
+    with caplog.at_level(logging.INFO, logger="app.profiling"):
+        response = client.get("/api/item/read/", headers=headers)
+    assert response.status_code == 401  # not logged in: still profiled
+
+    (record,) = [r for r in caplog.records if r.name == "app.profiling"]
+    assert record.request_id == response.headers["x-request-id"]
+    assert record.path == "/api/item/read/" and record.status_code == 401
+    assert record.profile_samples >= 0 and isinstance(record.profile, str)
+
+
+def test_profile_written_to_directory(tmp_path, monkeypatch):
+    from middleware.profiling import ProfilingMiddleware
+
+    middleware = next(m for m in app.user_middleware if m.cls is ProfilingMiddleware)
+    monkeypatch.setitem(middleware.kwargs, "output", str(tmp_path))
+    app.middleware_stack = None  # rebuilt with the new output on the next request
+    try:
+        headers = {"X-Profile-Token": create_profiling_token(), "X-Request-ID": "../escape"}
+        TestClient(app).get("/api/item/read/", headers=headers)
+    finally:
+        app.middleware_stack = None
+    (path,) = tmp_path.iterdir()
+    assert path.name.startswith("profile-") and path.suffix == ".folded"
+
+
+def test_requests_without_or_with_bad_tokens_are_not_profiled(caplog):
+    with caplog.at_level(logging.INFO, logger="app.profiling"):
+        client.get("/api/item/read/")
+        client.get("/api/item/read/", headers={"X-Profile-Token": create_access_token({"sub": "x"})})
+    messages = [r.getMessage() for r in caplog.records if r.name == "app.profiling"]
+    assert messages == ["Invalid profiling token"]
+
+
+def test_continuous_profiler_keeps_last_windows():
+    now = [0.0]
+    profiler = ContinuousProfiler(window=10, keep=2, clock=lambda: now[0])
+    for window in range(3):
+        profiler.counts[("MainThread", f"mod:work{window}")] += 5
+        profiler.samples += 5
+        now[0] += 10
+        profiler.rotate()
+    profiler.counts[("MainThread", "mod:current")] += 1
+    profiler.samples += 1
+
+    snapshot = profiler.snapshot()
+    assert snapshot["windows"] == 3 and snapshot["samples"] == 11  # 2 closed + open
+    assert ("MainThread", "mod:work0") not in snapshot["counts"]
+    assert snapshot["start"] == 10 and snapshot["end"] == 30
+    last = profiler.snapshot(last=1, include_current=False)
+    assert dict(last["counts"]) == {("MainThread", "mod:work2"): 5}
+
+
+def test_profile_endpoint(monkeypatch):
+    import main
+    import routes.debug
+
+    token = {"X-Profile-Token": create_profiling_token()}
+    assert client.get("/api/debug/profile/").status_code == 403
+    assert client.get("/api/debug/profile/", headers={"X-Profile-Token": create_access_token({"sub": "x"})}).status_code == 403
+    assert client.get("/api/debug/profile/", headers=token).status_code == 404  # not enabled
+
+    monkeypatch.setattr(main, "CONTINUOUS_PROFILING", True)
+    with TestClient(app) as server:  # runs the lifespan
+        _busy(0.1)
+        response = server.get("/api/debug/profile/", headers=token, params={"download": "true"})
+        assert response.status_code == 200
+        assert response.headers["content-disposition"].startswith('attachment; filename="profile-')
+        assert int(response.headers["x-profile-samples"]) > 0
+        assert "test_profiling:_busy" in response.text
+
+        data = server.get("/api/debug/profile/", headers=token, params={"format": "json"}).json()
+        assert data["samples"] > 0 and data["stacks"][0]["count"] >= 1
+
+        monkeypatch.setattr(routes.debug, "PROFILE_MAX_STACKS", 1)
+        assert len(server.get("/api/debug/profile/", headers=token).text.splitlines()) == 1
+        assert len(server.get("/api/debug/profile/", headers=token, params={"format": "json"}).json()["stacks"]) == 1
+    assert client.get("/api/debug/profile/", headers=token).status_code == 404  # stopped with the app
@@ -0,0 +1,40 @@
+import json
+from decimal import Decimal
+
+from pydantic import TypeAdapter
+
+from core.serialization import dumps, trusted_items, json_array_stream
+from schemas.item import ItemRead
+
+# Validated baseline the fast path must match
+item_list_adapter = TypeAdapter(list[ItemRead])
+
+
+def test_trusted_items_keep_only_declared_or_requested_fields():
+    rows = [{"id": "1", "owner_id": "u", "name": "n", "description": "d", "item_count": Decimal(3)}]
+
+    assert trusted_items(rows) == [{"id": "1", "owner_id": "u", "name": "n", "description": "d"}]
+    assert trusted_items(rows, ("id", "name")) == [{"id": "1", "name": "n"}]
+
+
+def test_fast_path_matches_validated_encoding():
+    rows = [{"id": "1", "owner_id": "u", "name": "Ünïcode", "description": "d"}]
+
+    fast = json.loads(dumps(trusted_items(rows)))
+    validated = json.loads(item_list_adapter.dump_json(item_list_adapter.validate_python(rows)))
+
+    assert fast == validated
+
+
+def test_dumps_handles_dynamodb_decimals():
+    assert json.loads(dumps({"count": Decimal("3"), "ratio": Decimal("0.5")})) == {"count": 3, "ratio": 0.5}
+
+
+def test_json_array_stream_emits_one_chunk_per_page():
+    pages = [[{"id": "1", "name": "a"}], [], [{"id": "2", "name": "b"}, {"id": "3", "name": "c"}]]
+
+    chunks = list(json_array_stream(pages, ("id",)))
+
+    assert len(chunks) == 3
+    assert json.loads(b"".join(chunks)) == [{"id": "1"}, {"id": "2"}, {"id": "3"}]
+    assert list(json_array_stream([])) == [b"[]"]
@@ -0,0 +1,45 @@
+import threading
+import time
+
+import pytest
+
+from core.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def slow_read():
+        calls.append(1)
+        release.wait(timeout=2)
+        return ["item"]
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("owner-1", slow_read)))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [["item"]] * 5
+
+
+def test_errors_fan_out_and_are_not_cached():
+    flight = SingleFlight()
+
+    def failing_read():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        flight.do("owner-1", failing_read)
+
+    # The failed call is not remembered; the next caller runs again
+    assert flight.do("owner-1", lambda: "fresh") == "fresh"
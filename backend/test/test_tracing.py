@@ -0,0 +1,142 @@
+import json
+import logging
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core import tracing
+from core.logging import JsonFormatter
+from db import dynamodb_client
+from main import app
+from middleware.tracing import TracingMiddleware
+from tools.trace_report import breakdown, group_traces, read_spans
+
+CALLER = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+@pytest.fixture
+def spans_file(tmp_path):
+    path = tmp_path / "spans.ndjson"
+    tracing.configure_exporter(f"file:{path}", flush_interval=0)
+    events = dynamodb_client.meta.events
+    tracing.DynamoDBSpans().install(dynamodb_client)
+    yield path
+    for event, unique_id in (("before-parameter-build.dynamodb", "tracing-before"),
+                             ("after-call.dynamodb", "tracing-after"),
+                             ("after-call-error.dynamodb", "tracing-error")):
+        events.unregister(event, unique_id=unique_id)
+    tracing.configure_exporter("")
+
+
+@pytest.fixture
+def traced():
+    return TestClient(TracingMiddleware(app))
+
+
+def _spans(path) -> list:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_parse_traceparent():
+    assert tracing.parse_traceparent(CALLER) == ("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", 1)
+    assert tracing.parse_traceparent("01-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-00-extra")[2] == 0
+    for invalid in (None, "", "garbage", CALLER.upper(), CALLER + "-extra",
+                    "ff-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01",
+                    "00-00000000000000000000000000000000-00f067aa0ba902b7-01",
+                    "00-4bf92f3577b34da6a3ce929d0e0e4736-0000000000000000-01"):
+        assert tracing.parse_traceparent(invalid) is None
+
+
+def test_request_spans_continue_the_callers_trace(spans_file, traced):
+    credentials = {"username": "tracing-user", "password": "password123"}
+    traced.post("/api/user/register/", json=credentials)
+    token = traced.post("/api/user/login/", json=credentials).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    traced.post("/api/item/create/", json={"name": "n", "description": "d"}, headers=headers)
+    response = traced.get("/api/item/read/", headers={**headers, "traceparent": CALLER})
+
+    spans = [s for s in _spans(spans_file) if s["trace_id"] == "4bf92f3577b34da6a3ce929d0e0e4736"]
+    by_name = {s["name"]: s for s in spans}
+    root = by_name["GET /api/item/read/"]
+    assert root["parent_id"] == "00f067aa0ba902b7" and root["attributes"]["http.status_code"] == 200
+    assert by_name["auth"]["parent_id"] == root["span_id"]
+    assert by_name["dynamodb.GetItem"]["parent_id"] == by_name["auth"]["span_id"]
+    assert by_name["dynamodb.Query"]["attributes"]["db.index"] == "owner-created-index"
+    assert by_name["serialize"]["parent_id"] == root["span_id"]
+    assert response.headers["traceparent"] == f"00-{root['trace_id']}-{root['span_id']}-01"
+
+    names = {s["name"] for s in _spans(spans_file)}
+    assert {"bcrypt.hash", "bcrypt.verify", "POST /api/user/login/"} <= names
+
+
+def test_inline_exporter_writes_each_request(traced):
+    written = []
+
+    class RecordingSink:
+        def write(self, spans):
+            written.extend(spans)
+
+    tracing.exporter = tracing.BatchExporter(RecordingSink())
+    try:
+        traced.get("/api/health")
+    finally:
+        tracing.exporter = None
+    assert [span["name"] for span in written] == ["GET /api/health"]
+
+
+def test_unsampled_caller_records_nothing(spans_file, traced):
+    unsampled = CALLER[:-2] + "00"
+    response = traced.get("/api/item/read/", headers={"traceparent": unsampled})
+    assert response.headers["traceparent"].endswith("-00")
+    assert not spans_file.exists()
+
+
+def test_log_lines_carry_trace_ids():
+    record = logging.LogRecord("app.test", logging.INFO, __file__, 1, "message", None, None)
+    assert "trace_id" not in json.loads(JsonFormatter().format(record))
+    with tracing.activate(tracing.start_trace("test", CALLER)) as root:
+        with tracing.span("child") as child:
+            payload = json.loads(JsonFormatter().format(record))
+    assert payload["trace_id"] == root.trace_id and payload["span_id"] == child.span_id
+
+
+def test_exporter_batches_and_report(tmp_path):
+    path = tmp_path / "spans.ndjson"
+    exporter = tracing.BatchExporter(tracing.FileSink(str(path)), batch_size=3, flush_interval=3600)
+    tracing.exporter = exporter
+    try:
+        for _ in range(2):
+            with tracing.activate(tracing.start_trace("GET /x")) as root:
+                with tracing.span("auth"):
+                    pass
+            root.end()
+        assert len(_spans(path)) == 4  # inline: each trace when its root ends
+    finally:
+        tracing.exporter = None
+
+    routes = breakdown(group_traces(read_spans([str(path)])))
+    assert len(routes["GET /x"]["durations"]) == 2
+    assert set(routes["GET /x"]["self_ms"]) == {"(request)", "auth"}
+
+
+def test_started_exporter_writes_off_the_callers_thread():
+    written = []
+    done = threading.Event()
+
+    class RecordingSink:
+        def write(self, spans):
+            written.append((threading.current_thread().name, len(spans)))
+            done.set()
+
+    exporter = tracing.BatchExporter(RecordingSink(), batch_size=1, flush_interval=3600).start()
+    tracing.exporter = exporter
+    try:
+        tracing.start_trace("GET /x").end()
+        assert done.wait(5)
+        assert written == [("span-exporter", 1)]
+        exporter.export(tracing.start_trace("GET /y", sample_rate=0))
+        exporter.stop()
+    finally:
+        tracing.exporter = None
+    assert sum(count for _, count in written) == 2 and exporter._thread is None
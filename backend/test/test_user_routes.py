@@ -14,23 +14,23 @@ def test_client():
 
 
 def test_create_user(test_client):
-    response = test_client.post("/user/register/", json={
+    response = test_client.post("/api/user/register/", json={
         "username": "John",
         "password": "password123"
     })
 
     print("\nTest Create JSON RESPONSE: ", response.json())
 
-    if response.json()['detail'] == "Username already registered":
+    if response.json().get('detail') == "Username already registered":
         assert response.status_code == 400
     else:
-        assert response.status_code == 201
+        assert response.status_code == 200
 
 
 def test_login_and_get_profile(test_client):
     # First, login
     response = test_client.post(
-        "/user/login/", json={
+        "/api/user/login/", json={
             "username": "John",
             "password": "password123"}
     )
@@ -45,6 +45,6 @@ def test_login_and_get_profile(test_client):
     headers = {"Authorization": f"Bearer {token}"}
 
     # Then, get profile
-    response = test_client.get("/user/profile/", headers=headers)
+    response = test_client.get("/api/user/profile/", headers=headers)
     assert response.status_code == 200
     print(response.json())
@@ -0,0 +1,78 @@
+# tools/import_items.py
+"""Bulk-import items for one user from an NDJSON or CSV file.
+
+Run from backend/ with the usual USERS_TABLE/ITEMS_TABLE environment:
+
+    python -m tools.import_items items.ndjson --username alice
+    python -m tools.import_items items.csv --format csv --owner-id <user id>
+
+The file is read lazily, so its size does not matter. The checkpoint is
+saved to --checkpoint-file as batches land. Rerunning with the same file
+resumes after the last checkpoint.
+"""
+import argparse
+import json
+import os
+import sys
+
+from boto3.dynamodb.conditions import Key
+
+from crud.item_import import import_items, MAX_IN_FLIGHT
+from db import user_table
+from schemas.user import UserRead
+
+
+def _resolve_user(username: str | None, owner_id: str | None) -> UserRead:
+    if owner_id:
+        response = user_table.get_item(Key={"id": owner_id})
+    else:
+        items = user_table.query(
+            IndexName="username-index",
+            KeyConditionExpression=Key("username").eq(username),
+        ).get("Items", [])
+        response = {"Item": items[0] if items else None}
+    user = response.get("Item")
+    if not user:
+        sys.exit(f"User not found: {owner_id or username}")
+    return UserRead(**user)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-import items for one user from NDJSON or CSV.")
+    parser.add_argument("path", help="NDJSON or CSV file (CSV needs a name,description header)")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    who = parser.add_mutually_exclusive_group(required=True)
+    who.add_argument("--username")
+    who.add_argument("--owner-id")
+    parser.add_argument("--offset", type=int, help="skip this many rows (default: saved checkpoint)")
+    parser.add_argument("--max-in-flight", type=int, default=MAX_IN_FLIGHT)
+    parser.add_argument("--checkpoint-file", help="default: <path>.checkpoint")
+    args = parser.parse_args(argv)
+
+    checkpoint_file = args.checkpoint_file or f"{args.path}.checkpoint"
+    offset = args.offset
+    if offset is None:
+        offset = 0
+        if os.path.exists(checkpoint_file):
+            with open(checkpoint_file) as f:
+                offset = int(f.read().strip() or 0)
+            print(f"Resuming after row {offset}", file=sys.stderr)
+
+    def save_checkpoint(value: int) -> None:
+        # import_items calls this in checkpoint order, one batch at a time
+        with open(checkpoint_file, "w") as f:
+            f.write(str(value))
+
+    user = _resolve_user(args.username, args.owner_id)
+    with open(args.path, encoding="utf-8-sig", newline="") as lines:
+        report = import_items(lines, args.format, user, offset, args.max_in_flight, save_checkpoint)
+    save_checkpoint(report.checkpoint)
+
+    for error in report.failed:
+        print(json.dumps(error.model_dump()), file=sys.stderr)
+    print(f"imported={report.imported} failed={len(report.failed)} checkpoint={report.checkpoint}")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
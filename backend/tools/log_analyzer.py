@@ -0,0 +1,245 @@
+# tools/log_analyzer.py
+"""Latency and error report from the app's JSON logs.
+
+    python -m tools.log_analyzer app.log [more.log.gz ...]   (or - for stdin)
+        [--top 10] [--histogram] [--json] [--no-normalize] [--max-routes 500]
+
+Reads the "HTTP response" lines written by middleware/logging.py (one JSON
+object per line, optionally after a prefix such as a CloudWatch export's
+timestamp; .gz files are read as gzip) and reports per route: requests,
+rate over the logged time window, 4xx/5xx shares and latency percentiles,
+plus the slowest request ids. Memory stays constant whatever the input
+size: latencies go into fixed-precision histograms (3 significant digits,
+exact below 100 ms), the slowest requests into a bounded heap, and path
+segments that look like ids are folded into "{id}" so routes stay few.
+Paths that are not ids but still vary (scanners probing for files) are
+capped: past `--max-routes` distinct routes, new ones are counted under
+"<other>".
+"""
+import argparse
+import gzip
+import heapq
+import json
+import math
+import re
+import sys
+from collections import Counter
+from datetime import datetime
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    _loads = json.loads
+
+MARKER = b'"HTTP response"'
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S,%f"  # logging.Formatter.formatTime
+_ID_SEGMENT = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+                         r"|[0-9a-fA-F]{16,}|\d+")
+OTHER_ROUTE = "<other>"
+
+
+def normalize_path(path: str) -> str:
+    return "/".join("{id}" if _ID_SEGMENT.fullmatch(segment) else segment for segment in path.split("/"))
+
+
+def bucket(ms: float) -> float:
+    """Histogram bucket (lower bound) of a latency: 1 ms wide below 100 ms,
+    then 3 significant digits (<1% relative error)."""
+    if ms < 100:
+        return float(int(ms))
+    step = 10 ** (int(math.log10(ms)) - 2)
+    return float(ms // step * step)
+
+
+class RouteStats:
+    __slots__ = ("requests", "client_errors", "server_errors", "histogram", "max_ms")
+
+    def __init__(self):
+        self.requests = 0
+        self.client_errors = 0
+        self.server_errors = 0
+        self.histogram: Counter = Counter()
+        self.max_ms = 0.0
+
+    def add(self, status: int, ms: float) -> None:
+        self.requests += 1
+        if 400 <= status < 500:
+            self.client_errors += 1
+        elif status >= 500:
+            self.server_errors += 1
+        self.histogram[bucket(ms)] += 1
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, p: float) -> float:
+        # Nearest rank over the histogram
+        rank = max(1, math.ceil(p / 100 * self.requests))
+        seen = 0
+        for value in sorted(self.histogram):
+            seen += self.histogram[value]
+            if seen >= rank:
+                return value
+        return self.max_ms
+
+    def ranges(self) -> list:
+        """[(low, high, count)] over power-of-two latency ranges."""
+        counts: Counter = Counter()
+        for value, count in self.histogram.items():
+            counts[0 if value < 1 else int(math.log2(value)) + 1] += count
+        return [(0 if k == 0 else 2 ** (k - 1), 2 ** k, counts[k]) for k in range(max(counts, default=0) + 1)]
+
+
+class Analyzer:
+    def __init__(self, top: int = 10, normalize: bool = True, max_routes: int = 500):
+        self.top = top
+        self.normalize = normalize
+        self.max_routes = max_routes
+        self.routes: dict = {}
+        self.slowest: list = []  # min-heap of (ms, seq, record)
+        self.first_time: str | None = None
+        self.last_time: str | None = None
+        self.lines = 0
+        self.skipped = 0
+        self._seq = 0
+
+    def feed(self, line: bytes) -> None:
+        self.lines += 1
+        # Cheap substring test first: most lines are not response lines
+        if MARKER not in line:
+            return
+        start = line.find(b"{")
+        try:
+            record = _loads(line[start:])
+            path, method = record["path"], record["method"]
+            status, ms = int(record["status_code"]), float(record["duration_ms"])
+        except (ValueError, KeyError, TypeError):
+            self.skipped += 1
+            return
+        if record.get("message") != "HTTP response":
+            return
+        route = f"{method} {normalize_path(path) if self.normalize else path}"
+        stats = self.routes.get(route)
+        if stats is None:
+            # The overflow bucket does not count against the cap
+            if len(self.routes) - (OTHER_ROUTE in self.routes) >= self.max_routes:
+                route = OTHER_ROUTE
+                stats = self.routes.get(route)
+            if stats is None:
+                stats = self.routes[route] = RouteStats()
+        stats.add(status, ms)
+
+        when = record.get("time")
+        if isinstance(when, str):
+            # formatTime output sorts lexicographically
+            if self.first_time is None or when < self.first_time:
+                self.first_time = when
+            if self.last_time is None or when > self.last_time:
+                self.last_time = when
+        if self.top:
+            self._seq += 1
+            entry = (ms, self._seq, {"request_id": record.get("request_id"), "route": route,
+                                     "path": path, "status_code": status, "duration_ms": ms, "time": when})
+            if len(self.slowest) < self.top:
+                heapq.heappush(self.slowest, entry)
+            elif ms > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    def window_seconds(self) -> float | None:
+        try:
+            first = datetime.strptime(self.first_time, TIME_FORMAT)
+            last = datetime.strptime(self.last_time, TIME_FORMAT)
+        except (TypeError, ValueError):
+            return None
+        return (last - first).total_seconds()
+
+    def report(self) -> dict:
+        window = self.window_seconds()
+        routes = {}
+        for route, stats in sorted(self.routes.items(), key=lambda kv: -kv[1].requests):
+            routes[route] = {
+                "requests": stats.requests,
+                "rate_per_s": round(stats.requests / window, 3) if window else None,
+                "client_error_rate": round(stats.client_errors / stats.requests, 4),
+                "server_error_rate": round(stats.server_errors / stats.requests, 4),
+                "p50_ms": stats.percentile(50),
+                "p90_ms": stats.percentile(90),
+                "p99_ms": stats.percentile(99),
+                "max_ms": stats.max_ms,
+                "histogram": [{"from_ms": low, "to_ms": high, "count": count} for low, high, count in stats.ranges()],
+            }
+        return {
+            "lines": self.lines,
+            "requests": sum(stats.requests for stats in self.routes.values()),
+            "skipped": self.skipped,
+            "first_time": self.first_time,
+            "last_time": self.last_time,
+            "window_s": window,
+            "routes": routes,
+            "slowest": [entry[2] for entry in sorted(self.slowest, reverse=True)],
+        }
+
+
+def open_input(path: str):
+    if path == "-":
+        return sys.stdin.buffer
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb", buffering=1 << 20)
+
+
+def print_report(report: dict, histogram: bool) -> None:
+    window = report["window_s"]
+    print(f"{report['requests']} requests in {report['lines']} lines"
+          + (f" over {window:.0f}s ({report['first_time']} .. {report['last_time']})" if window else "")
+          + (f", {report['skipped']} unparsable" if report["skipped"] else ""))
+    print(f"\n{'route':<44}{'requests':>9}{'req/s':>9}{'4xx':>7}{'5xx':>7}"
+          f"{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}")
+    for route, entry in report["routes"].items():
+        rate = f"{entry['rate_per_s']:.2f}" if entry["rate_per_s"] is not None else "-"
+        print(f"{route:<44}{entry['requests']:>9}{rate:>9}{entry['client_error_rate']:>7.1%}"
+              f"{entry['server_error_rate']:>7.1%}{entry['p50_ms']:>9.0f}{entry['p90_ms']:>9.0f}"
+              f"{entry['p99_ms']:>9.0f}{entry['max_ms']:>9.0f}")
+        if histogram:
+            peak = max(bar["count"] for bar in entry["histogram"])
+            for bar in entry["histogram"]:
+                if bar["count"]:
+                    width = max(1, round(bar["count"] / peak * 40))
+                    print(f"    {bar['from_ms']:>7}-{bar['to_ms']:<7} ms {bar['count']:>9}  {'#' * width}")
+    if report["slowest"]:
+        print("\nslowest requests")
+        for entry in report["slowest"]:
+            print(f"  {entry['duration_ms']:>9.0f} ms  {entry['status_code']}  {entry['request_id']}  "
+                  f"{entry['route']}  {entry['time'] or ''}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", default=["-"])
+    parser.add_argument("--top", type=int, default=10, help="slowest request ids to keep")
+    parser.add_argument("--histogram", action="store_true", help="print a latency histogram per route")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--no-normalize", action="store_true", help="keep ids in paths")
+    parser.add_argument("--max-routes", type=int, default=500,
+                        help=f"distinct routes to keep; later ones are counted as {OTHER_ROUTE}")
+    args = parser.parse_args(argv)
+
+    analyzer = Analyzer(top=args.top, normalize=not args.no_normalize, max_routes=args.max_routes)
+    for path in args.paths:
+        f = open_input(path)
+        try:
+            for line in f:
+                analyzer.feed(line)
+        finally:
+            if f is not sys.stdin.buffer:
+                f.close()
+
+    report = analyzer.report()
+    if args.json:
+        print(json.dumps(report, indent=1))
+    else:
+        print_report(report, args.histogram)
+    return 0 if report["requests"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+# tools/profile_token.py
+"""Mint a token that enables profiling for requests that carry it.
+
+Run from backend/ with the deployment's SECRET_KEY configuration:
+
+    python -m tools.profile_token --minutes 10
+    curl -H "Authorization: Bearer $JWT" -H "X-Profile-Token: $(python -m tools.profile_token)" \\
+         https://<api>/api/item/read/
+
+The profile (folded stacks) is logged by "app.profiling" with the request id,
+or written to PROFILE_OUTPUT/<request id>.folded.
+"""
+import argparse
+
+from core.security import create_profiling_token
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=int, default=15, help="token lifetime")
+    parser.add_argument("--subject", default="operator", help="who asked for the profile")
+    args = parser.parse_args()
+    print(create_profiling_token(args.subject, args.minutes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# tools/trace_collector.py
+"""Stand-in trace collector: receives span batches over HTTP, appends them
+to a JSON-lines file.
+
+    python -m tools.trace_collector --port 4318 --out spans.ndjson
+    TRACING_ENABLED=1 TRACE_EXPORT=http://localhost:4318/v1/traces uvicorn main:app
+    python -m tools.trace_report spans.ndjson
+
+Accepts POST {"spans": [...]} (core.tracing.HttpSink) on any path.
+"""
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_handler(out: str):
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                spans = json.loads(self.rfile.read(length))["spans"]
+            except (ValueError, KeyError, TypeError):
+                self.send_error(400, "expected {\"spans\": [...]}")
+                return
+            lines = "".join(json.dumps(span, separators=(",", ":")) + "\n" for span in spans)
+            with lock, open(out, "a") as f:
+                f.write(lines)
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4318)
+    parser.add_argument("--out", default="spans.ndjson")
+    args = parser.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.out))
+    print(f"collecting spans on http://{args.host}:{args.port}/ into {args.out}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
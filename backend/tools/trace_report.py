@@ -0,0 +1,137 @@
+# tools/trace_report.py
+"""Latency breakdown of exported traces.
+
+    python -m tools.trace_report spans.ndjson [more files]   (or - for stdin)
+    python -m tools.trace_report spans.ndjson --trace <trace id>
+
+Reads spans as JSON lines (TRACE_EXPORT=file:... or tools.trace_collector),
+or JSON log lines whose "spans" holds a batch (TRACE_EXPORT=log). For each
+request route: request count, p50/p95 duration, and the mean self time of
+each kind of span (its duration minus its children's), which adds up to the
+request's duration when the work is sequential; the largest entries are the
+critical path. With --trace, prints that trace as a waterfall.
+"""
+import argparse
+import json
+import math
+import sys
+from collections import defaultdict
+
+
+def read_spans(paths):
+    for path in paths:
+        f = sys.stdin if path == "-" else open(path)
+        try:
+            for line in f:
+                line = line.strip()
+                if not line.startswith("{"):
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if "spans" in record:
+                    yield from record["spans"]
+                elif "span_id" in record and "trace_id" in record:
+                    yield record
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+
+def group_traces(spans) -> dict:
+    traces: dict = defaultdict(list)
+    for span in spans:
+        if span.get("duration_ms") is not None:
+            traces[span["trace_id"]].append(span)
+    return traces
+
+
+def self_times(spans: list) -> tuple[list, dict]:
+    """(local roots, {span_id: self time}). Children running in parallel
+    (hedged reads) can outlast their parent's remaining time; self time is
+    clamped at zero."""
+    ids = {span["span_id"] for span in spans}
+    children_ms: dict = defaultdict(float)
+    for span in spans:
+        if span["parent_id"] in ids:
+            children_ms[span["parent_id"]] += span["duration_ms"]
+    roots = [span for span in spans if span["parent_id"] not in ids]
+    return roots, {span["span_id"]: max(0.0, span["duration_ms"] - children_ms[span["span_id"]]) for span in spans}
+
+
+def percentile(values: list, p: float) -> float:
+    ordered = sorted(values)
+    # Nearest rank
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))]
+
+
+def breakdown(traces: dict) -> dict:
+    routes: dict = {}
+    for spans in traces.values():
+        roots, own = self_times(spans)
+        for root in roots:
+            entry = routes.setdefault(root["name"], {"durations": [], "self_ms": defaultdict(float)})
+            entry["durations"].append(root["duration_ms"])
+        # Spans are charged to the trace's first root (one per request)
+        if roots:
+            entry = routes[roots[0]["name"]]
+            root_ids = {root["span_id"] for root in roots}
+            for span in spans:
+                name = "(request)" if span["span_id"] in root_ids else span["name"]
+                entry["self_ms"][name] += own[span["span_id"]]
+    return routes
+
+
+def print_breakdown(routes: dict) -> None:
+    for route, entry in sorted(routes.items(), key=lambda kv: -len(kv[1]["durations"])):
+        durations = entry["durations"]
+        n = len(durations)
+        print(f"{route}  requests={n}  p50={percentile(durations, 50):.2f}ms  p95={percentile(durations, 95):.2f}ms")
+        total = sum(entry["self_ms"].values()) or 1.0
+        for name, ms in sorted(entry["self_ms"].items(), key=lambda kv: -kv[1]):
+            print(f"    {name:<36}{ms / n:>10.3f} ms/request{ms / total:>8.1%}")
+        print()
+
+
+def print_waterfall(spans: list) -> None:
+    by_parent: dict = defaultdict(list)
+    for span in spans:
+        by_parent[span["parent_id"]].append(span)
+    roots, _ = self_times(spans)
+    origin = min(span["start"] for span in spans)
+
+    def walk(span, depth):
+        offset = (span["start"] - origin) * 1000
+        error = f"  !{span['error']}" if span.get("error") else ""
+        print(f"{offset:>9.2f} {span['duration_ms']:>9.2f}  {'  ' * depth}{span['name']}{error}")
+        for child in sorted(by_parent[span["span_id"]], key=lambda s: s["start"]):
+            walk(child, depth + 1)
+
+    print(f"{'start ms':>9} {'dur ms':>9}  span")
+    for root in sorted(roots, key=lambda s: s["start"]):
+        walk(root, 0)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", default=["-"])
+    parser.add_argument("--trace", help="print one trace as a waterfall")
+    args = parser.parse_args(argv)
+
+    traces = group_traces(read_spans(args.paths))
+    if args.trace:
+        if args.trace not in traces:
+            print(f"trace {args.trace} not found", file=sys.stderr)
+            return 1
+        print_waterfall(traces[args.trace])
+        return 0
+    if not traces:
+        print("no spans found", file=sys.stderr)
+        return 1
+    print_breakdown(breakdown(traces))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -45,12 +45,39 @@ resource "aws_dynamodb_table" "items" {
     type = "S"
   }
 
+  attribute {
+    name = "name"
+    type = "S"
+  }
+
+  # No longer read by the API (superseded by owner-created-index). Kept so
+  # this apply only adds an index; remove it in a follow-up apply once the
+  # release reading owner-created-index is live.
   global_secondary_index {
     name            = "owner-id-index"
     hash_key        = "owner_id"
     projection_type = "ALL"
   }
 
+  # Item ids are UUIDv7 (time-ordered), so the id range key sorts an
+  # owner's items by creation time and supports created-at range queries.
+  # A new index rather than a range key on owner-id-index: changing an
+  # index's key schema makes Terraform delete and recreate it
+  global_secondary_index {
+    name            = "owner-created-index"
+    hash_key        = "owner_id"
+    range_key       = "id"
+    projection_type = "ALL"
+  }
+
+  # Name-ordered listings and name prefix searches (begins_with on the key)
+  global_secondary_index {
+    name            = "owner-name-index"
+    hash_key        = "owner_id"
+    range_key       = "name"
+    projection_type = "ALL"
+  }
+
   point_in_time_recovery {
     enabled = true
   }